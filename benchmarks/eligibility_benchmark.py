@@ -0,0 +1,105 @@
+import os
+import sys
+import json
+import random
+import argparse
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.user_interaction.eligibility_engine import EligibilityEngine
+
+
+def build_catalog(course_count: int,
+                  seed: int) -> dict:
+  """
+  Builds a synthetic catalog whose courses require a mix of single courses and groups of
+  alternatives among the courses before them
+
+  Args:
+    - course_count (int): The number of courses of the catalog
+    - seed (int): The seed of the random generator
+
+  Returns:
+    - dict: The nested prerequisite lists keyed by the course code
+  """
+
+  random_generator = random.Random(seed)
+  course_codes = [f"CS {100 + i}" for i in range(course_count)]
+  catalog = {}
+  for i, course_code in enumerate(course_codes):
+    requirement = []
+    for _ in range(random_generator.randint(0, 3) if i else 0):
+      if random_generator.random() < 0.6:
+        requirement.append(random_generator.choice(course_codes[:i]))
+      else:
+        requirement.append(random_generator.sample(course_codes[:i], min(i, random_generator.randint(2, 3))))
+    catalog[course_code] = requirement
+  return catalog
+
+
+def build_cohort(catalog: dict,
+                 student_count: int,
+                 seed: int) -> list:
+  """
+  Builds a synthetic cohort, every student having completed most of a random prefix of the
+  catalog
+  """
+
+  random_generator = random.Random(seed)
+  course_codes = list(catalog)
+  return [
+    [
+      course_code
+      for course_code in course_codes[:random_generator.randint(0, len(course_codes))]
+      if random_generator.random() < 0.8
+    ]
+    for _ in range(student_count)
+  ]
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Measures the time to compile a catalog and check a cohort against it",
+  )
+  parser.add_argument("--courses", type=int, default=300, help="The number of courses of the catalog")
+  parser.add_argument("--students", type=int, default=5000, help="The number of students of the cohort")
+  parser.add_argument("--seed", type=int, default=7, help="The seed of the random generator")
+  arguments = parser.parse_args()
+
+  catalog = build_catalog(arguments.courses, arguments.seed)
+  cohort = build_cohort(catalog, arguments.students, arguments.seed)
+
+  start = perf_counter()
+  eligibility_engine = EligibilityEngine(catalog)
+  compile_ms = (perf_counter() - start) * 1000
+
+  start = perf_counter()
+  student_slices = eligibility_engine.slice_cohort(cohort)
+  slice_ms = (perf_counter() - start) * 1000
+
+  start = perf_counter()
+  eligibility_engine.eligible_students_by_slices(student_slices, len(cohort))
+  cohort_ms = (perf_counter() - start) * 1000
+
+  start = perf_counter()
+  eligible_courses = eligibility_engine.eligible_courses_for_cohort(cohort)
+  expanded_cohort_ms = (perf_counter() - start) * 1000
+
+  start = perf_counter()
+  per_student_eligible_courses = [eligibility_engine.eligible_courses(completed_courses) for completed_courses in cohort]
+  per_student_ms = (perf_counter() - start) * 1000
+
+  assert eligible_courses == per_student_eligible_courses
+  print(json.dumps(
+    {
+      "courses": arguments.courses,
+      "students": arguments.students,
+      "compile_ms": round(compile_ms, 2),
+      "cohort_slicing_ms": round(slice_ms, 2),
+      "cohort_bitsets_ms": round(cohort_ms, 2),
+      "cohort_course_lists_ms": round(expanded_cohort_ms, 2),
+      "per_student_loop_ms": round(per_student_ms, 2),
+    },
+    indent=2,
+  ))
\ No newline at end of file
@@ -0,0 +1,98 @@
+import os
+import sys
+import json
+import random
+import argparse
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.user_interaction.search_index import SearchIndex
+
+
+VOCABULARY = ["data", "systems", "theory", "design", "analysis", "network", "algorithms", "security", "graphs", "databases", "machine", "learning", "compilers", "operating", "vision"]
+
+
+def build_programs(program_count: int,
+                   courses_per_program: int,
+                   seed: int) -> dict:
+  """
+  Builds synthetic programs, every program listing its own courses along with a few courses
+  of the other programs, each course having a name, a description and a prerequisites
+  description mentioning other course codes
+
+  Args:
+    - program_count (int): The number of programs
+    - courses_per_program (int): The number of courses of every program
+    - seed (int): The seed of the random generator
+
+  Returns:
+    - dict: The course records keyed by the course code, keyed by the program
+  """
+
+  random_generator = random.Random(seed)
+  vocabulary = VOCABULARY + [f"term{i}" for i in range(5000)]
+  subjects = [f"{chr(65 + program % 26)}{chr(65 + program // 26 % 26)}{chr(65 + program // 676 % 26)}" for program in range(program_count)]
+  programs = {}
+  for program, subject in enumerate(subjects):
+    programs[f"program_{program + 1}"] = {
+      f"{subject} {100 + i}": {
+        "course_name": " ".join(random_generator.choices(vocabulary, k=4)),
+        "course_description": " ".join(random_generator.choices(vocabulary, k=80)),
+        "prerequisites_description": f"{random_generator.choice(subjects)} {100 + random_generator.randrange(courses_per_program)} with a grade of C or better",
+      }
+      for i in range(courses_per_program)
+    }
+
+  for courses in programs.values():
+    shared_program = programs[random_generator.choice(list(programs))]
+    courses |= dict(random_generator.sample(sorted(shared_program.items()), min(10, len(shared_program))))
+  return programs
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Measures the time to build the course search index, to re-index a single program and to answer searches",
+  )
+  parser.add_argument("--programs", type=int, default=100, help="The number of programs")
+  parser.add_argument("--courses-per-program", type=int, default=60, help="The number of courses of every program")
+  parser.add_argument("--queries", type=int, default=1000, help="The number of searches")
+  parser.add_argument("--seed", type=int, default=7, help="The seed of the random generator")
+  arguments = parser.parse_args()
+
+  programs = build_programs(arguments.programs, arguments.courses_per_program, arguments.seed)
+  search_index = SearchIndex(k1=1.2, b=0.75, course_name_weight=3)
+
+  start = perf_counter()
+  for program, courses in programs.items():
+    search_index.index_program(program, courses)
+  build_ms = (perf_counter() - start) * 1000
+
+  start = perf_counter()
+  search_index.index_program("program_1", programs["program_1"])
+  reindex_ms = (perf_counter() - start) * 1000
+
+  random_generator = random.Random(arguments.seed)
+  course_codes = sorted({course_code for courses in programs.values() for course_code in courses})
+  queries = [
+    " ".join(random_generator.choices(VOCABULARY, k=random_generator.randint(1, 3))) if i % 2 else random_generator.choice(course_codes)[:random_generator.randint(2, 6)]
+    for i in range(arguments.queries)
+  ]
+  latencies_ms = []
+  for query in queries:
+    start = perf_counter()
+    search_index.search(query)
+    latencies_ms.append((perf_counter() - start) * 1000)
+  latencies_ms.sort()
+
+  print(json.dumps(
+    {
+      "courses": search_index.size,
+      "programs": len(programs),
+      "build_ms": round(build_ms, 2),
+      "reindex_one_program_ms": round(reindex_ms, 2),
+      "search_p50_ms": round(latencies_ms[len(latencies_ms) // 2], 3),
+      "search_p99_ms": round(latencies_ms[int(len(latencies_ms) * 0.99)], 3),
+    },
+    indent=2,
+  ))
\ No newline at end of file
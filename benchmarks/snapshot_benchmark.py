@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.catalog_snapshot import CatalogSnapshot, write_catalog_snapshot
+
+
+def build_tracks_information(course_count: int,
+                             track_count: int,
+                             courses_per_track: int,
+                             seed: int) -> dict:
+  """
+  Builds synthetic track information documents, every track listing a random sample of the
+  courses, each course requiring a mix of single courses and groups of alternatives among 
+  the courses before it
+
+  Args:
+    - course_count (int): The number of courses of the catalog
+    - track_count (int): The number of tracks
+    - courses_per_track (int): The number of courses listed by every track
+    - seed (int): The seed of the random generator
+
+  Returns:
+    - dict: The track information documents keyed by the track
+  """
+
+  random_generator = random.Random(seed)
+  course_codes = [f"CS {100 + i}" for i in range(course_count)]
+  course_documents = {}
+  for i, course_code in enumerate(course_codes):
+    requirement = []
+    for _ in range(random_generator.randint(0, 3) if i else 0):
+      if random_generator.random() < 0.6:
+        requirement.append(random_generator.choice(course_codes[:i]))
+      else:
+        requirement.append(random_generator.sample(course_codes[:i], min(i, random_generator.randint(2, 3))))
+    course_documents[course_code] = {
+      "course_code": course_code,
+      "course_name": f"Course {course_code}",
+      "credits": 3,
+      "course_description": " ".join(random_generator.choices(["data", "systems", "theory", "design", "analysis"], k=60)),
+      "prerequisites": requirement,
+      "corequisites": [],
+    }
+
+  return {
+    f"track_{track + 1}": {
+      course_code: course_documents[course_code] | {
+        "year": str(random_generator.randint(1, 4)),
+        "semester": str(random_generator.randint(1, 2)),
+        "dependency_count": random_generator.randint(0, 10),
+        "on_dependant_courses_count": random_generator.randint(0, 20),
+      }
+      for course_code in random_generator.sample(course_codes, min(course_count, courses_per_track))
+    }
+    for track in range(track_count)
+  }
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Measures the time to write and open a course catalog snapshot against parsing the same tracks as JSON",
+  )
+  parser.add_argument("--courses", type=int, default=3000, help="The number of courses of the catalog")
+  parser.add_argument("--tracks", type=int, default=20, help="The number of tracks")
+  parser.add_argument("--courses-per-track", type=int, default=150, help="The number of courses listed by every track")
+  parser.add_argument("--seed", type=int, default=7, help="The seed of the random generator")
+  arguments = parser.parse_args()
+
+  tracks_information = build_tracks_information(arguments.courses, arguments.tracks, arguments.courses_per_track, arguments.seed)
+  serialized_tracks_information = json.dumps(tracks_information)
+  course_codes = sorted({course_code for track_information in tracks_information.values() for course_code in track_information})
+
+  with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, "benchmark.snapshot")
+    start = perf_counter()
+    snapshot_statistics = write_catalog_snapshot(path, tracks_information, {})
+    write_ms = (perf_counter() - start) * 1000
+
+    start = perf_counter()
+    snapshot = CatalogSnapshot(path)
+    open_ms = (perf_counter() - start) * 1000
+
+    start = perf_counter()
+    for course_code in course_codes:
+      snapshot.get_course(course_code)
+    snapshot_lookups_ms = (perf_counter() - start) * 1000
+
+  start = perf_counter()
+  json.loads(serialized_tracks_information)
+  json_parse_ms = (perf_counter() - start) * 1000
+
+  print(json.dumps(
+    {
+      "courses": snapshot_statistics["courses"],
+      "tracks": snapshot_statistics["tracks"],
+      "snapshot_bytes": snapshot_statistics["bytes"],
+      "json_bytes": len(serialized_tracks_information),
+      "snapshot_write_ms": round(write_ms, 2),
+      "snapshot_open_ms": round(open_ms, 2),
+      "snapshot_lookup_every_course_ms": round(snapshot_lookups_ms, 2),
+      "json_parse_ms": round(json_parse_ms, 2),
+    },
+    indent=2,
+  ))
\ No newline at end of file
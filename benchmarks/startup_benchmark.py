@@ -0,0 +1,132 @@
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from time import perf_counter
+
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = (
+  "google.generativeai",
+  "pymongo",
+  "bs4",
+  "tqdm",
+  "requests",
+  "fastapi",
+  "uvicorn",
+)
+SCENARIOS = {
+  "cli_help": [sys.executable, "-m", "src", "--help"],
+  "cli_import": [sys.executable, "-c", "import src.__main__"],
+  "engine_import": [sys.executable, "-c", "import src.engine"],
+}
+
+
+def time_scenario(command: list,
+                  runs: int) -> dict:
+  """
+  Runs a command several times in a fresh interpreter and reports its wall time
+
+  Args:
+    - command (list): The command to be run
+    - runs (int): The number of runs
+
+  Returns:
+    - dict: The median, minimum and maximum wall time in milliseconds
+  """
+
+  timings = []
+  for _ in range(runs):
+    start = perf_counter()
+    subprocess.run(command, cwd=REPOSITORY_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    timings.append((perf_counter() - start) * 1000)
+
+  return {
+    "median_ms": round(statistics.median(timings), 2),
+    "min_ms": round(min(timings), 2),
+    "max_ms": round(max(timings), 2),
+  }
+
+
+def imported_heavy_modules(module: str) -> list:
+  """
+  Returns the heavy dependencies pulled in by importing a module
+
+  Args:
+    - module (str): The module to be imported
+
+  Returns:
+    - list: The heavy dependencies found in sys.modules after the import
+  """
+
+  completed_process = subprocess.run(
+    [
+      sys.executable,
+      "-c",
+      f"import sys, json, {module}; print(json.dumps([m for m in {list(HEAVY_MODULES)!r} if m in sys.modules]))",
+    ],
+    cwd=REPOSITORY_ROOT,
+    capture_output=True,
+    text=True,
+  )
+  if completed_process.returncode != 0:
+    return [f"import failed: {completed_process.stderr.strip().splitlines()[-1]}"]
+  return json.loads(completed_process.stdout)
+
+
+def slowest_imports(module: str,
+                    top: int) -> list:
+  """
+  Returns the slowest imports of a module, as reported by 'python -X importtime'
+
+  Args:
+    - module (str): The module to be imported
+    - top (int): The number of imports to be returned
+
+  Returns:
+    - list: The slowest imports with their cumulative import time in milliseconds
+  """
+
+  completed_process = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+    cwd=REPOSITORY_ROOT,
+    capture_output=True,
+    text=True,
+  )
+  imports = []
+  for line in completed_process.stderr.splitlines():
+    if not line.startswith("import time:") or "cumulative" in line:
+      continue
+    _, cumulative, name = [part.strip() for part in line[len("import time:"):].split("|")]
+    imports.append((int(cumulative) / 1000, name.strip()))
+
+  return [
+    {"module": name, "cumulative_ms": round(cumulative, 2)}
+    for cumulative, name in sorted(imports, reverse=True)[:top]
+  ]
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Measures the start up time of the batch entry point and the imports it pays for",
+  )
+  parser.add_argument("--runs", type=int, default=10, help="The number of runs per scenario")
+  parser.add_argument("--top", type=int, default=10, help="The number of slowest imports to report")
+  arguments = parser.parse_args()
+
+  print(json.dumps(
+    {
+      "scenarios": {
+        scenario: time_scenario(command, arguments.runs)
+        for scenario, command in SCENARIOS.items()
+      },
+      "heavy_modules_imported": {
+        module: imported_heavy_modules(module)
+        for module in ("src.__main__", "src.engine")
+      },
+      "slowest_imports_of_src.__main__": slowest_imports("src.__main__", arguments.top),
+    },
+    indent=2,
+  ))
\ No newline at end of file
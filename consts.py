@@ -1,7 +1,42 @@
 from configparser import ConfigParser
 
-config = ConfigParser()
-config.read('config.ini')
+config = None
+
+
+def get_config() -> ConfigParser:
+  """
+  Returns the configuration file, reading it on the first call rather than on import so
+  that the entry points not needing the configuration start without parsing it
+
+  Args:
+    - None
+
+  Returns:
+    - ConfigParser: The configuration file
+  """
+
+  global config
+  if config is None:
+    config = ConfigParser()
+    config.read('config.ini')
+  return config
+
+
+def get_config_section(section_name: str):
+  """
+  Returns a section of the configuration file, falling back to the empty default section
+  when the section is not present so that the optional settings use their fallbacks
+
+  Args:
+    - section_name (str): The name of the section in config.ini
+
+  Returns:
+    - SectionProxy: The section of the configuration file
+  """
+
+  if get_config().has_section(section_name):
+    return config[section_name]
+  return config[config.default_section]
 
 
 class GoogleGeminiConsts:
@@ -10,7 +45,7 @@ class GoogleGeminiConsts:
   """
   
   def __init__(self) -> None:
-    self.config = config["GOOGLE_GEMINI_CONSTS"]
+    self.config = get_config()["GOOGLE_GEMINI_CONSTS"]
 
 
   def get_constants(self) -> dict:
@@ -24,11 +59,19 @@ class GoogleGeminiConsts:
       - dict: The constants for the Google Gemini API
     """
     
+    api_key = self.config.get("api_key")
+    api_keys = self.config.get("api_keys", fallback=api_key)
+
     return {
-      "api_key": self.config.get("api_key"),
+      "api_key": api_key,
+      "api_keys": [key.strip() for key in api_keys.split(",") if key.strip()] if api_keys else [],
       "temperature": self.config.getint("temperature"),
       "generative_model": self.config.get("generative_model"),
+      "routing_models": [model.strip() for model in self.config.get("routing_models", fallback="gemini-1.5-flash-8b, gemini-1.5-flash, gemini-1.5-pro").split(",") if model.strip()],
       "prompt_for_segregating_fetched_course_description": self.config.get("prompt_for_segregating_fetched_course_description"),
+      "requests_per_window": self.config.getint("requests_per_window", fallback=10),
+      "rate_limit_window_seconds": self.config.getfloat("rate_limit_window_seconds", fallback=120.0),
+      "quota_cooldown_seconds": self.config.getfloat("quota_cooldown_seconds", fallback=60.0),
     }
 
 
@@ -38,7 +81,7 @@ class NJITConsts:
   """
   
   def __init__(self) -> None:
-    self.config = config["NJIT_CONSTS"]
+    self.config = get_config()["NJIT_CONSTS"]
 
 
   def get_constants(self) -> dict:
@@ -63,7 +106,7 @@ class MondoDBConsts:
   """
   
   def __init__(self) -> None:
-    self.config = config["MONGODB_CONSTS"]
+    self.config = get_config()["MONGODB_CONSTS"]
 
 
   def get_constants(self) -> dict:
@@ -84,4 +127,418 @@ class MondoDBConsts:
 
     return {
       "host": host,
+    }
+
+
+class CheckpointConsts:
+  """
+  A class to store the constants for checkpointing the scrapes
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("CHECKPOINT_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for checkpointing the scrapes
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for checkpointing the scrapes
+    """
+    
+    return {
+      "checkpoint_database": self.config.get("checkpoint_database", fallback="scrape_checkpoints.sqlite3"),
+    }
+
+
+class ReadCacheConsts:
+  """
+  A class to store the constants for the in-process cache of the read API
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("READ_CACHE_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the in-process cache of the read API
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the in-process cache of the read API
+    """
+    
+    return {
+      "max_entries": self.config.getint("max_entries", fallback=1024),
+      "ttl_seconds": self.config.getint("ttl_seconds", fallback=300),
+      "version_check_seconds": self.config.getfloat("version_check_seconds", fallback=5.0),
+    }
+
+
+class ProfilingConsts:
+  """
+  A class to store the constants for profiling the scrape and improvise runs
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("PROFILING_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for profiling the scrape and improvise runs
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for profiling the scrape and improvise runs
+    """
+    
+    return {
+      "enabled": self.config.getboolean("enabled", fallback=False),
+      "output_directory": self.config.get("output_directory", fallback="profiles"),
+      "sampling_interval_ms": self.config.getfloat("sampling_interval_ms", fallback=5.0),
+    }
+
+
+class StorageConsts:
+  """
+  A class to store the constants for the storage backend
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("STORAGE_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the storage backend
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the storage backend
+    """
+    
+    return {
+      "backend": self.config.get("backend", fallback="mongo"),
+      "sqlite_database": self.config.get("sqlite_database", fallback="local_storage.sqlite3"),
+      "bulk_load_batch_size": self.config.getint("bulk_load_batch_size", fallback=1000),
+    }
+
+
+class PrerequisiteParserConsts:
+  """
+  A class to store the constants for the rule based prerequisite parser
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("PREREQUISITE_PARSER_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the rule based prerequisite parser
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the rule based prerequisite parser
+    """
+    
+    return {
+      "enabled": self.config.getboolean("enabled", fallback=True),
+      "minimum_confidence": self.config.getfloat("minimum_confidence", fallback=0.9),
+    }
+
+
+class WorkQueueConsts:
+  """
+  A class to store the constants for the work queue shared by the worker processes
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("WORK_QUEUE_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the work queue shared by the worker processes
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the work queue shared by the worker processes
+    """
+    
+    return {
+      "backend": self.config.get("backend", fallback="mongo"),
+      "mongo_host": self.config.get("mongo_host", fallback=""),
+      "lease_seconds": self.config.getfloat("lease_seconds", fallback=600.0),
+      "max_attempts": self.config.getint("max_attempts", fallback=3),
+      "poll_interval_seconds": self.config.getfloat("poll_interval_seconds", fallback=5.0),
+    }
+
+
+class HttpConsts:
+  """
+  A class to store the constants for the HTTP layer of the scraper
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("HTTP_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the HTTP layer of the scraper
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the HTTP layer of the scraper
+    """
+    
+    return {
+      "initial_concurrency": self.config.getint("initial_concurrency", fallback=2),
+      "min_concurrency": self.config.getint("min_concurrency", fallback=1),
+      "max_concurrency": self.config.getint("max_concurrency", fallback=16),
+      "latency_tolerance": self.config.getfloat("latency_tolerance", fallback=2.0),
+      "max_retries": self.config.getint("max_retries", fallback=3),
+      "timeout_seconds": self.config.getfloat("timeout_seconds", fallback=30.0),
+      "respect_robots_txt": self.config.getboolean("respect_robots_txt", fallback=True),
+      "user_agent": self.config.get("user_agent", fallback="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36 Edg/126.0.0.0"),
+    }
+
+
+class SemesterPlannerConsts:
+  """
+  A class to store the constants for the semester planner
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("SEMESTER_PLANNER_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the semester planner
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the semester planner
+    """
+    
+    return {
+      "credit_cap": self.config.getint("credit_cap", fallback=18),
+      "semesters_per_year": self.config.getint("semesters_per_year", fallback=2),
+    }
+
+
+class PipelineConsts:
+  """
+  A class to store the constants for the staged fetch, parse, segregate and store pipeline
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("PIPELINE_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the staged fetch, parse, segregate and store pipeline
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the staged fetch, parse, segregate and store pipeline
+    """
+    
+    return {
+      "enabled": self.config.getboolean("enabled", fallback=True),
+      "queue_size": self.config.getint("queue_size", fallback=32),
+      "fetch_workers": self.config.getint("fetch_workers", fallback=0),
+      "parse_processes": self.config.getint("parse_processes", fallback=2),
+      "segregate_workers": self.config.getint("segregate_workers", fallback=0),
+      "store_batch_size": self.config.getint("store_batch_size", fallback=25),
+    }
+
+
+class PrerequisiteClosureConsts:
+  """
+  A class to store the constants for the prefetch of the prerequisites missing from the plan grid
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("PREREQUISITE_CLOSURE_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the prefetch of the prerequisites missing from the plan grid
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the prefetch of the prerequisites missing from the plan grid
+    """
+    
+    return {
+      "enabled": self.config.getboolean("enabled", fallback=True),
+      "max_depth": self.config.getint("max_depth", fallback=3),
+    }
+
+
+class UsageBudgetConsts:
+  """
+  A class to store the constants for the Gemini usage accounting and the budgets of the runs
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("USAGE_BUDGET_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the Gemini usage accounting and the budgets of the runs
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the Gemini usage accounting and the budgets of the runs
+    """
+    
+    return {
+      "max_tokens_per_run": self.config.getint("max_tokens_per_run", fallback=0),
+      "max_requests_per_run": self.config.getint("max_requests_per_run", fallback=0),
+      "on_budget_exhausted": self.config.get("on_budget_exhausted", fallback="degrade"),
+    }
+
+
+class ScrapeEstimateConsts:
+  """
+  A class to store the constants for estimating the cost and the time of a scrape before it is run
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("SCRAPE_ESTIMATE_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for estimating the cost and the time of a scrape before it is run
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for estimating the cost and the time of a scrape before it is run
+    """
+    
+    return {
+      "rule_based_share": self.config.getfloat("rule_based_share", fallback=0.5),
+      "prompt_tokens_per_call": self.config.getint("prompt_tokens_per_call", fallback=700),
+      "output_tokens_per_call": self.config.getint("output_tokens_per_call", fallback=200),
+      "seconds_per_fetch": self.config.getfloat("seconds_per_fetch", fallback=1.0),
+      "seconds_per_gemini_call": self.config.getfloat("seconds_per_gemini_call", fallback=3.0),
+      "closure_courses_per_course": self.config.getfloat("closure_courses_per_course", fallback=0.2),
+    }
+
+
+class CatalogSnapshotConsts:
+  """
+  A class to store the constants for the binary snapshots of the course catalogs
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("CATALOG_SNAPSHOT_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the binary snapshots of the course catalogs
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the binary snapshots of the course catalogs
+    """
+    
+    return {
+      "enabled": self.config.getboolean("enabled", fallback=True),
+      "directory": self.config.get("directory", fallback="catalog_snapshots"),
+    }
+
+
+class ColumnarExportConsts:
+  """
+  A class to store the constants for the columnar export of the course catalogs
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("COLUMNAR_EXPORT_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the columnar export of the course catalogs
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the columnar export of the course catalogs
+    """
+    
+    return {
+      "directory": self.config.get("directory", fallback="exports"),
+      "format": self.config.get("format", fallback="parquet"),
+      "batch_size": self.config.getint("batch_size", fallback=10000),
+    }
+
+
+class SearchIndexConsts:
+  """
+  A class to store the constants for the full-text search index of the courses
+  """
+  
+  def __init__(self) -> None:
+    self.config = get_config_section("SEARCH_INDEX_CONSTS")
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the full-text search index of the courses
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the full-text search index of the courses
+    """
+    
+    return {
+      "k1": self.config.getfloat("k1", fallback=1.2),
+      "b": self.config.getfloat("b", fallback=0.75),
+      "course_name_weight": self.config.getint("course_name_weight", fallback=3),
+      "default_limit": self.config.getint("default_limit", fallback=10),
+      "max_limit": self.config.getint("max_limit", fallback=100),
     }
\ No newline at end of file
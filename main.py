@@ -1,12 +1,63 @@
 import uvicorn
 import fastapi
 from src.engine import Engine
+from src.utils.logging_handler import LoggingHandler
+from src.utils.metrics_handler import metrics_handler
+from src.user_interaction.catalog_reader import CatalogReader
 
 
 gemin_course_server = fastapi.FastAPI(
   title="Gemin Course Server",
   description="API for Gemin Course Server",
 )
+catalog_reader = CatalogReader(
+  logger=LoggingHandler()
+)
+
+
+def split_query_values(values: str | None) -> list | None:
+  """
+  Splits a comma separated query parameter into its values
+  """
+
+  if not values:
+    return None
+  return [value.strip() for value in values.split(",") if value.strip()]
+
+
+def build_read_response(cached_response: dict | None,
+                        if_none_match: str | None,
+                        not_found_message: str) -> fastapi.Response:
+  """
+  Builds the response of a read endpoint, answering with 304 when the client already holds
+  the current version of the documents
+  """
+
+  if cached_response is None:
+    return fastapi.responses.JSONResponse(
+      status_code=404,
+      content={
+        "message": not_found_message,
+      },
+    )
+
+  headers = {
+    "ETag": cached_response["etag"],
+    "Cache-Control": "no-cache",
+  }
+  if if_none_match:
+    client_etags = [etag.strip().removeprefix("W/") for etag in if_none_match.split(",")]
+    if "*" in client_etags or cached_response["etag"] in client_etags:
+      return fastapi.Response(
+        status_code=304,
+        headers=headers,
+      )
+
+  return fastapi.Response(
+    content=cached_response["body"],
+    media_type="application/json",
+    headers=headers,
+  )
 
 @gemin_course_server.get(
   path='/',
@@ -24,34 +75,262 @@ async def hello_world():
   tags=["NJIT Course Catalog Scraper"],
   description="Scrape NJIT Course Catalog",
 )
-async def scrape_course(
+def scrape_course(
   course_catalog_name: str,
-  course_catalog_url: str
+  course_catalog_url: str,
+  run_id: str | None = None,
+  resume: bool = False,
+  profile: bool = False,
+  stream: bool = False,
+  dry_run: bool = False,
 ):
   engine = Engine()
   status = engine.scrape_course_catalog_website(
     course_catalog_url=course_catalog_url,
-    course_catalog_name=course_catalog_name
+    course_catalog_name=course_catalog_name,
+    run_id=run_id,
+    resume=resume,
+    profile=profile,
+    stream=stream,
+    dry_run=dry_run,
   )
+  if not dry_run:
+    catalog_reader.invalidate(
+      course_catalog_name=course_catalog_name
+    )
 
   return status
 
 
+@gemin_course_server.post(
+  path='/scrape_courses',
+  tags=["NJIT Course Catalog Scraper"],
+  description="Scrape the NJIT Course Catalogs of several programs at once, fetching the courses they share only once",
+)
+def scrape_courses(
+  course_catalogs: list[dict[str, str]] = fastapi.Body(embed=True),
+  run_id: str | None = None,
+  resume: bool = False,
+  profile: bool = False,
+):
+  engine = Engine()
+  status = engine.scrape_course_catalog_websites(
+    course_catalogs=course_catalogs,
+    run_id=run_id,
+    resume=resume,
+    profile=profile,
+  )
+  for course_catalog in course_catalogs:
+    catalog_reader.invalidate(
+      course_catalog_name=course_catalog["course_catalog_name"]
+    )
+
+  return status
+
+
+@gemin_course_server.get(
+  path='/metrics',
+  tags=["Metrics"],
+  description="Per-stage latency histograms and counters in the Prometheus text format",
+)
+async def metrics():
+  return fastapi.responses.PlainTextResponse(
+    content=metrics_handler.render(),
+    media_type="text/plain; version=0.0.4",
+  )
+
+
+@gemin_course_server.get(
+  path='/course_catalog/{course_catalog_name}',
+  tags=["Scraped Course Catalogs"],
+  description="Get the scraped course catalog of a program, optionally only the comma separated tracks",
+)
+def get_course_catalog(
+  course_catalog_name: str,
+  tracks: str | None = None,
+  if_none_match: str | None = fastapi.Header(default=None),
+):
+  cached_response = catalog_reader.get_course_catalog(
+    course_catalog_name=course_catalog_name,
+    tracks=split_query_values(tracks),
+  )
+
+  return build_read_response(
+    cached_response=cached_response,
+    if_none_match=if_none_match,
+    not_found_message=f"No course catalog found for {course_catalog_name}",
+  )
+
+
+@gemin_course_server.get(
+  path='/course_catalog/{course_catalog_name}/tracks/{track}',
+  tags=["Scraped Course Catalogs"],
+  description="Get the track information of a program, optionally only the comma separated course codes",
+)
+def get_track(
+  course_catalog_name: str,
+  track: str,
+  courses: str | None = None,
+  if_none_match: str | None = fastapi.Header(default=None),
+):
+  cached_response = catalog_reader.get_track(
+    course_catalog_name=course_catalog_name,
+    track=track,
+    courses=split_query_values(courses),
+  )
+
+  return build_read_response(
+    cached_response=cached_response,
+    if_none_match=if_none_match,
+    not_found_message=f"No track {track} found for {course_catalog_name}",
+  )
+
+
+@gemin_course_server.get(
+  path='/course_catalog/{course_catalog_name}/courses/{course_code}',
+  tags=["Scraped Course Catalogs"],
+  description="Get a single course of a program, optionally only the comma separated fields",
+)
+def get_course(
+  course_catalog_name: str,
+  course_code: str,
+  fields: str | None = None,
+  if_none_match: str | None = fastapi.Header(default=None),
+):
+  cached_response = catalog_reader.get_course(
+    course_catalog_name=course_catalog_name,
+    course_code=course_code,
+    fields=split_query_values(fields),
+  )
+
+  return build_read_response(
+    cached_response=cached_response,
+    if_none_match=if_none_match,
+    not_found_message=f"No course {course_code} found for {course_catalog_name}",
+  )
+
+
+@gemin_course_server.get(
+  path='/course_catalog/{course_catalog_name}/snapshot/courses/{course_code}',
+  tags=["Scraped Course Catalogs"],
+  description="Get a single course of a program, with the codes of its prerequisites and corequisites, from the memory-mapped snapshot of the program",
+)
+def get_snapshot_course(
+  course_catalog_name: str,
+  course_code: str,
+):
+  snapshot = catalog_reader.get_catalog_snapshot(
+    course_catalog_name=course_catalog_name,
+  )
+  course = snapshot.get_course(course_code) if snapshot else None
+  if course is None:
+    return fastapi.responses.JSONResponse(
+      status_code=404,
+      content={
+        "message": f"No course {course_code} found in the snapshot of {course_catalog_name}",
+      },
+    )
+
+  return {
+    "snapshot_version": snapshot.version,
+    "course": course,
+  }
+
+
+@gemin_course_server.get(
+  path='/course_catalog/{course_catalog_name}/tracks/{track}/eligible_courses',
+  tags=["Scraped Course Catalogs"],
+  description="Get the courses of a track a student may take next, given the comma separated codes of the completed courses",
+)
+def get_eligible_courses(
+  course_catalog_name: str,
+  track: str,
+  completed: str | None = None,
+):
+  eligibility_engine = catalog_reader.get_eligibility_engine(
+    course_catalog_name=course_catalog_name,
+    track=track,
+  )
+  if eligibility_engine is None:
+    return fastapi.responses.JSONResponse(
+      status_code=404,
+      content={
+        "message": f"No track {track} found for {course_catalog_name}",
+      },
+    )
+
+  return {
+    "eligible_courses": eligibility_engine.eligible_courses(
+      completed_courses=split_query_values(completed) or [],
+    ),
+  }
+
+
+@gemin_course_server.post(
+  path='/course_catalog/{course_catalog_name}/tracks/{track}/eligible_courses',
+  tags=["Scraped Course Catalogs"],
+  description="Get the courses of a track every student of a cohort may take next, given the completed courses of each student",
+)
+def get_eligible_courses_for_cohort(
+  course_catalog_name: str,
+  track: str,
+  cohort: list[list[str]] = fastapi.Body(embed=True),
+):
+  eligibility_engine = catalog_reader.get_eligibility_engine(
+    course_catalog_name=course_catalog_name,
+    track=track,
+  )
+  if eligibility_engine is None:
+    return fastapi.responses.JSONResponse(
+      status_code=404,
+      content={
+        "message": f"No track {track} found for {course_catalog_name}",
+      },
+    )
+
+  return {
+    "eligible_courses": eligibility_engine.eligible_courses_for_cohort(
+      cohort=cohort,
+    ),
+  }
+
+
+@gemin_course_server.get(
+  path='/search',
+  tags=["Scraped Course Catalogs"],
+  description="Search the courses by the keywords of their name, description and prerequisites, or by the beginning of their course code, optionally only those of a program",
+)
+def search_courses(
+  query: str,
+  course_catalog_name: str | None = None,
+  limit: int | None = None,
+):
+  return catalog_reader.search(
+    query=query,
+    course_catalog_name=course_catalog_name,
+    limit=limit,
+  )
+
+
 @gemin_course_server.post(
   path='/user_responses',
   tags=["User Responses"],
-  description="Get the user responses for the course recommendation",
+  description="Plan the remaining semesters of a track, given the comma separated codes of the completed courses",
 )
-async def user_responses(
+def user_responses(
     degree_program: str,
     year_and_semester_for_recommendation: str,
     track_academically_focused: str,
+    completed_courses: str | None = None,
+    credit_cap: int | None = None,
 ):
   engine = Engine()
   status = engine.process_user_responses(
     degree_program=degree_program,
     year_and_semester_for_recommendation=year_and_semester_for_recommendation,
-    track_academically_focused=track_academically_focused
+    track_academically_focused=track_academically_focused,
+    completed_courses=split_query_values(completed_courses),
+    credit_cap=credit_cap,
   )
 
   return status
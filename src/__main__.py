@@ -0,0 +1,238 @@
+import sys
+import json
+import argparse
+
+
+def scrape(arguments: argparse.Namespace) -> dict:
+  """
+  Crawls the course catalog website of a program and, unless only crawling, improvises the
+  scrapped data
+
+  Args:
+    - arguments (argparse.Namespace): The parsed command line arguments
+
+  Returns:
+    - dict: The status of the scrape
+  """
+
+  from src.engine import Engine
+
+  return Engine().scrape_course_catalog_website(
+    course_catalog_url=arguments.url,
+    course_catalog_name=arguments.program,
+    run_id=arguments.run_id,
+    resume=arguments.resume,
+    profile=arguments.profile,
+    improvise=arguments.command == "scrape",
+    stream=getattr(arguments, "stream", False),
+    dry_run=getattr(arguments, "dry_run", False),
+  )
+
+
+def improvise(arguments: argparse.Namespace) -> dict:
+  """
+  Improvises the course catalog already crawled for a program
+
+  Args:
+    - arguments (argparse.Namespace): The parsed command line arguments
+
+  Returns:
+    - dict: The status of the improvisation
+  """
+
+  from src.engine import Engine
+
+  return Engine().improvise_course_catalog(
+    course_catalog_name=arguments.program,
+    profile=arguments.profile,
+  )
+
+
+def enqueue(arguments: argparse.Namespace) -> dict:
+  """
+  Enqueues the crawl of a program, to be split between the workers
+
+  Args:
+    - arguments (argparse.Namespace): The parsed command line arguments
+
+  Returns:
+    - dict: The status of the enqueueing
+  """
+
+  from src.engine import Engine
+
+  return Engine().enqueue_course_catalog(
+    course_catalog_url=arguments.url,
+    course_catalog_name=arguments.program,
+    run_id=arguments.run_id,
+  )
+
+
+def worker(arguments: argparse.Namespace) -> dict:
+  """
+  Pulls work items from the work queue and processes them
+
+  Args:
+    - arguments (argparse.Namespace): The parsed command line arguments
+
+  Returns:
+    - dict: The number of work items processed and failed by the worker
+  """
+
+  from src.engine import Engine
+
+  return Engine().run_worker(
+    worker_id=arguments.worker_id,
+    max_items=arguments.max_items,
+    idle_timeout_seconds=arguments.idle_timeout,
+  )
+
+
+def load(arguments: argparse.Namespace) -> dict:
+  """
+  Ships the documents of a storage backend to another one
+
+  Args:
+    - arguments (argparse.Namespace): The parsed command line arguments
+
+  Returns:
+    - dict: The number of documents shipped per collection
+  """
+
+  from src.utils.bulk_loader import BulkLoader
+  from src.utils.logging_handler import LoggingHandler
+  from src.utils.storage_backends import get_storage_backend
+
+  loaded_documents = BulkLoader(
+    logger=LoggingHandler(),
+    source_backend=get_storage_backend(arguments.source),
+    target_backend=get_storage_backend(arguments.target),
+    batch_size=arguments.batch_size,
+  ).load(
+    databases=arguments.databases,
+  )
+  return {
+    "success": True,
+    "loaded_documents": loaded_documents,
+  }
+
+
+def export(arguments: argparse.Namespace) -> dict:
+  """
+  Exports the course catalogs of a storage backend as columnar tables for analytics
+
+  Args:
+    - arguments (argparse.Namespace): The parsed command line arguments
+
+  Returns:
+    - dict: The path and the number of rows of every exported table
+  """
+
+  from src.utils.logging_handler import LoggingHandler
+  from src.utils.storage_backends import get_storage_backend
+  from src.utils.columnar_exporter import ColumnarExporter
+
+  exported_tables = ColumnarExporter(
+    logger=LoggingHandler(),
+    storage_backend=get_storage_backend(arguments.source),
+    directory=arguments.directory,
+    batch_size=arguments.batch_size,
+    export_format=arguments.format,
+  ).export(
+    programs=arguments.programs,
+  )
+  return {
+    "success": exported_tables is not None,
+    "exported_tables": exported_tables,
+  }
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+  """
+  Builds the command line interface, one subcommand per batch job
+
+  Args:
+    - None
+
+  Returns:
+    - argparse.ArgumentParser: The argument parser
+  """
+
+  parser = argparse.ArgumentParser(
+    prog="python -m src",
+    description="Batch entry point of the NJIT Course Catalog Scraper",
+  )
+  subparsers = parser.add_subparsers(
+    dest="command",
+    required=True,
+  )
+
+  for command, help_message in (
+    ("scrape", "Crawl the course catalog website of a program and improvise the scrapped data"),
+    ("crawl", "Crawl the course catalog website of a program without improvising it"),
+  ):
+    subparser = subparsers.add_parser(command, help=help_message)
+    subparser.add_argument("--program", required=True, help="The name of the program, e.g. 'Computer Science BS'")
+    subparser.add_argument("--url", required=True, help="The URL of the course catalog page of the program")
+    subparser.add_argument("--run-id", default=None, help="The identifier of the run to resume or tag the checkpoints with")
+    subparser.add_argument("--resume", action="store_true", help="Skip the courses already checkpointed by the run")
+    subparser.add_argument("--profile", action="store_true", help="Profile the stages of the run")
+    if command == "scrape":
+      subparser.add_argument("--stream", action="store_true", help="Scrape, improvise and store the tracks one at a time")
+      subparser.add_argument("--dry-run", action="store_true", help="Only estimate the HTTP fetches, Gemini calls, tokens and time of the scrape")
+    subparser.set_defaults(handler=scrape)
+
+  subparser = subparsers.add_parser("improvise", help="Improvise the course catalog already crawled for a program")
+  subparser.add_argument("--program", required=True, help="The name of the program, e.g. 'Computer Science BS'")
+  subparser.add_argument("--profile", action="store_true", help="Profile the improvise stage")
+  subparser.set_defaults(handler=improvise)
+
+  subparser = subparsers.add_parser("enqueue", help="Enqueue the crawl of a program, to be split between the workers")
+  subparser.add_argument("--program", required=True, help="The name of the program, e.g. 'Computer Science BS'")
+  subparser.add_argument("--url", required=True, help="The URL of the course catalog page of the program")
+  subparser.add_argument("--run-id", default=None, help="The identifier of the run")
+  subparser.set_defaults(handler=enqueue)
+
+  subparser = subparsers.add_parser("worker", help="Pull work items from the work queue and process them")
+  subparser.add_argument("--worker-id", default=None, help="The identifier of the worker, used to hold the leases")
+  subparser.add_argument("--max-items", type=int, default=None, help="Stop after processing this many work items")
+  subparser.add_argument("--idle-timeout", type=float, default=None, help="Stop after this many seconds without any work")
+  subparser.set_defaults(handler=worker)
+
+  subparser = subparsers.add_parser("load", help="Ship the documents of a storage backend to another one")
+  subparser.add_argument("--source", default="sqlite", help="The storage backend to ship from")
+  subparser.add_argument("--target", default="mongo", help="The storage backend to ship to")
+  subparser.add_argument("--databases", nargs="*", default=None, help="The databases to ship, all of them if not given")
+  subparser.add_argument("--batch-size", type=int, default=None, help="The number of documents written per batch")
+  subparser.set_defaults(handler=load)
+
+  subparser = subparsers.add_parser("export", help="Export the course catalogs as columnar tables for analytics")
+  subparser.add_argument("--source", default=None, help="The storage backend to export from, the configured one if not given")
+  subparser.add_argument("--programs", nargs="*", default=None, help="The programs to export, all of them if not given")
+  subparser.add_argument("--format", choices=("parquet", "arrow"), default=None, help="The file format of the tables")
+  subparser.add_argument("--directory", default=None, help="The directory the tables are written into")
+  subparser.add_argument("--batch-size", type=int, default=None, help="The number of rows written per record batch")
+  subparser.set_defaults(handler=export)
+
+  return parser
+
+
+def main(argv: list | None = None) -> int:
+  """
+  Runs the subcommand given on the command line and prints its result as JSON
+
+  Args:
+    - argv (list | None): The command line arguments, those of the process if not given
+
+  Returns:
+    - int: The exit code, 0 if the subcommand succeeded
+  """
+
+  arguments = build_argument_parser().parse_args(argv)
+  result = arguments.handler(arguments)
+  print(json.dumps(result, indent=2, default=str))
+  return 0 if result.get("success") else 1
+
+
+if __name__ == "__main__":
+  sys.exit(main())
\ No newline at end of file
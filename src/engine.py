@@ -1,8 +1,17 @@
+import os
+import uuid
+from time import monotonic, sleep
+from consts import CatalogSnapshotConsts, SemesterPlannerConsts, WorkQueueConsts
 from src.utils.logging_handler import LoggingHandler
 from src.utils.database_handler import DatabaseHandler
-from src.scrape_data.website_scrapper import WebsiteScrapper
+from src.utils.checkpoint_handler import CheckpointHandler
+from src.utils.profiling_handler import ProfilingHandler
+from src.utils.usage_accountant import BudgetExhaustedError
+from src.utils.work_queue import WorkQueue, get_work_queue
+from src.utils.catalog_snapshot import write_catalog_snapshot
+from src.scrape_data.course_records import Course, Track, iterate_course_codes
 from src.scrape_data.improvise_scrapped_data import ImproviseScrappedData
-from src.user_interaction.process_user_responses import ProcessUserResponses
+from src.user_interaction.semester_planner import SemesterPlanner, parse_year_and_semester
 
 
 class Engine:
@@ -11,28 +20,187 @@ class Engine:
     self.database_handler = DatabaseHandler(
       logger=self.logger
     )
-    self.website_scrapper = WebsiteScrapper(
-      logger=self.logger,
-      database_handler=self.database_handler,
+    self.checkpoint_handler = CheckpointHandler(
+      logger=self.logger
+    )
+    self.profiling_handler = ProfilingHandler(
+      logger=self.logger
     )
     self.improvise_scrapped_data = ImproviseScrappedData(
       logger=self.logger,
       database_handler=self.database_handler,
     )
+    self.__website_scrapper = None
+    self.__work_queue = None
+    self.catalog_snapshot_consts = CatalogSnapshotConsts().get_constants()
+
+
+  @property
+  def website_scrapper(self):
+    """
+    The website scrapper, imported and set up on its first use since it pulls in the Google
+    Gemini, BeautifulSoup and tqdm libraries and primes the Gemini clients
+    """
+
+    if self.__website_scrapper is None:
+      from src.scrape_data.website_scrapper import WebsiteScrapper
+
+      self.__website_scrapper = WebsiteScrapper(
+        logger=self.logger,
+        database_handler=self.database_handler,
+        checkpoint_handler=self.checkpoint_handler,
+      )
+    return self.__website_scrapper
+
+
+  @property
+  def work_queue(self) -> WorkQueue:
+    """
+    The work queue shared by the workers, set up on its first use
+    """
+
+    if self.__work_queue is None:
+      self.__work_queue = get_work_queue()
+    return self.__work_queue
+
+
+  def __export_catalog_snapshot(self,
+                                course_catalog_name: str,
+                                all_tracks_information: dict | None = None,
+                                tracks: list | None = None) -> dict | None:
+    """
+    Exports the binary snapshot of an improvised course catalog, which the read services
+    memory-map at startup instead of reading every track from the database. The courses
+    named as prerequisites or corequisites but listed by none of the tracks are read from 
+    the courses registry.
+    
+    Args:
+      - course_catalog_name (str): The name of the course catalog website
+      - all_tracks_information (dict | None): The plan entries (PlanEntry) of every track keyed by the course, as improvised
+      - tracks (list | None): The tracks to be read from the database when the improvised tracks are not given
+    
+    Returns:
+      - dict | None: The version, counts and size of the snapshot, None if it is disabled or failed
+    """
+
+    if not self.catalog_snapshot_consts["enabled"]:
+      return None
+
+    try:
+      if all_tracks_information is not None:
+        tracks_information = {
+          track: {
+            course: plan_entry.to_document(
+              include_track_fields=True,
+            )
+            for course, plan_entry in track_information.items()
+          }
+          for track, track_information in all_tracks_information.items()
+        }
+      else:
+        tracks_information = {
+          track: self.database_handler.get_track_information(
+            course_name=course_catalog_name,
+            track=track,
+          ) or {}
+          for track in tracks or []
+        }
+
+      listed_course_codes = {
+        course_document["course_code"]
+        for track_information in tracks_information.values()
+        for course_document in track_information.values()
+        if isinstance(course_document, dict) and course_document.get("course_code")
+      }
+      requisite_course_codes = {
+        course_code
+        for track_information in tracks_information.values()
+        for course_document in track_information.values()
+        if isinstance(course_document, dict)
+        for field in ("prerequisites", "corequisites")
+        for course_code in iterate_course_codes(course_document.get(field))
+      }
+
+      snapshot = write_catalog_snapshot(
+        path=os.path.join(self.catalog_snapshot_consts["directory"], f"{course_catalog_name}.snapshot"),
+        tracks_information=tracks_information,
+        courses=self.database_handler.get_courses(
+          course_codes=sorted(requisite_course_codes - listed_course_codes),
+        ),
+      )
+      self.logger.info(
+        message=f"Exported the snapshot of {course_catalog_name}: {snapshot['courses']} courses and {snapshot['tracks']} tracks in {snapshot['bytes']} bytes"
+      )
+      return snapshot
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while exporting the snapshot of {course_catalog_name}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return None
+
+
+  def __budget_exhausted_status(self,
+                                course_catalog_name: str,
+                                course_catalog_url: str,
+                                error: BudgetExhaustedError,
+                                **partial_status) -> dict:
+    """
+    Builds the status of a scrape stopped by its exhausted Gemini budget, the courses fetched
+    so far being checkpointed along with the usage of the run so that it can be resumed
+    
+    Args:
+      - course_catalog_name (str): The name of the course catalog website
+      - course_catalog_url (str): The URL of the course catalog website
+      - error (BudgetExhaustedError): The error which stopped the scrape
+      - partial_status: The progress of the scrape so far, e.g. the stored and failed tracks
+    
+    Returns:
+      - dict: The status of the scrape along with the run identifier and usage
+    """
+
+    self.logger.error(
+      message=f"The scrape of the course catalog website of {course_catalog_name}, with URL: {course_catalog_url} stopped: {error}",
+    )
+    return {
+      "success": False,
+      "message": f"Stopped the scrape of the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}, as its Gemini budget is exhausted. The courses fetched so far are checkpointed, resume the run: {self.website_scrapper.run_id} to continue",
+      "run_id": self.website_scrapper.run_id,
+      "usage": self.website_scrapper.save_run_usage(),
+      "budget_exhausted": True,
+    } | partial_status
 
 
   def scrape_course_catalog_website(self,
                                     course_catalog_url: str,
-                                    course_catalog_name: str) -> dict:
+                                    course_catalog_name: str,
+                                    run_id: str | None = None,
+                                    resume: bool = False,
+                                    profile: bool = False,
+                                    improvise: bool = True,
+                                    prefetched_courses: dict | None = None,
+                                    stream: bool = False,
+                                    dry_run: bool = False) -> dict:
     """
     Scrapes the course catalog website
     
     Args:
       - course_catalog_url (str): The URL of the course catalog website
       - course_catalog_name (str): The name of the course catalog website
+      - run_id (str | None): The identifier of the scrape run, to resume or tag the checkpoints with
+      - resume (bool): Whether to resume the run, skipping the courses already checkpointed
+      - profile (bool): Whether to profile the scrape and improvise stages of the run
+      - improvise (bool): Whether to improvise the scrapped data once the website is crawled
+      - prefetched_courses (dict | None): The course records already fetched by the workers,
+                                          keyed by the course link
+      - stream (bool): Whether to scrape, improvise and store the tracks one at a time, keeping
+                       a single track in memory rather than the whole course catalog
+      - dry_run (bool): Whether to only estimate the HTTP fetches, Gemini calls, tokens and 
+                        time of the scrape, without any Gemini call or write
     
     Returns:
-      - bool: True if the course catalog website was scraped successfully, False otherwise
+      - dict: The status of the scrape along with the run identifier, or the estimate of the 
+              scrape for a dry run
     """
     
     self.logger.info(
@@ -41,6 +209,21 @@ class Engine:
 
     course_catalog_name = course_catalog_name.replace(" ", "_").lower()
 
+    if dry_run:
+      estimate = self.website_scrapper.scrape_course_catalog(
+        url_to_course_catalog=course_catalog_url,
+        course_catalog_name=course_catalog_name,
+        run_id=run_id,
+        resume=resume,
+        prefetched_courses=prefetched_courses,
+        dry_run=True,
+      )
+      return {
+        "success": True,
+        "message": f"Estimated the scrape of the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}: {estimate['expected_http_fetches']} HTTP fetches and {estimate['expected_gemini_calls']} Gemini calls in about {estimate['projected_seconds']} seconds",
+        "estimate": estimate,
+      }
+
     self.database_handler.create_collection_for_course_catalog(
       course_name=course_catalog_name,
     )
@@ -48,51 +231,635 @@ class Engine:
       course_name=course_catalog_name,
     )
 
-    structured_complete_scrapped_data = self.website_scrapper.scrape_course_catalog(
-      url_to_course_catalog=course_catalog_url,
-    )
+    if stream and improvise:
+      return self.__stream_course_catalog_website(
+        course_catalog_url=course_catalog_url,
+        course_catalog_name=course_catalog_name,
+        run_id=run_id,
+        resume=resume,
+        profile=profile,
+        prefetched_courses=prefetched_courses,
+      )
+
+    try:
+      with self.profiling_handler.profile(
+        program=course_catalog_name,
+        stage="scrape_course_catalog",
+        enabled=profile,
+      ):
+        structured_complete_scrapped_data = self.website_scrapper.scrape_course_catalog(
+          url_to_course_catalog=course_catalog_url,
+          course_catalog_name=course_catalog_name,
+          run_id=run_id,
+          resume=resume,
+          prefetched_courses=prefetched_courses,
+        )
+
+    except BudgetExhaustedError as e:
+      return self.__budget_exhausted_status(
+        course_catalog_name=course_catalog_name,
+        course_catalog_url=course_catalog_url,
+        error=e,
+      )
     
     if structured_complete_scrapped_data == False:
       return {
+        "success": False,
         "message": f"Failed to scrape the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}",
+        "run_id": self.website_scrapper.run_id,
+        "usage": self.website_scrapper.get_run_usage(),
       }
     
-    all_tracks_information = self.improvise_scrapped_data.run(
-      course_name=course_catalog_name,
-      course_catalog=structured_complete_scrapped_data,
-    )
+    if not improvise:
+      return {
+        "success": True,
+        "message": f"Successfully crawled the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}",
+        "run_id": self.website_scrapper.run_id,
+        "usage": self.website_scrapper.get_run_usage(),
+        "profile_artifacts": self.profiling_handler.artifacts,
+      }
+    
+    with self.profiling_handler.profile(
+      program=course_catalog_name,
+      stage="improvise_scrapped_data",
+      enabled=profile,
+    ):
+      all_tracks_information = self.improvise_scrapped_data.run(
+        course_name=course_catalog_name,
+        course_catalog=structured_complete_scrapped_data,
+      )
     
     if all_tracks_information == False:
       return {
+        "success": False,
         "message": f"Failed to improvise the scrapped data of the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}",
+        "run_id": self.website_scrapper.run_id,
+        "usage": self.website_scrapper.get_run_usage(),
       }
     
     return {
+      "success": True,
       "message": f"Successfully scraped the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}",
+      "run_id": self.website_scrapper.run_id,
+      "usage": self.website_scrapper.get_run_usage(),
+      "snapshot": self.__export_catalog_snapshot(
+        course_catalog_name=course_catalog_name,
+        all_tracks_information=all_tracks_information,
+      ),
+      "profile_artifacts": self.profiling_handler.artifacts,
     }
-  
+
+
+  def __stream_course_catalog_website(self,
+                                      course_catalog_url: str,
+                                      course_catalog_name: str,
+                                      run_id: str | None,
+                                      resume: bool,
+                                      profile: bool,
+                                      prefetched_courses: dict | None) -> dict:
+    """
+    Scrapes, improvises and stores the course catalog website one track at a time, each track
+    being released once it is stored, so the first tracks land in the database while the 
+    next ones are still being scrapped
+    
+    Args:
+      - course_catalog_url (str): The URL of the course catalog website
+      - course_catalog_name (str): The name of the course catalog website
+      - run_id (str | None): The identifier of the scrape run, to resume or tag the checkpoints with
+      - resume (bool): Whether to resume the run, skipping the courses already checkpointed
+      - profile (bool): Whether to profile the scrape and improvise stages of the run
+      - prefetched_courses (dict | None): The course records already fetched, keyed by the course link
+    
+    Returns:
+      - dict: The status of the scrape along with the run identifier and the stored and failed tracks
+    """
+
+    stored_tracks, failed_tracks = [], []
+    try:
+      with self.profiling_handler.profile(
+        program=course_catalog_name,
+        stage="stream_course_catalog",
+        enabled=profile,
+      ):
+        for track, track_record in self.website_scrapper.stream_course_catalog(
+          url_to_course_catalog=course_catalog_url,
+          course_catalog_name=course_catalog_name,
+          run_id=run_id,
+          resume=resume,
+          prefetched_courses=prefetched_courses,
+        ):
+          track_information = self.improvise_scrapped_data.run_track(
+            course_name=course_catalog_name,
+            track_record=track_record,
+          ) if track_record else False
+
+          if track_information == False:
+            failed_tracks.append(track)
+          else:
+            stored_tracks.append(track)
+            self.logger.info(
+              message=f"Stored the track: {track} of {course_catalog_name}, {len(stored_tracks)} tracks stored so far"
+            )
+          del track_record, track_information
+
+    except BudgetExhaustedError as e:
+      return self.__budget_exhausted_status(
+        course_catalog_name=course_catalog_name,
+        course_catalog_url=course_catalog_url,
+        error=e,
+        stored_tracks=stored_tracks,
+        failed_tracks=failed_tracks,
+      )
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while streaming the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return {
+        "success": False,
+        "message": f"Failed to scrape the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}",
+        "run_id": self.website_scrapper.run_id,
+        "usage": self.website_scrapper.get_run_usage(),
+        "stored_tracks": stored_tracks,
+        "failed_tracks": failed_tracks,
+      }
+
+    return {
+      "success": not failed_tracks,
+      "message": f"Scraped the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}, one track at a time: {len(stored_tracks)} tracks stored and {len(failed_tracks)} tracks failed",
+      "run_id": self.website_scrapper.run_id,
+      "usage": self.website_scrapper.get_run_usage(),
+      "stored_tracks": stored_tracks,
+      "failed_tracks": failed_tracks,
+      "snapshot": self.__export_catalog_snapshot(
+        course_catalog_name=course_catalog_name,
+        tracks=stored_tracks,
+      ),
+      "profile_artifacts": self.profiling_handler.artifacts,
+    }
+
+
+  def scrape_course_catalog_websites(self,
+                                     course_catalogs: list,
+                                     run_id: str | None = None,
+                                     resume: bool = False,
+                                     profile: bool = False,
+                                     improvise: bool = True) -> dict:
+    """
+    Scrapes the course catalog websites of several programs at once, fetching and segregating
+    every course listed by several of the programs only once
+    
+    Args:
+      - course_catalogs (list): The programs, each a dict with its course_catalog_name and course_catalog_url
+      - run_id (str | None): The identifier of the scrape run of every program, to resume or tag the checkpoints with
+      - resume (bool): Whether to resume the runs, skipping the courses already checkpointed
+      - profile (bool): Whether to profile the scrape and improvise stages of the run
+      - improvise (bool): Whether to improvise the scrapped data once the websites are crawled
+    
+    Returns:
+      - dict: The status of the scrape of each program, along with the number of courses 
+              listed by the programs and actually fetched, and whether the Gemini budget 
+              stopped the scrape
+    """
+
+    course_catalog_urls = {}
+    for course_catalog in course_catalogs:
+      course_catalog_name = course_catalog["course_catalog_name"].replace(" ", "_").lower()
+      course_catalog_urls[course_catalog_name] = course_catalog["course_catalog_url"]
+      self.database_handler.create_collection_for_course_catalog(
+        course_name=course_catalog_name,
+      )
+      self.database_handler.create_collection_for_track_information(
+        course_name=course_catalog_name,
+      )
+
+    self.logger.info(
+      message=f"Scraping the course catalog websites of {len(course_catalog_urls)} programs: {', '.join(course_catalog_urls)}"
+    )
+
+    with self.profiling_handler.profile(
+      program="bulk",
+      stage="scrape_course_catalogs",
+      enabled=profile,
+    ):
+      scrapped_course_catalogs = self.website_scrapper.scrape_course_catalogs(
+        course_catalogs=course_catalog_urls,
+        run_id=run_id,
+        resume=resume,
+      )
+
+    statuses = {}
+    for course_catalog_name, scrapped_course_catalog in scrapped_course_catalogs["course_catalogs"].items():
+      course_catalog_url = course_catalog_urls[course_catalog_name]
+      if scrapped_course_catalog["tracks"] == False:
+        statuses[course_catalog_name] = {
+          "success": False,
+          "message": f"Stopped the scrape of the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}, as the Gemini budget is exhausted" if scrapped_course_catalog["budget_exhausted"] else f"Failed to scrape the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}",
+          "run_id": scrapped_course_catalog["run_id"],
+          "usage": scrapped_course_catalog["usage"],
+          "budget_exhausted": scrapped_course_catalog["budget_exhausted"],
+        }
+        continue
+
+      if not improvise:
+        statuses[course_catalog_name] = {
+          "success": True,
+          "message": f"Successfully crawled the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}",
+          "run_id": scrapped_course_catalog["run_id"],
+          "usage": scrapped_course_catalog["usage"],
+        }
+        continue
+
+      with self.profiling_handler.profile(
+        program=course_catalog_name,
+        stage="improvise_scrapped_data",
+        enabled=profile,
+      ):
+        all_tracks_information = self.improvise_scrapped_data.run(
+          course_name=course_catalog_name,
+          course_catalog=scrapped_course_catalog["tracks"],
+        )
+
+      statuses[course_catalog_name] = {
+        "success": all_tracks_information != False,
+        "message": f"Successfully scraped the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}" if all_tracks_information != False else f"Failed to improvise the scrapped data of the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}",
+        "run_id": scrapped_course_catalog["run_id"],
+        "usage": scrapped_course_catalog["usage"],
+        "snapshot": self.__export_catalog_snapshot(
+          course_catalog_name=course_catalog_name,
+          all_tracks_information=all_tracks_information,
+        ) if all_tracks_information != False else None,
+      }
+
+    return {
+      "success": all(status["success"] for status in statuses.values()),
+      "course_catalogs": statuses,
+      "listed_course_links": scrapped_course_catalogs["listed_course_links"],
+      "planned_course_links": scrapped_course_catalogs["planned_course_links"],
+      "fetched_course_links": scrapped_course_catalogs["fetched_course_links"],
+      "resumed_course_links": scrapped_course_catalogs["resumed_course_links"],
+      "failed_course_links": scrapped_course_catalogs["failed_course_links"],
+      "budget_exhausted": scrapped_course_catalogs["budget_exhausted"],
+      "profile_artifacts": self.profiling_handler.artifacts,
+    }
+
+
+  def improvise_course_catalog(self,
+                               course_catalog_name: str,
+                               profile: bool = False) -> dict:
+    """
+    Improvises the course catalog already crawled and stored for a program, without fetching
+    the website again
+    
+    Args:
+      - course_catalog_name (str): The name of the course catalog website
+      - profile (bool): Whether to profile the improvise stage
+    
+    Returns:
+      - dict: The status of the improvisation
+    """
+
+    course_catalog_name = course_catalog_name.replace(" ", "_").lower()
+    course_catalog_documents = self.database_handler.get_course_catalog(
+      course_name=course_catalog_name,
+    )
+    if not course_catalog_documents:
+      return {
+        "success": False,
+        "message": f"No crawled course catalog found for {course_catalog_name}",
+      }
+
+    self.database_handler.create_collection_for_track_information(
+      course_name=course_catalog_name,
+    )
+    course_catalog = {
+      document["_id"]: Track.from_catalog_document(
+        track_name=document["_id"],
+        document=document,
+      )
+      for document in course_catalog_documents
+    }
+
+    with self.profiling_handler.profile(
+      program=course_catalog_name,
+      stage="improvise_scrapped_data",
+      enabled=profile,
+    ):
+      all_tracks_information = self.improvise_scrapped_data.run(
+        course_name=course_catalog_name,
+        course_catalog=course_catalog,
+      )
+
+    if all_tracks_information == False:
+      return {
+        "success": False,
+        "message": f"Failed to improvise the crawled course catalog of {course_catalog_name}",
+      }
+
+    return {
+      "success": True,
+      "message": f"Successfully improvised the crawled course catalog of {course_catalog_name}",
+      "snapshot": self.__export_catalog_snapshot(
+        course_catalog_name=course_catalog_name,
+        all_tracks_information=all_tracks_information,
+      ),
+      "profile_artifacts": self.profiling_handler.artifacts,
+    }
+
+
+  def enqueue_course_catalog(self,
+                             course_catalog_url: str,
+                             course_catalog_name: str,
+                             run_id: str | None = None) -> dict:
+    """
+    Enqueues the crawl of a course catalog website, to be split between the workers pulling
+    from the work queue
+    
+    Args:
+      - course_catalog_url (str): The URL of the course catalog website
+      - course_catalog_name (str): The name of the course catalog website
+      - run_id (str | None): The identifier of the scrape run, a new one is generated if not given
+    
+    Returns:
+      - dict: The status of the enqueueing along with the run identifier
+    """
+
+    course_catalog_name = course_catalog_name.replace(" ", "_").lower()
+    run_id = run_id if run_id else uuid.uuid4().hex
+    enqueued = self.work_queue.enqueue(
+      item_id=f"program:{course_catalog_name}:{run_id}",
+      kind="program",
+      program=course_catalog_name,
+      payload={
+        "course_catalog_url": course_catalog_url,
+        "run_id": run_id,
+      },
+    )
+
+    return {
+      "success": enqueued,
+      "message": f"Enqueued the crawl of the course catalog website of {course_catalog_name}, with URL: {course_catalog_url}" if enqueued else f"The crawl of {course_catalog_name} with the run: {run_id} is already enqueued",
+      "run_id": run_id,
+    }
+
+
+  def __enqueue_assemble_if_ready(self,
+                                  course_catalog_name: str,
+                                  payload: dict) -> None:
+    """
+    Enqueues the assembly of a course catalog once its program and course work items are all
+    finished, the work item ID making sure it is enqueued only once across the workers
+    
+    Args:
+      - course_catalog_name (str): The name of the course catalog
+      - payload (dict): The payload of the finished work item
+    
+    Returns:
+      - None
+    """
+
+    if self.work_queue.count_unfinished(course_catalog_name, "program") or self.work_queue.count_unfinished(course_catalog_name, "course"):
+      return None
+
+    self.work_queue.enqueue(
+      item_id=f"assemble:{course_catalog_name}:{payload['run_id']}",
+      kind="assemble",
+      program=course_catalog_name,
+      payload={
+        "course_catalog_url": payload["course_catalog_url"],
+        "run_id": payload["run_id"],
+      },
+    )
+
+
+  def __process_program_item(self,
+                             item: dict,
+                             worker_id: str) -> None:
+    """
+    Crawls the course catalog page of a program and enqueues one work item per course
+    """
+
+    course_catalog_name, payload = item["program"], item["payload"]
+    course_links = self.website_scrapper.crawl_course_links(
+      url_to_course_catalog=payload["course_catalog_url"],
+      course_catalog_name=course_catalog_name,
+    )
+    for course_link in course_links:
+      self.work_queue.enqueue(
+        item_id=f"course:{course_catalog_name}:{payload['run_id']}:{course_link}",
+        kind="course",
+        program=course_catalog_name,
+        payload=payload | {"course_link": course_link},
+      )
+
+    self.work_queue.complete(
+      item_id=item["_id"],
+      worker_id=worker_id,
+      result={"course_count": len(course_links)},
+    )
+    self.__enqueue_assemble_if_ready(course_catalog_name, payload)
+
+
+  def __process_course_item(self,
+                            item: dict,
+                            worker_id: str) -> None:
+    """
+    Fetches and segregates a single course, merging the course record into the shared store
+    """
+
+    course_catalog_name, payload = item["program"], item["payload"]
+    course = self.website_scrapper.fetch_course(
+      course_link=payload["course_link"],
+      course_catalog_name=course_catalog_name,
+      run_id=payload["run_id"],
+    )
+    if not course or not course.is_fetched:
+      raise ValueError(f"The course with the link: {payload['course_link']} could not be fetched")
+
+    self.database_handler.add_courses(
+      courses={course.course_code: course}
+    )
+    self.work_queue.complete(
+      item_id=item["_id"],
+      worker_id=worker_id,
+      result=course.to_document(),
+    )
+    self.__enqueue_assemble_if_ready(course_catalog_name, payload)
+
+
+  def __process_assemble_item(self,
+                              item: dict,
+                              worker_id: str) -> None:
+    """
+    Assembles the tracks of a program from the courses fetched by the workers and improvises them
+    """
+
+    course_catalog_name, payload = item["program"], item["payload"]
+    prefetched_courses = {
+      course_item["payload"]["course_link"]: Course.from_document(course_item["result"])
+      for course_item in self.work_queue.get_results(course_catalog_name, "course")
+      if course_item["payload"]["run_id"] == payload["run_id"]
+    }
+
+    status = self.scrape_course_catalog_website(
+      course_catalog_url=payload["course_catalog_url"],
+      course_catalog_name=course_catalog_name,
+      run_id=payload["run_id"],
+      resume=True,
+      prefetched_courses=prefetched_courses,
+    )
+    if not status["success"]:
+      raise ValueError(status["message"])
+
+    self.work_queue.complete(
+      item_id=item["_id"],
+      worker_id=worker_id,
+      result={"message": status["message"]},
+    )
+
+
+  def run_worker(self,
+                 worker_id: str | None = None,
+                 max_items: int | None = None,
+                 idle_timeout_seconds: float | None = None) -> dict:
+    """
+    Pulls work items from the work queue and processes them until told to stop, so that any
+    number of workers on any number of nodes split the crawls between them
+    
+    Args:
+      - worker_id (str | None): The identifier of the worker, a new one is generated if not given
+      - max_items (int | None): The number of work items after which the worker stops, no limit if not given
+      - idle_timeout_seconds (float | None): The time without any work after which the worker stops,
+                                             the worker waits for work forever if not given
+    
+    Returns:
+      - dict: The number of work items processed and failed by the worker
+    """
+
+    worker_id = worker_id if worker_id else uuid.uuid4().hex
+    poll_interval_seconds = WorkQueueConsts().get_constants()["poll_interval_seconds"]
+    item_processors = {
+      "program": self.__process_program_item,
+      "course": self.__process_course_item,
+      "assemble": self.__process_assemble_item,
+    }
+    processed_items, failed_items = 0, 0
+    idle_since = monotonic()
+
+    self.logger.info(
+      message=f"The worker: {worker_id} started pulling from the {self.work_queue.name} work queue"
+    )
+    while max_items is None or processed_items + failed_items < max_items:
+      for expired_item in self.work_queue.fail_expired_leases():
+        self.logger.error(
+          message=f"The work item: {expired_item['_id']} failed for good, its lease expired on its last attempt"
+        )
+        if expired_item["kind"] == "course":
+          self.__enqueue_assemble_if_ready(expired_item["program"], expired_item["payload"])
+
+      item = self.work_queue.claim(
+        worker_id=worker_id,
+      )
+      if item is None:
+        if idle_timeout_seconds is not None and monotonic() - idle_since >= idle_timeout_seconds:
+          break
+        sleep(poll_interval_seconds)
+        continue
+
+      try:
+        item_processors[item["kind"]](item, worker_id)
+        processed_items += 1
+
+      except Exception as e:
+        failed_items += 1
+        self.work_queue.fail(
+          item_id=item["_id"],
+          worker_id=worker_id,
+          error=str(e),
+        )
+        self.logger.error(
+          message=f"An error '{e}' occurred while processing the work item: {item['_id']}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+        )
+        if item["kind"] == "course":
+          self.__enqueue_assemble_if_ready(item["program"], item["payload"])
+      idle_since = monotonic()
+
+    self.logger.info(
+      message=f"The worker: {worker_id} stopped after processing {processed_items} work items and failing {failed_items} work items"
+    )
+    return {
+      "success": True,
+      "worker_id": worker_id,
+      "processed_items": processed_items,
+      "failed_items": failed_items,
+    }
+
+
   def process_user_responses(self,
                              degree_program: str,
                              year_and_semester_for_recommendation: str,
-                             track_academically_focused: str) -> dict:
+                             track_academically_focused: str,
+                             completed_courses: list | None = None,
+                             credit_cap: int | None = None) -> dict:
       """
-      Processes the user responses
+      Processes the user responses, planning the remaining semesters of the track from the
+      semester for recommendation onwards
       
       Args:
         - degree_program (str): The degree program of the user
-        - semester_for_recommendation (str): The semester for which the user wants the course recommendations
+        - semester_for_recommendation (str): The semester for which the user wants the course recommendations, e.g. 'year_2_semester_1'
         - track_academically_focused (str): The track the user is academically focused on
+        - completed_courses (list | None): The codes of the courses the user completed, the courses the catalog lists before the semester for recommendation if not given
+        - credit_cap (int | None): The maximum credits per semester, the configured cap if not given
       
       Returns:
-        - dict: The status of the user responses processing
+        - dict: The status of the user responses processing and the semester plan
       """
       
       self.logger.info(
         message=f"Processing the user responses for the degree program: {degree_program}, semester for recommendation: {year_and_semester_for_recommendation}, and track academically focused: {track_academically_focused}"
       )
-      recommended_courses = ProcessUserResponses()
+      semester_planner_consts = SemesterPlannerConsts().get_constants()
+      semesters_per_year = semester_planner_consts["semesters_per_year"]
+      try:
+        year, semester = parse_year_and_semester(year_and_semester_for_recommendation, semesters_per_year)
+      except ValueError as e:
+        return {
+          "success": False,
+          "message": f"Invalid semester for recommendation: {e}",
+        }
+
+      track_information = self.database_handler.get_track_information(
+        course_name=degree_program.replace(" ", "_").lower(),
+        track=track_academically_focused,
+      )
+      if not track_information:
+        return {
+          "success": False,
+          "message": f"No track {track_academically_focused} found for the degree program: {degree_program}",
+        }
+
+      if completed_courses is None:
+        completed_courses = [
+          entry["course_code"]
+          for entry in track_information.values()
+          if isinstance(entry, dict) and entry.get("course_code")
+          and str(entry.get("year")).isdigit() and str(entry.get("semester")).isdigit()
+          and (int(entry["year"]) - 1) * semesters_per_year + int(entry["semester"]) < (year - 1) * semesters_per_year + semester
+        ]
+
+      semester_plan = SemesterPlanner(
+        track_information=track_information,
+        credit_cap=credit_cap or semester_planner_consts["credit_cap"],
+        semesters_per_year=semesters_per_year,
+      ).plan(
+        completed_courses=completed_courses,
+        year_and_semester=year_and_semester_for_recommendation,
+      )
       return {
-        "message": f"Successfully processed the user responses for the degree program: {degree_program}, semester for recommendation: {year_and_semester_for_recommendation}, and track academically focused: {track_academically_focused}"
+        "success": True,
+        "message": f"Successfully processed the user responses for the degree program: {degree_program}, semester for recommendation: {year_and_semester_for_recommendation}, and track academically focused: {track_academically_focused}",
+        "semester_plan": semester_plan,
       }
   
 
@@ -0,0 +1,59 @@
+from bs4 import BeautifulSoup
+from unidecode import unidecode
+
+
+def parse_course_page(content: bytes) -> dict:
+  """
+  Parses the course page of the course catalog into the course code, name, credits, contact
+  hours and the raw course description. Kept free of any scraper state so that it can run in
+  a worker process.
+
+  Args:
+    - content (bytes): The HTML content of the course page
+
+  Returns:
+    - dict: The course code, course name, credits, contact hours and course description
+  """
+
+  api_soup = BeautifulSoup(content, 'html.parser')
+
+  code_name_creditsandtime = str(
+    object=unidecode(
+      string=api_soup.find(
+        name="div",
+        attrs={
+          "class": "searchresult search-courseresult"
+        }
+      ).find("h2").text
+    )
+  ).strip()
+
+  code_name_creditsandtime = code_name_creditsandtime[:-1] if code_name_creditsandtime.endswith(".") else code_name_creditsandtime
+  course_code, course_name, credits_and_time = [
+    str(unidecode(text)).strip() 
+    for text in code_name_creditsandtime.split(". ")
+  ]
+  credits_and_time = [
+    str(unidecode(text)).replace("credits", "").replace("credit", "").replace("contact hours", "").strip() 
+    for text in credits_and_time.split(",")
+  ]
+  credits, contact_hours = credits_and_time
+  
+  course_description = str(
+    object=unidecode(
+      string=api_soup.find(
+        name="p",
+        attrs={
+          "class": "courseblockdesc"
+        }
+      ).text
+    )
+  ).strip()
+
+  return {
+    "course_code": course_code,
+    "course_name": course_name,
+    "credits": int(credits),
+    "contact_hours": contact_hours,
+    "course_description": course_description,
+  }
\ No newline at end of file
@@ -0,0 +1,375 @@
+import sys
+
+
+def intern_course_codes(requirement):
+  """
+  Interns every course code of a course code or of a nested prerequisites/corequisites list,
+  so that the same course code is stored only once however many courses refer to it.
+
+  Args:
+    - requirement: A course code, or a list of course codes and lists of course codes
+
+  Returns:
+    - The requirement with the course codes interned
+  """
+
+  if isinstance(requirement, str):
+    return sys.intern(requirement)
+  if isinstance(requirement, (list, tuple)):
+    return [intern_course_codes(item) for item in requirement]
+  return requirement
+
+
+def iterate_course_codes(requirement):
+  """
+  Iterates over every course code of a course code or of a nested prerequisites/corequisites list
+
+  Args:
+    - requirement: A course code, or a list of course codes and lists of course codes
+
+  Returns:
+    - Generator: The course codes
+  """
+
+  if isinstance(requirement, str):
+    yield requirement
+  elif isinstance(requirement, (list, tuple)):
+    for item in requirement:
+      yield from iterate_course_codes(item)
+
+
+class Course:
+  """
+  The information of a single course fetched from the course description API. A course is
+  fetched once and the same record is shared by every track, year and semester listing it.
+  """
+
+  __slots__ = (
+    "course_code",
+    "course_name",
+    "credits",
+    "contact_hours",
+    "prerequisites",
+    "prerequisites_description",
+    "corequisites",
+    "course_description",
+    "course_link",
+  )
+
+
+  def __init__(self,
+               course_link: str,
+               course_code: str | None = None,
+               course_name: str | None = None,
+               credits: int | None = None,
+               contact_hours: str | None = None,
+               prerequisites: list | None = None,
+               prerequisites_description: str | None = None,
+               corequisites: list | None = None,
+               course_description: str | None = None) -> None:
+    self.course_link = course_link
+    self.course_code = sys.intern(course_code) if course_code else None
+    self.course_name = course_name
+    self.credits = credits
+    self.contact_hours = contact_hours
+    self.prerequisites = intern_course_codes(prerequisites) if prerequisites else []
+    self.prerequisites_description = prerequisites_description
+    self.corequisites = intern_course_codes(corequisites) if corequisites else []
+    self.course_description = course_description
+
+
+  @property
+  def is_fetched(self) -> bool:
+    """
+    Whether the information of the course was fetched, or only its link is known
+    """
+
+    return self.course_code is not None
+
+
+  @property
+  def requisite_course_codes(self) -> set:
+    """
+    The codes of every course named by the prerequisites or the corequisites of the course
+    """
+
+    return set(iterate_course_codes(self.prerequisites)) | set(iterate_course_codes(self.corequisites))
+
+
+  def to_document(self) -> dict:
+    """
+    Converts the course into the document shape stored in the database
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The course document, holding only the course link if the course was not fetched
+    """
+
+    if not self.is_fetched:
+      return {
+        "course_link": self.course_link,
+      }
+
+    return {
+      "course_code": self.course_code,
+      "course_name": self.course_name,
+      "credits": self.credits,
+      "contact_hours": self.contact_hours,
+      "prerequisites": self.prerequisites,
+      "prerequisites_description": self.prerequisites_description,
+      "corequisites": self.corequisites,
+      "course_description": self.course_description,
+      "course_link": self.course_link,
+    }
+
+
+  @classmethod
+  def from_document(cls,
+                    document: dict):
+    """
+    Creates a course from its document shape
+
+    Args:
+      - document (dict): The course document
+
+    Returns:
+      - Course: The course record
+    """
+
+    return cls(
+      course_link=document.get("course_link"),
+      course_code=document.get("course_code"),
+      course_name=document.get("course_name"),
+      credits=document.get("credits"),
+      contact_hours=document.get("contact_hours"),
+      prerequisites=document.get("prerequisites", document.get("prequisites")),
+      prerequisites_description=document.get("prerequisites_description"),
+      corequisites=document.get("corequisites"),
+      course_description=document.get("course_description"),
+    )
+
+
+class PlanEntry:
+  """
+  A single row of a track's plan grid. It either refers to a shared course, carries the
+  description of an elective, or is the header of a group of courses. The per-track fields
+  computed while improvising the scrapped data are stored on the entry itself.
+  """
+
+  __slots__ = (
+    "key",
+    "group",
+    "track",
+    "year",
+    "semester",
+    "course",
+    "course_description",
+    "complete_path",
+    "on_dependant_courses_count",
+    "dependency_count",
+  )
+
+
+  def __init__(self,
+               key: str,
+               track: str,
+               year: str,
+               semester: str,
+               group: str | None = None,
+               course: Course | None = None,
+               course_description: str | None = None) -> None:
+    self.key = sys.intern(key)
+    self.group = group
+    self.track = track
+    self.year = year
+    self.semester = semester
+    self.course = course
+    self.course_description = course_description
+    self.complete_path = None
+    self.on_dependant_courses_count = None
+    self.dependency_count = None
+
+
+  @property
+  def is_group_header(self) -> bool:
+    """
+    Whether the entry is only the header of a group of courses
+    """
+
+    return self.course is None and self.course_description is None
+
+
+  @property
+  def prerequisites(self) -> list:
+    """
+    The prerequisites of the course of the entry
+    """
+
+    return self.course.prerequisites if self.course else []
+
+
+  @property
+  def corequisites(self) -> list:
+    """
+    The corequisites of the course of the entry
+    """
+
+    return self.course.corequisites if self.course else []
+
+
+  def to_document(self,
+                  courses: dict | None = None,
+                  include_track_fields: bool = False) -> dict:
+    """
+    Converts the entry into the document shape stored in the database
+
+    Args:
+      - courses (dict | None): If given, the fetched course is collected into it, keyed by the
+                               course code, and only a reference to it is returned
+      - include_track_fields (bool): Whether to include the track, year, semester and the
+                                     fields computed while improvising the scrapped data
+
+    Returns:
+      - dict: The entry document
+    """
+
+    if self.course is None:
+      document = {} if self.course_description is None else {"course_description": self.course_description}
+    elif courses is not None and self.course.is_fetched:
+      courses[self.course.course_code] = self.course
+      document = {"course_code": self.course.course_code}
+    else:
+      document = self.course.to_document()
+
+    if include_track_fields:
+      document["track"] = self.track
+      document["year"] = self.year
+      document["semester"] = self.semester
+      for field in ("complete_path", "on_dependant_courses_count", "dependency_count"):
+        if getattr(self, field) is not None:
+          document[field] = getattr(self, field)
+
+    return document
+
+
+class Track:
+  """
+  A track of a course catalog, holding its plan grid as a flat list of entries in the order
+  in which they appear on the catalog page.
+  """
+
+  __slots__ = (
+    "track_name",
+    "plan_entries",
+    "extra_course_related_info",
+  )
+
+
+  def __init__(self,
+               track_name: str,
+               extra_course_related_info: dict | None = None) -> None:
+    self.track_name = track_name
+    self.plan_entries = []
+    self.extra_course_related_info = extra_course_related_info
+
+
+  def to_catalog_document(self,
+                          courses: dict | None = None) -> dict:
+    """
+    Converts the track into the year, semester and course nested document stored in the
+    course catalog collection
+
+    Args:
+      - courses (dict | None): If given, the fetched courses are collected into it, keyed by
+                               the course code, and the document only holds references
+
+    Returns:
+      - dict: The course catalog document of the track
+    """
+
+    document = {}
+    for entry in self.plan_entries:
+      semester_document = document.setdefault(entry.year, {}).setdefault(entry.semester, {})
+      if entry.group is None:
+        semester_document[entry.key] = entry.to_document(
+          courses=courses
+        )
+      else:
+        semester_document.setdefault(entry.group, {})[entry.key] = entry.to_document(
+          courses=courses
+        )
+
+    if self.extra_course_related_info is not None:
+      document["extra_course_related_info"] = self.extra_course_related_info
+    return document
+
+
+  @classmethod
+  def from_catalog_document(cls,
+                            track_name: str,
+                            document: dict):
+    """
+    Creates a track from the course catalog document stored for it, with the course
+    references already resolved
+
+    Args:
+      - track_name (str): The name of the track
+      - document (dict): The course catalog document of the track
+
+    Returns:
+      - Track: The track record
+    """
+
+    track = cls(
+      track_name=track_name,
+      extra_course_related_info=document.get("extra_course_related_info"),
+    )
+    courses = {}
+
+    def to_entry(key: str, year: str, semester: str, entry_document: dict, group: str | None = None) -> PlanEntry:
+      if "course_link" not in entry_document and "course_code" not in entry_document:
+        return PlanEntry(
+          key=key,
+          track=track_name,
+          year=year,
+          semester=semester,
+          group=group,
+          course_description=entry_document.get("course_description"),
+        )
+
+      course = Course.from_document(entry_document)
+      course = courses.setdefault(course.course_code or course.course_link, course)
+      return PlanEntry(
+        key=key,
+        track=track_name,
+        year=year,
+        semester=semester,
+        group=group,
+        course=course,
+      )
+
+    for year, semesters in document.items():
+      if year in ("_id", "extra_course_related_info"):
+        continue
+
+      for semester, entries in semesters.items():
+        for key, entry_document in entries.items():
+          is_group = not entry_document or all(isinstance(value, dict) for value in entry_document.values())
+          if not is_group:
+            track.plan_entries.append(to_entry(key, year, semester, entry_document))
+            continue
+
+          track.plan_entries.append(
+            PlanEntry(
+              key=key,
+              track=track_name,
+              year=year,
+              semester=semester,
+            )
+          )
+          for child_key, child_document in entry_document.items():
+            track.plan_entries.append(to_entry(child_key, year, semester, child_document, group=key))
+
+    return track
\ No newline at end of file
@@ -0,0 +1,487 @@
+import threading
+from collections import deque
+from time import monotonic, sleep
+import google.generativeai as genai
+from src.utils.metrics_handler import metrics_handler
+
+
+QUOTA_ERROR_MARKERS = ("429", "RESOURCE_EXHAUSTED", "RESOURCEEXHAUSTED", "QUOTA", "RATE LIMIT")
+PER_KEY_CLIENT_SDK_VERSIONS = ((0, 7), (0, 8))
+
+
+class RateLimiter:
+  """
+  A sliding window rate limiter allowing at most a fixed number of calls within a window,
+  blocking the caller until the oldest call of the window expires.
+  """
+
+
+  def __init__(self,
+               max_calls: int,
+               window_seconds: float) -> None:
+    self.max_calls = max_calls
+    self.window_seconds = window_seconds
+    self.__calls = deque()
+    self.__lock = threading.Lock()
+
+
+  def calls_in_window(self) -> int:
+    """
+    Returns the number of calls made within the current window
+    """
+
+    with self.__lock:
+      self.__expire(monotonic())
+      return len(self.__calls)
+
+
+  def __expire(self,
+               now: float) -> None:
+    """
+    Drops the calls older than the window, the lock must be held by the caller
+    """
+
+    while self.__calls and self.__calls[0] <= now - self.window_seconds:
+      self.__calls.popleft()
+
+
+  def acquire(self) -> float:
+    """
+    Records a call, waiting first if the window is full
+
+    Args:
+      - None
+
+    Returns:
+      - float: The time spent waiting, in seconds
+    """
+
+    waited = 0.0
+    while True:
+      with self.__lock:
+        now = monotonic()
+        self.__expire(now)
+        if len(self.__calls) < self.max_calls:
+          self.__calls.append(now)
+          return waited
+        wait = self.__calls[0] + self.window_seconds - now
+
+      sleep(wait)
+      waited += wait
+
+
+def read_usage(response) -> tuple:
+  """
+  Reads the prompt tokens, the output tokens and the finish reason of a Gemini response,
+  zeros and 'UNKNOWN' when the response does not carry them
+
+  Args:
+    - response: The Gemini response
+
+  Returns:
+    - tuple: The prompt tokens, the output tokens and the finish reason
+  """
+
+  usage_metadata = getattr(response, "usage_metadata", None)
+  prompt_tokens = getattr(usage_metadata, "prompt_token_count", 0) or 0
+  output_tokens = getattr(usage_metadata, "candidates_token_count", 0) or 0
+  try:
+    finish_reason = response.candidates[0].finish_reason
+    finish_reason = getattr(finish_reason, "name", None) or str(finish_reason)
+  except Exception:
+    finish_reason = "UNKNOWN"
+  return prompt_tokens, output_tokens, finish_reason
+
+
+def check_per_key_client_support() -> None:
+  """
+  Checks that the installed google-generativeai SDK is one whose models can be bound to
+  their own API key. The SDK only offers a process-wide key through genai.configure, so the
+  clients of the keys other than the configured one replace the private client of their
+  model, which is only known to work with the versions listed.
+
+  Args:
+    - None
+
+  Returns:
+    - None, raising a RuntimeError if the SDK is not supported
+  """
+
+  try:
+    sdk_version = tuple(int(part) for part in genai.__version__.split(".")[:2])
+  except (AttributeError, ValueError):
+    sdk_version = None
+
+  if sdk_version not in PER_KEY_CLIENT_SDK_VERSIONS:
+    raise RuntimeError(
+      f"Several Gemini API keys require binding a model to its own key, which is only supported with google-generativeai "
+      f"{' or '.join(f'{major}.{minor}.x' for major, minor in PER_KEY_CLIENT_SDK_VERSIONS)}, not {getattr(genai, '__version__', 'unknown')}. "
+      f"Pin google-generativeai to a supported version or configure a single API key."
+    )
+
+
+def build_generative_model(model_name: str,
+                           temperature: int,
+                           api_key: str | None = None):
+  """
+  Builds a Gemini model, bound to the key configured with genai.configure, or to its own
+  API key if given, once the SDK was checked with check_per_key_client_support
+
+  Args:
+    - model_name (str): The name of the model
+    - temperature (int): The temperature of the generation
+    - api_key (str | None): The API key the model is bound to, the configured one if not given
+
+  Returns:
+    - GenerativeModel: The model
+  """
+
+  gemini_model = genai.GenerativeModel(
+    model_name=model_name,
+    generation_config={
+      "temperature": temperature
+    }
+  )
+  if api_key is not None:
+    from google.ai import generativelanguage
+
+    if not hasattr(gemini_model, "_client"):
+      raise RuntimeError(
+        f"The models of google-generativeai {getattr(genai, '__version__', 'unknown')} no longer hold a private client, so they cannot be bound to their own API key. Configure a single API key."
+      )
+    gemini_model._client = generativelanguage.GenerativeServiceClient(
+      client_options={"api_key": api_key}
+    )
+  return gemini_model
+
+
+class QuotaExhaustedError(Exception):
+  """
+  Raised when every client of the pool has exhausted its quota
+  """
+
+
+class GeminiClient:
+  """
+  A Gemini chat bound to a single API key, with its own rate limiter and health state. The
+  chat is primed with the segregation prompt on its first use, and only one message is in
+  flight on a chat at a time since the chat history is not thread-safe.
+  """
+
+
+  def __init__(self,
+               index: int,
+               api_key: str,
+               generative_model: str,
+               temperature: int,
+               prompt: str,
+               rate_limiter: RateLimiter) -> None:
+    self.index = index
+    self.api_key = api_key
+    self.generative_model = generative_model
+    self.temperature = temperature
+    self.prompt = prompt
+    self.rate_limiter = rate_limiter
+    self.in_flight = 0
+    self.unhealthy_until = 0.0
+    self.consecutive_failures = 0
+    self.__chat = None
+    self.__lock = threading.Lock()
+
+
+  def is_healthy(self) -> bool:
+    """
+    Returns whether the client is out of its cooldown
+    """
+
+    return monotonic() >= self.unhealthy_until
+
+
+  def load(self) -> tuple:
+    """
+    Returns the load of the client, the messages in flight first and the calls made within
+    the current rate limiter window second
+    """
+
+    return self.in_flight, self.rate_limiter.calls_in_window()
+
+
+  def __start_chat(self,
+                   on_response=None):
+    """
+    Starts the chat bound to the API key of the client and primes it with the segregation
+    prompt, the lock must be held by the caller. The first client of a pool uses the key
+    configured with genai.configure, the others their own key.
+
+    Args:
+      - on_response: The callback given the kind, the response and the latency of every call
+
+    Returns:
+      - ChatSession: The primed chat
+    """
+
+    gemini_model = build_generative_model(
+      model_name=self.generative_model,
+      temperature=self.temperature,
+      api_key=self.api_key if self.index else None,
+    )
+
+    chat = gemini_model.start_chat(
+      history=[]
+    )
+    self.rate_limiter.acquire()
+    start = monotonic()
+    response = chat.send_message(
+      content=self.prompt
+    )
+    if on_response is not None:
+      on_response("priming", response, monotonic() - start)
+    return chat
+
+
+  def send_message(self,
+                   content: str,
+                   program: str | None = None,
+                   on_response=None) -> str:
+    """
+    Sends a message on the chat of the client once its rate limiter allows it
+
+    Args:
+      - content (str): The message to be sent
+      - program (str | None): The program being processed, used to label the metrics
+      - on_response: The callback given the kind, the response and the latency of every call
+
+    Returns:
+      - str: The text of the response
+    """
+
+    with self.__lock:
+      if self.__chat is None:
+        self.__chat = self.__start_chat(
+          on_response=on_response
+        )
+
+      waited = self.rate_limiter.acquire()
+      if waited:
+        metrics_handler.observe(
+          name="scraper_rate_limiter_wait_seconds",
+          value=waited,
+          labels={"program": program, "client": str(self.index)},
+        )
+
+      start = monotonic()
+      response = self.__chat.send_message(
+        content=content
+      )
+      if on_response is not None:
+        on_response("segregation", response, monotonic() - start)
+      return response.text
+
+
+class GeminiClientPool:
+  """
+  A pool of Gemini clients, one per provisioned API key. Every message goes to the least
+  loaded healthy client, and a client hitting its quota is cooled down while the message
+  fails over to the next client, so the segregation throughput scales with the number of keys.
+  """
+
+
+  def __init__(self,
+               logger,
+               api_keys: list,
+               generative_model: str,
+               temperature: int,
+               prompt: str,
+               requests_per_window: int,
+               window_seconds: float,
+               quota_cooldown_seconds: float) -> None:
+    if len(api_keys) > 1:
+      check_per_key_client_support()
+
+    self.logger = logger
+    self.quota_cooldown_seconds = quota_cooldown_seconds
+    self.clients = [
+      GeminiClient(
+        index=index,
+        api_key=api_key,
+        generative_model=generative_model,
+        temperature=temperature,
+        prompt=prompt,
+        rate_limiter=RateLimiter(
+          max_calls=requests_per_window,
+          window_seconds=window_seconds,
+        ),
+      )
+      for index, api_key in enumerate(api_keys)
+    ]
+    self.__lock = threading.Lock()
+
+
+  @property
+  def size(self) -> int:
+    """
+    The number of clients of the pool
+    """
+
+    return len(self.clients)
+
+
+  def __acquire_client(self,
+                       excluded_clients: set) -> GeminiClient | None:
+    """
+    Picks the least loaded healthy client not tried yet for the message and marks it busy
+
+    Args:
+      - excluded_clients (set): The indexes of the clients already tried for the message
+
+    Returns:
+      - GeminiClient | None: The client, None if every client was tried
+    """
+
+    with self.__lock:
+      candidates = [
+        client
+        for client in self.clients
+        if client.index not in excluded_clients
+      ]
+      if not candidates:
+        return None
+
+      healthy_candidates = [client for client in candidates if client.is_healthy()]
+      if healthy_candidates:
+        client = min(healthy_candidates, key=lambda client: client.load())
+      else:
+        client = min(candidates, key=lambda client: client.unhealthy_until)
+      client.in_flight += 1
+
+    cooldown = client.unhealthy_until - monotonic()
+    if cooldown > 0:
+      sleep(cooldown)
+    return client
+
+
+  def __release_client(self,
+                       client: GeminiClient,
+                       error: Exception | None) -> None:
+    """
+    Marks a client as no longer busy, cooling it down if it hit its quota
+
+    Args:
+      - client (GeminiClient): The client used for the message
+      - error (Exception | None): The error raised by the client, if any
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      client.in_flight -= 1
+      if error is None:
+        client.consecutive_failures = 0
+      elif self.is_quota_error(error):
+        client.consecutive_failures += 1
+        client.unhealthy_until = monotonic() + self.quota_cooldown_seconds * client.consecutive_failures
+
+
+  @staticmethod
+  def is_quota_error(error: Exception) -> bool:
+    """
+    Returns whether an error was raised because the quota of the API key was exhausted
+    """
+
+    message = f"{type(error).__name__} {error}".upper()
+    return any(marker in message for marker in QUOTA_ERROR_MARKERS)
+
+
+  def send_message(self,
+                   content: str,
+                   program: str | None = None,
+                   on_response=None) -> str:
+    """
+    Sends a message to the least loaded healthy client, failing over to the other clients
+    when a client hits its quota
+
+    Args:
+      - content (str): The message to be sent
+      - program (str | None): The program being processed, used to label the metrics
+      - on_response: The callback given the kind, the response and the latency of every call
+
+    Returns:
+      - str: The text of the response
+    """
+
+    tried_clients = set()
+    while True:
+      client = self.__acquire_client(tried_clients)
+      if client is None:
+        raise QuotaExhaustedError(f"Every one of the {self.size} Gemini clients exhausted its quota")
+
+      try:
+        response = client.send_message(
+          content=content,
+          program=program,
+          on_response=on_response,
+        )
+        self.__release_client(client, None)
+        return response
+
+      except Exception as e:
+        self.__release_client(client, e)
+        if not self.is_quota_error(e):
+          raise
+
+        tried_clients.add(client.index)
+        self.logger.warning(
+          message=f"The Gemini client: {client.index} hit its quota, failing over to another client"
+        )
+        metrics_handler.increment(
+          name="scraper_retries_total",
+          labels={"stage": "gemini_segregation", "reason": "quota", "program": program},
+        )
+
+
+gemini_client_pools = {}
+gemini_client_pools_lock = threading.Lock()
+
+
+def get_gemini_client_pool(logger,
+                           api_keys: list,
+                           generative_model: str,
+                           temperature: int,
+                           prompt: str,
+                           requests_per_window: int,
+                           window_seconds: float,
+                           quota_cooldown_seconds: float) -> GeminiClientPool:
+  """
+  Returns the process-wide client pool of a model and its API keys, so that the concurrent
+  scrapes of the process share the rate limiters and the health of every key rather than
+  each enforcing the quota of the key on its own
+
+  Args:
+    - logger: The logger of the pool, used only when the pool is created
+    - api_keys (list): The API keys of the pool, one client per key
+    - generative_model (str): The name of the model
+    - temperature (int): The temperature of the model
+    - prompt (str): The segregation prompt priming the chats
+    - requests_per_window (int): The requests every key may send within a window
+    - window_seconds (float): The length of the rate limiter window
+    - quota_cooldown_seconds (float): The cooldown of a key which hit its quota
+
+  Returns:
+    - GeminiClientPool: The client pool
+  """
+
+  pool_key = (generative_model, tuple(api_keys))
+  with gemini_client_pools_lock:
+    if pool_key not in gemini_client_pools:
+      gemini_client_pools[pool_key] = GeminiClientPool(
+        logger=logger,
+        api_keys=api_keys,
+        generative_model=generative_model,
+        temperature=temperature,
+        prompt=prompt,
+        requests_per_window=requests_per_window,
+        window_seconds=window_seconds,
+        quota_cooldown_seconds=quota_cooldown_seconds,
+      )
+    return gemini_client_pools[pool_key]
\ No newline at end of file
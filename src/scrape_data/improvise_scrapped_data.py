@@ -1,4 +1,7 @@
 from time import time
+from consts import PrerequisiteClosureConsts
+from src.utils.metrics_handler import metrics_handler
+from src.scrape_data.course_records import Course
 
 
 class ImproviseScrappedData:
@@ -23,48 +26,36 @@ class ImproviseScrappedData:
     
     self.logger = logger
     self.databse_handler = database_handler
+    self.prerequisite_courses = {}
+    prerequisite_closure_consts = PrerequisiteClosureConsts().get_constants()
+    self.prerequisite_closure_enabled = prerequisite_closure_consts["enabled"]
+    self.prerequisite_closure_max_depth = prerequisite_closure_consts["max_depth"]
   
 
   def __all_track_seperate_information_generation(self) -> dict:
     """
-    This method is responsible for generating all track seperate information.
+    This method is responsible for generating all track seperate information. The plan 
+    entries are referenced rather than copied, as the per-track fields are stored on them.
     
     Args:
       - None
     
     Returns:
-      - all_tracks_information (dict): A dictionary containing all track's course information.
+      - all_tracks_information (dict): A dictionary containing all track's plan entries keyed by the course.
     """
 
     try:
       all_tracks_information = {}
       for track in self.course_catalog.keys():
         track_specific_info = {}
-        for year in self.course_catalog[track].keys():
-          if year == "extra_course_related_info":
-            continue
-          for semester in self.course_catalog[track][year].keys():
-            for course in self.course_catalog[track][year][semester].keys():
-              if course not in track_specific_info and "course_link" in self.course_catalog[track][year][semester][course]:
-                track_specific_info[course] = self.course_catalog[track][year][semester][course].copy()
-                track_specific_info[course]["track"] = track
-                track_specific_info[course]["year"] = year
-                track_specific_info[course]["semester"] = semester
-
-              elif course not in track_specific_info and "course_link" not in self.course_catalog[track][year][semester][course] and "course_description" not in self.course_catalog[track][year][semester][course]:
-                for sub_course in self.course_catalog[track][year][semester][course].keys():
-                  track_specific_info[sub_course] = self.course_catalog[track][year][semester][course][sub_course].copy()
-                  track_specific_info[sub_course]["track"] = track
-                  track_specific_info[sub_course]["year"] = year
-                  track_specific_info[sub_course]["semester"] = semester
-              
-              elif course not in track_specific_info and "course_link" not in self.course_catalog[track][year][semester][course] and "course_description" in self.course_catalog[track][year][semester][course]:
-                track_specific_info[course] = self.course_catalog[track][year][semester][course].copy()
-                track_specific_info[course]["track"] = track
-                track_specific_info[course]["year"] = year
-                track_specific_info[course]["semester"] = semester
-
-        all_tracks_information[track] = track_specific_info.copy()
+        for plan_entry in self.course_catalog[track].plan_entries:
+          if plan_entry.group is not None:
+            track_specific_info[plan_entry.key] = plan_entry
+
+          elif plan_entry.key not in track_specific_info and not plan_entry.is_group_header:
+            track_specific_info[plan_entry.key] = plan_entry
+
+        all_tracks_information[track] = track_specific_info
       return all_tracks_information
     
     except Exception as e:
@@ -74,13 +65,69 @@ class ImproviseScrappedData:
       return {}
 
 
+  def __load_prerequisite_courses(self,
+                                  all_tracks_information: dict) -> dict:
+    """
+    This method is responsible for loading the prerequisites and corequisites which are not
+    listed by the plan grid of their track, either from the plan grids of the other tracks 
+    or from the courses collection, where the scraper stored them, one wave per level of 
+    prerequisites up to the maximum depth.
+    
+    Args:
+      - all_tracks_information (dict): A dictionary containing all track's plan entries keyed by the course.
+    
+    Returns:
+      - prerequisite_courses (dict): A dictionary containing the courses (Course) of the plan grids and those they miss, keyed by the course code.
+    """
+
+    if not self.prerequisite_closure_enabled:
+      return {}
+
+    try:
+      wave_courses = [
+        plan_entry.course
+        for track_information in all_tracks_information.values()
+        for plan_entry in track_information.values()
+        if plan_entry.course is not None and plan_entry.course.is_fetched
+      ]
+      prerequisite_courses = {course.course_code: course for course in wave_courses}
+      known_course_codes = set(prerequisite_courses)
+
+      for _ in range(self.prerequisite_closure_max_depth):
+        missing_course_codes = {
+          course_code
+          for course in wave_courses
+          for course_code in course.requisite_course_codes
+          if course_code not in known_course_codes
+        }
+        if not missing_course_codes:
+          break
+
+        wave_courses = [
+          Course.from_document(document=course_document)
+          for course_document in self.databse_handler.get_courses(
+            course_codes=sorted(missing_course_codes)
+          ).values()
+        ]
+        prerequisite_courses |= {course.course_code: course for course in wave_courses}
+        known_course_codes |= missing_course_codes
+
+      return prerequisite_courses
+    
+    except Exception as e:
+      self.logger.error(
+        message=f"An error occurred while loading the prerequisites missing from the plan grid: {str(e)}, at line {e.__traceback__.tb_lineno} in {__file__}"
+      )
+      return {}
+
+
   def __generate_course_path(self, course_dict, target_course) -> list:
     """
     Generates the path to a target course including all prerequisites and corequisites, and
     also includes information about which courses are prerequisites and corequisites.
 
     Args:
-      - course_dict (dict): Dictionary containing course information.
+      - course_dict (dict): Dictionary containing the plan entries keyed by the course.
       - target_course (str): Course code for which the path is to be generated.
 
     Returns:
@@ -105,12 +152,12 @@ class ImproviseScrappedData:
 
       visited.add(course_code)
 
-      course_info = course_dict.get(course_code)
+      course_info = course_dict.get(course_code) or self.prerequisite_courses.get(course_code)
       if not course_info:
         return []
 
-      prerequisites = course_info.get("prerequisites", [])
-      corequisites = course_info.get("corequisites", [])
+      prerequisites = course_info.prerequisites
+      corequisites = course_info.corequisites
       path = []
 
       for prerequisite in prerequisites:
@@ -204,8 +251,8 @@ class ImproviseScrappedData:
           course_dict=all_tracks_information[track],
           target_course=course
         )
-        all_tracks_information[track][course]["complete_path"] = path_to_course
-        all_tracks_information[track][course]["on_dependant_courses_count"] = len(path_to_course)
+        all_tracks_information[track][course].complete_path = path_to_course
+        all_tracks_information[track][course].on_dependant_courses_count = len(path_to_course)
 
     return all_tracks_information
 
@@ -216,7 +263,7 @@ class ImproviseScrappedData:
     This method is responsible for counting the dependencies of a course.
 
     Args:
-      - course_dict (dict): Dictionary containing course information.
+      - course_dict (dict): Dictionary containing the plan entries keyed by the course.
 
     Returns:
       - dependency_counts (dict): Dictionary containing dependency counts.
@@ -242,11 +289,8 @@ class ImproviseScrappedData:
           dependency_counts[course] = dependency_counts.get(course, 0) + 1
 
     for course_code, course_info in course_dict.items():
-      prerequisites = course_info.get("prerequisites", [])
-      corequisites = course_info.get("corequisites", [])
-
-      count_dependencies(prerequisites)
-      count_dependencies(corequisites)
+      count_dependencies(course_info.prerequisites)
+      count_dependencies(course_info.corequisites)
 
     return dependency_counts
 
@@ -264,23 +308,25 @@ class ImproviseScrappedData:
     """
 
     for track in all_tracks_information.keys():
-      for course in all_tracks_information[track].keys():
-        course_dependencies = self.__count_course_dependencies(
+      with metrics_handler.time_stage("graph_computation", self.course_name):
+        dependency_counts = self.__count_course_dependencies(
           course_dict=all_tracks_information[track]
-        ).get(course, 0)
-        all_tracks_information[track][course]["dependency_count"] = course_dependencies
+        )
+      for course in all_tracks_information[track].keys():
+        all_tracks_information[track][course].dependency_count = dependency_counts.get(course, 0)
       
       all_tracks_information[track] = {
         k: v 
         for k, v in sorted(
           all_tracks_information[track].items(), 
-          key=lambda item: item[1]["dependency_count"], 
+          key=lambda item: item[1].dependency_count, 
           reverse=True
         )
       }
       
       self.databse_handler.add_track_information(
-        track_information=all_tracks_information[track].copy(),
+        track=track,
+        track_information=all_tracks_information[track],
       )
     return all_tracks_information
   
@@ -293,7 +339,7 @@ class ImproviseScrappedData:
     
     Args:
       - course_name (str): The name of the course.
-      - course_catalog (dict): The course catalog data.
+      - course_catalog (dict): The track records (Track) of the course catalog keyed by the track name.
     
     Returns:
       - all_tracks_information (dict): A dictionary containing all track's course information along with the dependencies and dependency count.
@@ -304,9 +350,13 @@ class ImproviseScrappedData:
     self.course_catalog = course_catalog
 
     all_tracks_information = self.__all_track_seperate_information_generation()
-    all_tracks_information = self.__generate_path_for_courses_in_all_path(
+    self.prerequisite_courses = self.__load_prerequisite_courses(
       all_tracks_information=all_tracks_information
     )
+    with metrics_handler.time_stage("graph_computation", self.course_name):
+      all_tracks_information = self.__generate_path_for_courses_in_all_path(
+        all_tracks_information=all_tracks_information
+      )
     all_tracks_information = self.__compute_dependencies(
       all_tracks_information=all_tracks_information
     )
@@ -326,4 +376,30 @@ class ImproviseScrappedData:
       self.logger.error(
         message=f"Failed to improvise the scrapped course data for {self.course_name}"
       )
-      return False
\ No newline at end of file
+      return False
+
+
+  def run_track(self,
+                course_name: str,
+                track_record) -> dict | bool:
+    """
+    This method is responsible for improvising and storing a single track, so that a course 
+    catalog can be improvised one track at a time while it is being scrapped.
+    
+    Args:
+      - course_name (str): The name of the course.
+      - track_record (Track): The track record to be improvised.
+    
+    Returns:
+      - track_information (dict): The track's course information along with the dependencies and dependency count.
+    """
+
+    all_tracks_information = self.run(
+      course_name=course_name,
+      course_catalog={track_record.track_name: track_record},
+    )
+    self.course_catalog = None
+    self.prerequisite_courses = {}
+    if all_tracks_information == False:
+      return False
+    return all_tracks_information[track_record.track_name]
\ No newline at end of file
@@ -0,0 +1,232 @@
+import re
+import ast
+import json
+import threading
+from typing import TYPE_CHECKING
+from src.utils.metrics_handler import metrics_handler
+
+if TYPE_CHECKING:
+  from src.scrape_data.gemini_client_pool import GeminiClientPool
+
+
+COURSE_CODE_PATTERN = re.compile(r"[A-Z]{2,4}\s?\d{3}[A-Z]?")
+CODE_FENCE_PATTERN = re.compile(r"^\s*```[a-zA-Z]*\s*|\s*```\s*$")
+SEGREGATION_FIELDS = ("prerequisites", "prerequisites_description", "corequisites", "course_description")
+
+
+def parse_segregation_response(response_text: str) -> dict:
+  """
+  Parses the text of a Gemini segregation response into the structured course description,
+  as JSON or, since the model sometimes answers with a Python literal, as a literal. The
+  response is never evaluated as code.
+
+  Args:
+    - response_text (str): The text of the response, possibly fenced as a JSON code block
+
+  Returns:
+    - dict: The structured course description, raising a ValueError if the response is
+            neither JSON nor a literal
+  """
+
+  response_text = CODE_FENCE_PATTERN.sub("", str(response_text))
+  try:
+    return json.loads(response_text)
+  except json.JSONDecodeError:
+    pass
+
+  try:
+    return ast.literal_eval(response_text)
+  except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError) as e:
+    raise ValueError(f"The response is neither JSON nor a literal: {e}") from e
+
+
+def validate_requirement(requirement) -> list:
+  """
+  Checks a prerequisites or corequisites list against the nested AND/OR structure: a top
+  level list of required courses, where a nested list is a group of alternatives and an
+  alternative is either a course code or a list of course codes required together
+
+  Args:
+    - requirement: The prerequisites or corequisites list
+
+  Returns:
+    - list: The problems found, empty if the requirement is well formed
+  """
+
+  if not isinstance(requirement, list):
+    return [f"the requirement is a {type(requirement).__name__}, not a list"]
+
+  problems = []
+  for element in requirement:
+    alternatives = [element] if isinstance(element, str) else element
+    if not isinstance(alternatives, list) or not alternatives:
+      problems.append(f"the requirement element {element!r} is neither a course code nor a group of alternatives")
+      continue
+
+    for alternative in alternatives:
+      course_codes = [alternative] if isinstance(alternative, str) else alternative
+      if not isinstance(course_codes, list) or not course_codes:
+        problems.append(f"the alternative {alternative!r} is neither a course code nor a list of course codes")
+        continue
+      problems += [
+        f"{course_code!r} is not a course code"
+        for course_code in course_codes
+        if not isinstance(course_code, str) or not COURSE_CODE_PATTERN.fullmatch(course_code.strip())
+      ]
+
+  return problems
+
+
+def validate_segregation(segregation) -> list:
+  """
+  Checks a structured course description against the structure expected from the model
+
+  Args:
+    - segregation: The structured course description
+
+  Returns:
+    - list: The problems found, empty if the structured course description is valid
+  """
+
+  if not isinstance(segregation, dict):
+    return [f"the response is a {type(segregation).__name__}, not a dict"]
+
+  problems = [f"the field {field} is missing" for field in SEGREGATION_FIELDS if field not in segregation]
+  if problems:
+    return problems
+
+  if not isinstance(segregation["course_description"], str) or not segregation["course_description"].strip():
+    problems.append("the course description is empty")
+  if not isinstance(segregation["prerequisites_description"], str):
+    problems.append("the prerequisites description is not a string")
+  problems += validate_requirement(segregation["prerequisites"])
+  problems += validate_requirement(segregation["corequisites"])
+  return problems
+
+
+class ModelTier:
+  """
+  A tier of the model router: a model and the pool of clients sending it messages
+  """
+
+
+  def __init__(self,
+               name: str,
+               client_pool: "GeminiClientPool") -> None:
+    self.name = name
+    self.client_pool = client_pool
+    self.attempts = 0
+    self.accepted = 0
+
+
+class ModelRouter:
+  """
+  A router sending every course description to the cheapest and fastest model first, and
+  escalating it to the next, stronger, model only when the response fails, or fails to
+  parse into the expected structure. The response of the last tier is returned as is, so a
+  single tier behaves exactly like the model alone.
+  """
+
+
+  def __init__(self,
+               logger,
+               tiers: list) -> None:
+    self.logger = logger
+    self.tiers = tiers
+    self.__lock = threading.Lock()
+
+
+  @property
+  def size(self) -> int:
+    """
+    The number of clients of the first tier, the tier every message goes to
+    """
+
+    return self.tiers[0].client_pool.size
+
+
+  def __record(self,
+               tier: ModelTier,
+               result: str,
+               program: str | None) -> None:
+    """
+    Records the outcome of a message sent to a tier, 'accepted', 'rejected' or 'failed'
+    """
+
+    with self.__lock:
+      tier.attempts += 1
+      tier.accepted += int(result == "accepted")
+
+    metrics_handler.increment(
+      name="scraper_model_tier_responses_total",
+      labels={"tier": tier.name, "result": result, "program": program},
+    )
+
+
+  def get_tier_statistics(self) -> dict:
+    """
+    Returns the number of messages sent to every tier and the share of them accepted
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The attempts, accepted responses and success rate, keyed by the tier
+    """
+
+    with self.__lock:
+      return {
+        tier.name: {
+          "attempts": tier.attempts,
+          "accepted": tier.accepted,
+          "success_rate": tier.accepted / tier.attempts if tier.attempts else None,
+        }
+        for tier in self.tiers
+      }
+
+
+  def segregate(self,
+                content: str,
+                program: str | None = None,
+                on_response=None) -> dict:
+    """
+    Segregates a course description with the first tier whose response passes the validation
+
+    Args:
+      - content (str): The message to be sent
+      - program (str | None): The program being processed, used to label the metrics
+      - on_response: The callback given the kind, the response and the latency of every call
+
+    Returns:
+      - dict: The structured course description, raising the error of the last tier if it failed
+    """
+
+    for tier_index, tier in enumerate(self.tiers):
+      is_last_tier = tier_index == len(self.tiers) - 1
+      try:
+        segregation = parse_segregation_response(
+          response_text=tier.client_pool.send_message(
+            content=content,
+            program=program,
+            on_response=on_response,
+          )
+        )
+
+      except Exception as e:
+        self.__record(tier, "failed", program)
+        if is_last_tier:
+          raise
+        self.logger.warning(
+          message=f"The model: {tier.name} failed with '{e}', escalating to the model: {self.tiers[tier_index + 1].name}"
+        )
+        continue
+
+      problems = validate_segregation(segregation)
+      if not problems or is_last_tier:
+        self.__record(tier, "rejected" if problems else "accepted", program)
+        return segregation
+
+      self.__record(tier, "rejected", program)
+      self.logger.warning(
+        message=f"The response of the model: {tier.name} failed the validation ({'; '.join(problems[:3])}), escalating to the model: {self.tiers[tier_index + 1].name}"
+      )
\ No newline at end of file
@@ -0,0 +1,263 @@
+import re
+from src.scrape_data.course_records import intern_course_codes
+
+
+REQUISITE_SENTENCE_PATTERN = re.compile(
+  r"(?P<label>Pre-?requisites?|Co-?requisites?)\s*:\s*(?P<requirement>.*?)(?:\.(?=\s|$)|$)",
+  re.IGNORECASE,
+)
+GRADE_PATTERN = re.compile(
+  r"\(?\s*(?:with\s+)?(?:an?\s+)?(?:minimum\s+)?(?:grade\s+of\s+)[A-F][+-]?(?:\s+or\s+(?:better|higher|above))?\s*\)?",
+  re.IGNORECASE,
+)
+TOKEN_PATTERN = re.compile(
+  r"\s*(?:(?P<course>[A-Z]{2,4}\s?\d{3}[A-Z]?)|(?P<and>and\b|&)|(?P<or>or\b|/)|(?P<comma>[,;])|(?P<open>\()|(?P<close>\))|(?P<filler>both\b|either\b)|(?P<unknown>\S+))",
+  re.IGNORECASE,
+)
+
+
+class PrerequisiteParser:
+  """
+  A deterministic grammar based parser for the prerequisite and corequisite sentences of a
+  course description, e.g. "Prerequisites: MATH 111 and (CS 113 or CS 115).". It produces the
+  same nested AND/OR lists as the Google Gemini model, a top level list of required courses
+  where a nested list is a group of alternatives, along with a confidence, and gives up on
+  anything it cannot parse unambiguously so that the description is sent to Gemini instead.
+  A comma list ending in "or", e.g. "MATH 111, CS 113 or CS 115", may either be a list of
+  alternatives or a required course followed by alternatives, so it is parsed as the former
+  with a confidence below the default threshold.
+  """
+
+
+  def __tokenize(self,
+                 requirement: str) -> list | None:
+    """
+    Splits a requirement into course codes, connectors and parentheses, resolving the commas
+    of a list like "CS 113, CS 114 or CS 115" to the connector ending the list
+
+    Args:
+      - requirement (str): The requirement without the grade qualifiers
+
+    Returns:
+      - list | None: The tokens as (kind, value) pairs, None if an unknown word is found
+    """
+
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(requirement):
+      kind = match.lastgroup
+      if kind == "unknown":
+        return None
+      if kind == "filler":
+        continue
+      value = match.group(kind)
+      if kind == "course":
+        value = re.sub(r"^([A-Z]{2,4})\s?(\d)", r"\1 \2", value.upper())
+      tokens.append((kind, value))
+
+    for i, (kind, _) in enumerate(tokens):
+      if kind != "comma":
+        continue
+
+      depth, connector = 0, "and"
+      for next_kind, _ in tokens[i + 1:]:
+        if next_kind == "open":
+          depth += 1
+        elif next_kind == "close":
+          if depth == 0:
+            break
+          depth -= 1
+        elif depth == 0 and next_kind in ("and", "or"):
+          connector = next_kind
+          break
+      tokens[i] = (connector, connector)
+
+    merged_tokens = []
+    for token in tokens:
+      if merged_tokens and token[0] in ("and", "or") and merged_tokens[-1][0] in ("and", "or"):
+        if merged_tokens[-1][0] != token[0]:
+          return None
+        continue
+      merged_tokens.append(token)
+    return merged_tokens
+
+
+  def __parse_expression(self,
+                         tokens: list,
+                         position: int) -> tuple:
+    """
+    Parses 'factor (and factor)*' or 'factor (or factor)*', where a factor is a course code
+    or a parenthesized expression. The catalog English gives "and" and "or" no precedence,
+    "MATH 111 and CS 113 or CS 115" meaning MATH 111 and (CS 113 or CS 115), so both
+    connectors at the same level of parentheses are ambiguous and rejected.
+
+    Args:
+      - tokens (list): The tokens of the requirement
+      - position (int): The position of the first token of the expression
+
+    Returns:
+      - tuple: The parsed node and the position after the expression
+    """
+
+    alternatives, has_and = [], False
+    while True:
+      conjuncts = []
+      while True:
+        if position >= len(tokens):
+          raise ValueError("Unexpected end of the requirement")
+
+        kind, value = tokens[position]
+        if kind == "course":
+          conjuncts.append(value)
+          position += 1
+        elif kind == "open":
+          node, position = self.__parse_expression(tokens, position + 1)
+          if position >= len(tokens) or tokens[position][0] != "close":
+            raise ValueError("Unbalanced parentheses in the requirement")
+          conjuncts.append(node)
+          position += 1
+        else:
+          raise ValueError(f"Unexpected token: {value}")
+
+        if position < len(tokens) and tokens[position][0] == "and":
+          position += 1
+          continue
+        break
+
+      has_and = has_and or len(conjuncts) > 1
+      alternatives.append(conjuncts[0] if len(conjuncts) == 1 else ("and", conjuncts))
+      if position < len(tokens) and tokens[position][0] == "or":
+        position += 1
+        continue
+      break
+
+    if has_and and len(alternatives) > 1:
+      raise ValueError("Both 'and' and 'or' without parentheses in the requirement")
+
+    return (alternatives[0] if len(alternatives) == 1 else ("or", alternatives)), position
+
+
+  def __flatten(self,
+                node,
+                operator: str) -> list:
+    """
+    Flattens the nested nodes of the same operator into a single list of operands
+    """
+
+    if isinstance(node, tuple) and node[0] == operator:
+      return [operand for child in node[1] for operand in self.__flatten(child, operator)]
+    return [node]
+
+
+  def __to_requirement_list(self,
+                            node) -> list:
+    """
+    Converts a parsed node into the nested AND/OR lists consumed while generating the course
+    paths: a top level list of required courses or groups of alternatives, where a group may
+    hold lists of courses required together
+
+    Args:
+      - node: The parsed requirement
+
+    Returns:
+      - list: The requirement as nested lists
+    """
+
+    requirement_list = []
+    for conjunct in self.__flatten(node, "and"):
+      if isinstance(conjunct, str):
+        requirement_list.append(conjunct)
+        continue
+
+      alternatives = []
+      for alternative in self.__flatten(conjunct, "or"):
+        if isinstance(alternative, str):
+          alternatives.append(alternative)
+        else:
+          courses = self.__flatten(alternative, "and")
+          if not all(isinstance(course, str) for course in courses):
+            raise ValueError("Alternatives nested deeper than the supported structure")
+          alternatives.append(courses)
+      requirement_list.append(alternatives)
+
+    return requirement_list
+
+
+  def __parse_requirement(self,
+                          requirement: str) -> list | None:
+    """
+    Parses the requirement of a prerequisite or corequisite sentence
+
+    Args:
+      - requirement (str): The requirement, e.g. "MATH 111 and (CS 113 or CS 115)"
+
+    Returns:
+      - list | None: The requirement as nested lists, None if it could not be parsed
+    """
+
+    tokens = self.__tokenize(
+      requirement=GRADE_PATTERN.sub(" ", requirement)
+    )
+    if not tokens:
+      return None
+
+    try:
+      node, position = self.__parse_expression(tokens, 0)
+      if position != len(tokens):
+        return None
+      return self.__to_requirement_list(node)
+
+    except ValueError:
+      return None
+
+
+  def parse(self,
+            course_description: str) -> dict | None:
+    """
+    Segregates a course description into its prerequisites, corequisites and plain
+    description, the way the Google Gemini model does
+
+    Args:
+      - course_description (str): The course description fetched from the website
+
+    Returns:
+      - dict | None: The prerequisites, prerequisites description, corequisites, course
+                     description and the confidence of the parse, None if it could not be parsed
+    """
+
+    prerequisites, corequisites = [], []
+    prerequisites_descriptions = []
+    confidence = 1.0
+    remaining_description = course_description
+
+    for match in REQUISITE_SENTENCE_PATTERN.finditer(course_description):
+      requirement = match.group("requirement").strip()
+      requirement_list = self.__parse_requirement(requirement)
+      if requirement_list is None:
+        return None
+
+      if GRADE_PATTERN.search(requirement):
+        confidence = min(confidence, 0.95)
+      if re.search(r"[,;]", requirement) and re.search(r"\bor\b", requirement, re.IGNORECASE):
+        confidence = min(confidence, 0.8)
+
+      if match.group("label").lower().replace("-", "").startswith("pre"):
+        prerequisites += requirement_list
+        prerequisites_descriptions.append(requirement)
+      else:
+        corequisites += requirement_list
+      remaining_description = remaining_description.replace(match.group(0), " ")
+
+    if re.search(r"requisite", remaining_description, re.IGNORECASE):
+      return None
+
+    remaining_description = re.sub(r"\s+", " ", remaining_description).strip()
+    if not remaining_description:
+      return None
+
+    return {
+      "prerequisites": intern_course_codes(prerequisites),
+      "prerequisites_description": ". ".join(prerequisites_descriptions),
+      "corequisites": intern_course_codes(corequisites),
+      "course_description": remaining_description,
+      "confidence": confidence,
+    }
\ No newline at end of file
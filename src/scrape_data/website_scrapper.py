@@ -1,11 +1,26 @@
 import re
-import requests
+import math
+import uuid
+import hashlib
+import multiprocessing
+from urllib.parse import unquote
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from tqdm import tqdm
-from time import sleep, time
+from time import monotonic, time
 from bs4 import BeautifulSoup
 from unidecode import unidecode
 import google.generativeai as genai
-from consts import GoogleGeminiConsts, NJITConsts
+from consts import GoogleGeminiConsts, NJITConsts, PipelineConsts, PrerequisiteClosureConsts, PrerequisiteParserConsts, ScrapeEstimateConsts, UsageBudgetConsts
+from src.utils.http_client import HttpClient
+from src.utils.metrics_handler import metrics_handler
+from src.utils.staged_pipeline import PipelineStage, StagedPipeline
+from src.utils.single_flight import course_description_segregations, course_page_fetches
+from src.utils.usage_accountant import BudgetExhaustedError, UsageAccountant
+from src.scrape_data.course_page_parser import parse_course_page
+from src.scrape_data.prerequisite_parser import PrerequisiteParser
+from src.scrape_data.gemini_client_pool import get_gemini_client_pool, read_usage
+from src.scrape_data.model_router import ModelRouter, ModelTier
+from src.scrape_data.course_records import Course, PlanEntry, Track
 
 
 class WebsiteScrapper:
@@ -17,12 +32,20 @@ class WebsiteScrapper:
 
   def __init__(self, 
                logger,
-               database_handler) -> None:
+               database_handler,
+               checkpoint_handler) -> None:
     self.logger = logger
     self.database_handler = database_handler
+    self.checkpoint_handler = checkpoint_handler
+    self.course_catalog_name = None
+    self.run_id = None
+    self.__http_client = HttpClient(
+      logger=logger
+    )
     self.__setup_njit_consts()
+    self.__setup_prerequisite_parser()
     self.__setup_google_gemini_model()
-    self.api_count = 0
+    self.__setup_pipeline_consts()
 
 
   def __setup_njit_consts(self) -> None:
@@ -41,11 +64,50 @@ class WebsiteScrapper:
     self.__course_description_api = njit_consts["course_description_api"]
   
 
+  def __setup_prerequisite_parser(self) -> None:
+    """
+    To setup the rule based prerequisite parser, which segregates the course descriptions
+    following the regular "Prerequisites: ..." pattern without calling the Google Gemini model.
+
+    Args:
+      - None
+    
+    Returns:
+      - None
+    """
+
+    prerequisite_parser_consts = PrerequisiteParserConsts().get_constants()
+    self.__prerequisite_parser = PrerequisiteParser() if prerequisite_parser_consts["enabled"] else None
+    self.__prerequisite_parser_minimum_confidence = prerequisite_parser_consts["minimum_confidence"]
+
+
+  def __setup_pipeline_consts(self) -> None:
+    """
+    To setup the constants of the staged pipeline fetching, parsing, segregating and storing
+    the courses, a worker count of 0 standing for the HTTP concurrency limit or the number
+    of Gemini clients.
+
+    Args:
+      - None
+    
+    Returns:
+      - None
+    """
+
+    self.__pipeline_consts = PipelineConsts().get_constants()
+    self.__prerequisite_closure_consts = PrerequisiteClosureConsts().get_constants()
+
+
   def __setup_google_gemini_model(self) -> None:
     """
     To setup the Google Gemini model, for understanding the course related data and from 
     that seperate out the course description, pre-requisites and co-requisites for that 
-    particular course and learning outcomes of the course.
+    particular course and learning outcomes of the course. Every configured API key gets 
+    its own chat in the client pool, primed with the segregation prompt on its first use.
+    Every routing model gets its own client pool, the course descriptions going to the first
+    model and escalating to the next ones only when its response fails the validation. The
+    client pools are shared by every scrapper of the process, so the quota of a key holds
+    across concurrent scrapes.
 
     Args:
       - None
@@ -55,27 +117,73 @@ class WebsiteScrapper:
     """
 
     google_gemini_consts = GoogleGeminiConsts().get_constants()
-    api_key = google_gemini_consts["api_key"]
-    temperature = google_gemini_consts["temperature"]
-    generative_model = google_gemini_consts["generative_model"]
-    prompt_for_segregating_fetched_course_description = google_gemini_consts["prompt_for_segregating_fetched_course_description"]
+    api_keys = google_gemini_consts["api_keys"]
+    self.__google_gemini_consts = google_gemini_consts
 
     genai.configure(
-      api_key=api_key,
+      api_key=api_keys[0] if api_keys else google_gemini_consts["api_key"],
     )
-    gemini_model = genai.GenerativeModel(
-      model_name=generative_model,
-      generation_config={
-        "temperature": temperature
-      }
+    self.__course_description_segregation_model = ModelRouter(
+      logger=self.logger,
+      tiers=[
+        ModelTier(
+          name=generative_model,
+          client_pool=get_gemini_client_pool(
+            logger=self.logger,
+            api_keys=api_keys,
+            generative_model=generative_model,
+            temperature=google_gemini_consts["temperature"],
+            prompt=google_gemini_consts["prompt_for_segregating_fetched_course_description"],
+            requests_per_window=google_gemini_consts["requests_per_window"],
+            window_seconds=google_gemini_consts["rate_limit_window_seconds"],
+            quota_cooldown_seconds=google_gemini_consts["quota_cooldown_seconds"],
+          ),
+        )
+        for generative_model in google_gemini_consts["routing_models"]
+      ],
     )
 
-    self.__course_description_segregation_model = gemini_model.start_chat(
-      history=[]
-    )
-    self.__course_description_segregation_model.send_message(
-      content=prompt_for_segregating_fetched_course_description
+    usage_budget_consts = UsageBudgetConsts().get_constants()
+    self.__usage_accountant = UsageAccountant(
+      logger=self.logger,
+      max_tokens_per_run=usage_budget_consts["max_tokens_per_run"],
+      max_requests_per_run=usage_budget_consts["max_requests_per_run"],
+      on_budget_exhausted=usage_budget_consts["on_budget_exhausted"],
     )
+
+
+  def __record_gemini_usage(self,
+                            course_code: str | None,
+                            retry: bool = False):
+    """
+    To build the callback recording the usage of the Gemini calls made for a course against
+    the current run.
+
+    Args:
+      - course_code (str | None): The code of the course the calls are made for
+      - retry (bool): Whether the calls retry an earlier call
+
+    Returns:
+      - function: The callback given the kind, the response and the latency of every call
+    """
+
+    program, run_id = self.course_catalog_name, self.run_id
+
+    def on_response(kind: str, response, latency_seconds: float) -> None:
+      prompt_tokens, output_tokens, finish_reason = read_usage(response)
+      self.__usage_accountant.record(
+        program=program,
+        run_id=run_id,
+        kind=kind,
+        course=course_code,
+        prompt_tokens=prompt_tokens,
+        output_tokens=output_tokens,
+        latency_seconds=latency_seconds,
+        finish_reason=finish_reason,
+        retry=retry and kind != "priming",
+      )
+
+    return on_response
   
 
   def __generate_course_description_embeddings(self,
@@ -91,16 +199,18 @@ class WebsiteScrapper:
     """
 
     try:
-      course_description_embeddings_for_semantic_similarity = genai.embed_content(
-        model="models/embedding-001",
-        content=course_description,
-        task_type="semantic_similarity"
-      )
-      course_description_embeddings_for_clustering = genai.embed_content(
-        model="models/embedding-001",
-        content=course_description,
-        task_type="clustering"
-      )
+      embeddings = {}
+      with metrics_handler.time_stage("embedding", self.course_catalog_name):
+        for task_type in ("semantic_similarity", "clustering"):
+          start = monotonic()
+          embeddings[task_type] = genai.embed_content(
+            model="models/embedding-001",
+            content=course_description,
+            task_type=task_type
+          )
+          self.__record_gemini_usage(course_code=None)("embedding", embeddings[task_type], monotonic() - start)
+      course_description_embeddings_for_semantic_similarity = embeddings["semantic_similarity"]
+      course_description_embeddings_for_clustering = embeddings["clustering"]
       
       return course_description_embeddings_for_semantic_similarity["embedding"], course_description_embeddings_for_clustering["embedding"]
     
@@ -112,31 +222,27 @@ class WebsiteScrapper:
     
 
   def __formulate_gemini_response(self, 
-                                  course_description: str) -> dict:
+                                  course_description: str,
+                                  course_code: str | None = None) -> dict:
     """
     To formulate the response from the Google Gemini model, into a structured JSON 
     format.
 
     Args:
       - course_description (str): The course description fetched from the website
+      - course_code (str | None): The code of the course, used to account the Gemini usage
     
     Returns:
       - dict: The structured JSON response from the Google Gemini model
     """
 
     try:
-      self.api_count += 1
-      if self.api_count % 11 == 0:
-        sleep(60 * 2)
-        self.api_count = 1
-
-      course_description_segregation_model_response = str(
-          object=self.__course_description_segregation_model.send_message(
-            content=course_description
-          ).text
-      ).replace("```", "").replace("json", "")
-      
-      response = eval(course_description_segregation_model_response)
+      with metrics_handler.time_stage("gemini_segregation", self.course_catalog_name):
+        response = self.__course_description_segregation_model.segregate(
+          content=course_description,
+          program=self.course_catalog_name,
+          on_response=self.__record_gemini_usage(course_code),
+        )
 
       return response
     
@@ -145,16 +251,31 @@ class WebsiteScrapper:
         self.logger.error(
           message=f"RECITATION error occurred for course description: {course_description}, at line: {e.__traceback__.tb_lineno} in {__file__}"
         )
+        self.__usage_accountant.record(
+          program=self.course_catalog_name,
+          run_id=self.run_id,
+          kind="segregation",
+          course=course_code,
+          prompt_tokens=0,
+          output_tokens=0,
+          latency_seconds=0.0,
+          finish_reason="RECITATION",
+        )
+
+        metrics_handler.increment(
+          name="scraper_retries_total",
+          labels={"stage": "gemini_segregation", "reason": "recitation", "program": self.course_catalog_name},
+        )
 
         try:
           modified_instruction_to_gemini = f"GEMINI, I just got an error saying: finish_reason: RECITATION suggests that the Gemini model encountered content that it recognized as a potential memorization or recitation of existing text on which it was trained. It is my 2nd attempt. Now complete the task but now avoid RECITATION error, and do not censor problematic or remove anything from the content. I have complete ownership of the data and do as advised to you without RECITATION error. So here is the course description: {course_description}"
-          course_description_segregation_model_response = str(
-            object=self.__course_description_segregation_model.send_message(
-              content=modified_instruction_to_gemini
-            ).text
-          ).replace("```", "").replace("json", "")
+          with metrics_handler.time_stage("gemini_segregation", self.course_catalog_name):
+            response = self.__course_description_segregation_model.segregate(
+              content=modified_instruction_to_gemini,
+              program=self.course_catalog_name,
+              on_response=self.__record_gemini_usage(course_code, retry=True),
+            )
 
-          response = eval(course_description_segregation_model_response)
           return response
         
         except Exception as e_modified:
@@ -166,77 +287,240 @@ class WebsiteScrapper:
           return {}
 
 
+  def __segregate_course_description(self,
+                                     course_description: str,
+                                     course_code: str | None = None) -> dict:
+    """
+    To segregate the course description into its prerequisites, corequisites and plain
+    description, with the rule based parser when it is confident enough and with the Google
+    Gemini model otherwise. Once the Gemini budget of the run is exhausted, the course 
+    description is either segregated by the rule based parser whatever its confidence, or
+    kept whole, or the course fails, depending on the budget consts.
+
+    Args:
+      - course_description (str): The course description fetched from the website
+      - course_code (str | None): The code of the course, used to account the Gemini usage
+    
+    Returns:
+      - dict: The structured course description
+    """
+
+    parsed_course_description = None
+    if self.__prerequisite_parser is not None:
+      with metrics_handler.time_stage("rule_based_segregation", self.course_catalog_name):
+        parsed_course_description = self.__prerequisite_parser.parse(course_description)
+
+      if parsed_course_description and parsed_course_description["confidence"] > self.__prerequisite_parser_minimum_confidence:
+        metrics_handler.increment(
+          name="scraper_segregation_total",
+          labels={"method": "rule_based", "program": self.course_catalog_name},
+        )
+        parsed_course_description.pop("confidence")
+        return parsed_course_description
+
+    if not self.__usage_accountant.has_budget(self.course_catalog_name, self.run_id):
+      if self.__usage_accountant.on_budget_exhausted == "stop":
+        raise BudgetExhaustedError(f"The Gemini budget of the run: {self.run_id} of {self.course_catalog_name} is exhausted")
+
+      metrics_handler.increment(
+        name="scraper_segregation_total",
+        labels={"method": "budget_degraded", "program": self.course_catalog_name},
+      )
+      if parsed_course_description:
+        parsed_course_description.pop("confidence")
+        return parsed_course_description
+      return {
+        "prerequisites": [],
+        "prerequisites_description": "",
+        "corequisites": [],
+        "course_description": course_description,
+      }
+
+    def segregate_with_gemini() -> dict:
+      metrics_handler.increment(
+        name="scraper_segregation_total",
+        labels={"method": "gemini", "program": self.course_catalog_name},
+      )
+      return self.__formulate_gemini_response(
+        course_description=course_description,
+        course_code=course_code,
+      )
+
+    return course_description_segregations.do(
+      key=hashlib.sha256(course_description.encode("utf-8")).hexdigest(),
+      function=segregate_with_gemini,
+      program=self.course_catalog_name,
+    )
+
+
+  def __fetch_course_page(self,
+                          api_url: str,
+                          program: str | None) -> bytes:
+    """
+    To fetch the content of a course page, awaiting the fetch already in flight for the same
+    course link, e.g. by the scrape of another program listing the course.
+
+    Args:
+      - api_url (str): The URL for the API
+      - program (str | None): The program being scrapped, used to label the metrics
+    
+    Returns:
+      - bytes: The content of the course page
+    """
+
+    return course_page_fetches.do(
+      key=api_url,
+      function=lambda: self.__http_client.get(
+        url=api_url,
+        program=program,
+      ).content,
+      program=program,
+    )
+
+
+  def __build_course(self,
+                     api_url: str,
+                     course_page: dict) -> Course:
+    """
+    To build the course record out of a parsed course page, segregating its course description.
+
+    Args:
+      - api_url (str): The URL for the API
+      - course_page (dict): The course code, name, credits, contact hours and course description parsed from the course page
+
+    Returns:
+      - Course: The course record
+    """
+
+    course_description = self.__segregate_course_description(
+      course_description=course_page["course_description"],
+      course_code=course_page["course_code"],
+    )
+
+    return Course(
+      course_link=api_url,
+      course_code=course_page["course_code"],
+      course_name=course_page["course_name"],
+      credits=course_page["credits"],
+      contact_hours=course_page["contact_hours"],
+      prerequisites=course_description["prerequisites"],
+      prerequisites_description=course_description["prerequisites_description"],
+      corequisites=course_description["corequisites"],
+      course_description=course_description["course_description"],
+    )
+
+
   def __formulate_api_response(self, 
-                               api_url: str) -> dict | None:
+                               api_url: str) -> Course | None:
     """
-    To formulate the response from the API, into a structured JSON format.
+    To formulate the response from the API, into a course record.
     
     Args:
       - api_url (str): The URL for the API
     
     Returns:
-      - dict | None: The structured JSON response from the API
+      - Course | None: The course record formulated from the API response
     """
     
-    api_page = requests.get(api_url)
-    api_soup = BeautifulSoup(api_page.content, 'html.parser')
+    with metrics_handler.time_stage("http_fetch", self.course_catalog_name):
+      course_page_content = self.__fetch_course_page(
+        api_url=api_url,
+        program=self.course_catalog_name,
+      )
 
     try:
-      code_name_creditsandtime = str(
-        object=unidecode(
-          string=api_soup.find(
-            name="div",
-            attrs={
-              "class": "searchresult search-courseresult"
-            }
-          ).find("h2").text
-        )
-      ).strip()
+      with metrics_handler.time_stage("html_parse", self.course_catalog_name):
+        course_page = parse_course_page(course_page_content)
 
-
-      code_name_creditsandtime = code_name_creditsandtime[:-1] if code_name_creditsandtime.endswith(".") else code_name_creditsandtime
-      course_code, course_name, credits_and_time = [
-        str(unidecode(text)).strip() 
-        for text in code_name_creditsandtime.split(". ")
-      ]
-      credits_and_time = [
-        str(unidecode(text)).replace("credits", "").replace("credit", "").replace("contact hours", "").strip() 
-        for text in credits_and_time.split(",")
-      ]
-      credits, contact_hours = credits_and_time
-      credits = int(credits)
-      
-      course_description = str(
-        object=unidecode(
-          string=api_soup.find(
-            name="p",
-            attrs={
-              "class": "courseblockdesc"
-            }
-          ).text
-        )
-      ).strip()
-      
-      course_description = self.__formulate_gemini_response(course_description)
-
-      course_related_info = {
-        "course_code": course_code,
-        "course_name": course_name,
-        "credits": credits,
-        "contact_hours": contact_hours,
-        "prequisites": course_description["prerequisites"],
-        "prerequisites_description": course_description["prerequisites_description"],
-        "corequisites": course_description["corequisites"],
-        "course_description": course_description["course_description"]
-      }
-      return course_related_info
+      return self.__build_course(
+        api_url=api_url,
+        course_page=course_page,
+      )
     
+    except BudgetExhaustedError:
+      raise
+
     except Exception as e:
       if "RECITATION" in str(e).upper():
         print(f"RECITATION error occurred for URL: {api_url}")
       self.logger.error(f"Error related to Google Gemini API: {e}, at line: {e.__traceback__.tb_lineno} for URL: {api_url}, in file: {__file__}")
 
 
+  def __fetch_course_related_info(self,
+                                  api_url: str) -> Course | None:
+    """
+    To fetch the course related information for a course link, reusing the information
+    checkpointed by the run being resumed and checkpointing the newly fetched information.
+
+    Args:
+      - api_url (str): The URL for the API
+
+    Returns:
+      - Course | None: The course record formulated from the API response
+    """
+
+    if api_url in self.__checkpointed_courses:
+      metrics_handler.increment(
+        name="scraper_cache_requests_total",
+        labels={"cache": "checkpoint", "result": "hit", "program": self.course_catalog_name},
+      )
+      return Course.from_document(
+        document=self.__checkpointed_courses[api_url]
+      )
+
+    metrics_handler.increment(
+      name="scraper_cache_requests_total",
+      labels={"cache": "checkpoint", "result": "miss", "program": self.course_catalog_name},
+    )
+    course = self.__formulate_api_response(
+      api_url=api_url
+    )
+    if course:
+      self.checkpoint_handler.checkpoint_course(
+        program=self.course_catalog_name,
+        run_id=self.run_id,
+        course_link=api_url,
+        course_related_info=course.to_document(),
+        usage=self.get_run_usage(),
+      )
+    return course
+
+
+  def __get_course(self,
+                   course_link: str,
+                   already_fetch_courses: dict) -> Course:
+    """
+    To get the shared course record for a course link, so that every track listing the course
+    refers to the same record. The courses are all fetched up front, a course which could not
+    be fetched being kept as a record holding only its link rather than fetched again here, 
+    it is left out of the checkpoints so a resumed run fetches it again.
+
+    Args:
+      - course_link (str): The link to the course description
+      - already_fetch_courses (dict): The course records fetched so far, keyed by the course link
+
+    Returns:
+      - Course: The course record, holding only the course link if the course could not be fetched
+    """
+
+    metrics_handler.increment(
+      name="scraper_cache_requests_total",
+      labels={
+        "cache": "already_fetch_courses",
+        "result": "hit" if course_link in already_fetch_courses else "miss",
+        "program": self.course_catalog_name,
+      },
+    )
+    if course_link not in already_fetch_courses:
+      self.logger.error(
+        message=f"The course with link: {course_link} of {self.course_catalog_name} was not fetched up front, it is kept as a link only",
+      )
+      already_fetch_courses[course_link] = Course(
+        course_link=course_link
+      )
+    return already_fetch_courses[course_link]
+
+
   def __scrape_course_data(self,
                            url_to_course_catalog: str) -> dict:
     """
@@ -251,17 +535,19 @@ class WebsiteScrapper:
               co-requisites and course description for all the tracks
     """
 
-    course_catalog_page = requests.get(
-      url=url_to_course_catalog,
-      headers={
-        "Accept-Language": "en-US,en;q=0.9,en-IN;q=0.8",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36 Edg/126.0.0.0" 
-      }
-    )
-    course_catalog_page_content = BeautifulSoup(
-      markup=course_catalog_page.content, 
-      features='html.parser'
-    )
+    with metrics_handler.time_stage("http_fetch", self.course_catalog_name):
+      course_catalog_page = self.__http_client.get(
+        url=url_to_course_catalog,
+        headers={
+          "Accept-Language": "en-US,en;q=0.9,en-IN;q=0.8",
+        },
+        program=self.course_catalog_name,
+      )
+    with metrics_handler.time_stage("html_parse", self.course_catalog_name):
+      course_catalog_page_content = BeautifulSoup(
+        markup=course_catalog_page.content, 
+        features='html.parser'
+      )
 
     tracks_for_course = {}
     page_content = course_catalog_page_content.find(
@@ -374,131 +660,773 @@ class WebsiteScrapper:
     return tracks_for_course
 
 
-  def __structurize_scrapped_data(self,
-                                  tracks_for_course: dict) -> dict | bool:
+  def __collect_course_links(self,
+                             tracks_for_course: dict) -> list:
+    """
+    To collect the links of every course listed by the tracks, in the order in which they
+    appear on the course catalog page and without duplicates.
+
+    Args:
+      - tracks_for_course (dict): The scrapped data for all the tracks
+    
+    Returns:
+      - list: The course links
     """
-    To structurize the scrapped data into a structured JSON format with complete information
-    about the course code, course name, credits, contact hours, pre-requisites, co-requisites
-    and course description for all the tracks.
+
+    course_links = []
+    for track in tracks_for_course:
+      for year in tracks_for_course[track]:
+        if year == "extra_course_related_info":
+          continue
+
+        for semester in tracks_for_course[track][year]:
+          for course_links_of_entry in tracks_for_course[track][year][semester].values():
+            if "course_link" in course_links_of_entry:
+              course_links.append(course_links_of_entry["course_link"])
+              continue
+            course_links += [
+              course_link["course_link"]
+              for course_link in course_links_of_entry.values()
+              if isinstance(course_link, dict) and "course_link" in course_link
+            ]
+
+    return list(dict.fromkeys(course_links))
+
+
+  def __prefetch_courses(self,
+                         tracks_for_course: dict,
+                         already_fetch_courses: dict) -> None:
+    """
+    To fetch the courses of every track concurrently, with as many workers as the HTTP layer
+    may keep in flight or Gemini clients provisioned, the adaptive concurrency controller of 
+    the host deciding how many requests are actually sent at once. The courses which could 
+    not be fetched are kept as records holding only their link, so they are not fetched again
+    one at a time while the tracks are built.
 
     Args:
       - tracks_for_course (dict): The scrapped data for all the tracks
+      - already_fetch_courses (dict): The course records fetched so far, keyed by the course link
     
     Returns:
-      - dict: The structured JSON response for the scrapped data
+      - None
     """
 
+    fetch_counts = self.__fetch_courses(
+      course_links=self.__collect_course_links(tracks_for_course),
+      already_fetch_courses=already_fetch_courses,
+      keep_failed_courses=True,
+    )
+    if fetch_counts["failed"]:
+      self.logger.error(
+        message=f"Failed to fetch {fetch_counts['failed']} courses of {self.course_catalog_name}, they are fetched again when the run: {self.run_id} is resumed",
+      )
+
+
+  def __fetch_courses(self,
+                      course_links: list,
+                      already_fetch_courses: dict,
+                      keep_failed_courses: bool = False) -> dict:
+    """
+    To fetch the courses not fetched yet out of a list of course links concurrently.
+
+    Args:
+      - course_links (list): The links of the courses to be fetched
+      - already_fetch_courses (dict): The course records fetched so far, keyed by the course link
+      - keep_failed_courses (bool): Whether to keep a record holding only the course link for
+                                    the courses which could not be fetched, so they are not 
+                                    fetched again
+    
+    Returns:
+      - dict: The number of courses fetched, reused from the checkpoints of the run and failed
+    """
+
+    course_links = [
+      course_link
+      for course_link in course_links
+      if course_link not in already_fetch_courses
+    ]
+
+    if self.__pipeline_consts["enabled"]:
+      fetched_courses = {
+        course_link: self.__fetch_course_related_info(course_link)
+        for course_link in course_links
+        if course_link in self.__checkpointed_courses
+      }
+      fetched_courses |= self.__run_course_pipeline(
+        course_links=[
+          course_link
+          for course_link in course_links
+          if course_link not in self.__checkpointed_courses
+        ]
+      )
+    else:
+      max_workers = max(self.__http_client.max_concurrency, self.__course_description_segregation_model.size)
+      with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+          fetched_courses = dict(zip(course_links, executor.map(self.__fetch_course_related_info, course_links)))
+        except BudgetExhaustedError:
+          executor.shutdown(cancel_futures=True)
+          raise
+
+    fetch_counts = {"fetched": 0, "resumed": 0, "failed": 0}
+    for course_link in course_links:
+      course = fetched_courses.get(course_link)
+      if course:
+        already_fetch_courses[course_link] = course
+        fetch_counts["resumed" if course_link in self.__checkpointed_courses else "fetched"] += 1
+        continue
+
+      fetch_counts["failed"] += 1
+      if keep_failed_courses:
+        already_fetch_courses[course_link] = Course(
+          course_link=course_link
+        )
+
+    return fetch_counts
+
+
+  def __prefetch_prerequisite_closure(self,
+                                      already_fetch_courses: dict) -> dict:
+    """
+    To fetch the prerequisites and corequisites named by the fetched courses which are not 
+    listed by the plan grid, e.g. the courses of another program, so that the paths to the
+    courses are not cut off at the edge of the program. The courses are fetched in waves, a
+    wave fetching every course the previous wave named, until no new course is named or the 
+    maximum depth is reached. The courses are stored in the courses collection.
+
+    Args:
+      - already_fetch_courses (dict): The course records fetched so far, keyed by the course link
+    
+    Returns:
+      - dict: The number of courses fetched, reused from the checkpoints of the run and failed
+    """
+
+    fetch_counts = {"fetched": 0, "resumed": 0, "failed": 0}
+    if not self.__prerequisite_closure_consts["enabled"]:
+      return fetch_counts
+
+    wave_courses = [course for course in already_fetch_courses.values() if course.is_fetched]
+    known_course_codes = {course.course_code for course in wave_courses}
+
+    for depth in range(self.__prerequisite_closure_consts["max_depth"]):
+      missing_course_codes = {
+        course_code
+        for course in wave_courses
+        for course_code in course.requisite_course_codes
+        if course_code not in known_course_codes
+      }
+      course_links = [
+        f"{self.__course_description_api}{course_code.strip().replace(' ', '%20')}"
+        for course_code in sorted(missing_course_codes)
+      ]
+      course_links = [course_link for course_link in course_links if course_link not in already_fetch_courses]
+      if not course_links:
+        break
+
+      self.logger.info(
+        message=f"Fetching {len(course_links)} prerequisites missing from the plan grid of {self.course_catalog_name}, wave {depth + 1}"
+      )
+      wave_fetch_counts = self.__fetch_courses(
+        course_links=course_links,
+        already_fetch_courses=already_fetch_courses,
+        keep_failed_courses=True,
+      )
+      for outcome, count in wave_fetch_counts.items():
+        fetch_counts[outcome] += count
+      known_course_codes |= missing_course_codes
+      wave_courses = [already_fetch_courses[course_link] for course_link in course_links if already_fetch_courses[course_link].is_fetched]
+      known_course_codes |= {course.course_code for course in wave_courses}
+      self.database_handler.add_courses(
+        courses={course.course_code: course for course in wave_courses},
+      )
+
+    return fetch_counts
+
+
+  def __run_course_pipeline(self,
+                            course_links: list) -> dict:
+    """
+    To fetch, parse, segregate and store the courses through a staged pipeline, each stage 
+    with its own workers: I/O threads for the HTTP requests, worker processes for the HTML 
+    parsing, as many workers as Gemini clients for the segregation and a single writer 
+    checkpointing and storing the courses in batches. The stages are joined by bounded 
+    queues, so the fastest stage waits on the slowest one instead of piling up courses. The
+    worker processes are spawned rather than forked, as the scrape runs on the threads of 
+    the server and a fork would copy the locks those threads hold. A Gemini budget exhausted
+    with the stop policy aborts the pipeline, the courses already segregated being stored
+    before the error is raised.
+
+    Args:
+      - course_links (list): The links of the courses to be fetched
+    
+    Returns:
+      - dict: The course records fetched, keyed by the course link
+    """
+
+    if not course_links:
+      return {}
+
+    metrics_handler.increment(
+      name="scraper_cache_requests_total",
+      labels={"cache": "checkpoint", "result": "miss", "program": self.course_catalog_name},
+      value=len(course_links),
+    )
+    program, run_id = self.course_catalog_name, self.run_id
+    parse_processes = self.__pipeline_consts["parse_processes"]
+    process_pool = ProcessPoolExecutor(
+      max_workers=parse_processes,
+      mp_context=multiprocessing.get_context("spawn"),
+    ) if parse_processes > 0 else None
+
+    def fetch(course_link: str) -> tuple:
+      return course_link, self.__fetch_course_page(
+        api_url=course_link,
+        program=program,
+      )
+
+    def parse(fetched_course: tuple) -> tuple:
+      course_link, content = fetched_course
+      if process_pool is None:
+        return course_link, parse_course_page(content)
+      return course_link, process_pool.submit(parse_course_page, content).result()
+
+    def segregate(parsed_course: tuple) -> Course:
+      course_link, course_page = parsed_course
+      return self.__build_course(
+        api_url=course_link,
+        course_page=course_page,
+      )
+
+    def store(courses: list) -> list:
+      self.checkpoint_handler.checkpoint_courses(
+        program=program,
+        run_id=run_id,
+        courses_related_info={course.course_link: course.to_document() for course in courses},
+        usage=self.__usage_accountant.get_totals(
+          program=program,
+          run_id=run_id,
+        ),
+      )
+      self.database_handler.add_courses(
+        courses={course.course_code: course for course in courses},
+      )
+      return courses
+
+    queue_size = self.__pipeline_consts["queue_size"]
     try:
-      already_fetch_courses = {}
-      more_informative_tracks_for_course = {}
+      courses = StagedPipeline(
+        logger=self.logger,
+        name="course_pipeline",
+        program=program,
+        stages=[
+          PipelineStage("http_fetch", fetch, self.__pipeline_consts["fetch_workers"] or self.__http_client.max_concurrency, queue_size),
+          PipelineStage("html_parse", parse, parse_processes, queue_size),
+          PipelineStage("segregation", segregate, self.__pipeline_consts["segregate_workers"] or self.__course_description_segregation_model.size, queue_size),
+          PipelineStage("store", store, 1, queue_size, batch_size=self.__pipeline_consts["store_batch_size"]),
+        ],
+        fatal_errors=(BudgetExhaustedError,),
+      ).run(course_links)
+    finally:
+      if process_pool is not None:
+        process_pool.shutdown()
 
-      for track in tracks_for_course:
-        more_informative_tracks_for_course[track] = {}
+    return {course.course_link: course for course in courses}
+
+
+  def __build_track_record(self,
+                           track: str,
+                           tracks_for_course: dict,
+                           already_fetch_courses: dict) -> Track:
+    """
+    To build the track record of a single track out of the scrapped data, out of the courses
+    fetched up front, and to store its course catalog information.
+
+    Args:
+      - track (str): The name of the track
+      - tracks_for_course (dict): The scrapped data for all the tracks
+      - already_fetch_courses (dict): The course records fetched so far, keyed by the course link
+    
+    Returns:
+      - Track: The track record
+    """
+
+    track_record = Track(
+      track_name=track,
+      extra_course_related_info=tracks_for_course[track].get("extra_course_related_info"),
+    )
 
-        for year in tqdm(
-          iterable=tracks_for_course[track],
-          desc=f"Scrapping for Track \"{track}\": ",
-          total=len(tracks_for_course[track])  
-        ):
-          more_informative_tracks_for_course[track][str(year)] = {}
+    for year in tqdm(
+      iterable=tracks_for_course[track],
+      desc=f"Scrapping for Track \"{track}\": ",
+      total=len(tracks_for_course[track])  
+    ):
+      if year == "extra_course_related_info":
+        continue
+      
+      for semester in tracks_for_course[track][year]:
+        for course in tracks_for_course[track][year][semester]:
+          course_links = tracks_for_course[track][year][semester][course]
 
-          if year == "extra_course_related_info":
-            more_informative_tracks_for_course[track][str(year)] = tracks_for_course[track][year]
+          if "elective" in course.lower() and "course_link" not in course_links.keys() and any("course_link" not in course_links[key].keys() for key in course_links.keys()):
+            course_description = ""
+            numbers = [int(num) for num in re.findall(r'\d+', course)]
+            for n in numbers:
+              course_description += str(tracks_for_course[track]["extra_course_related_info"][str(n)]) + " "
+            track_record.plan_entries.append(
+              PlanEntry(
+                key=course,
+                track=track,
+                year=str(year),
+                semester=str(semester),
+                course_description=course_description,
+              )
+            )
             continue
-          
-          for semester in tracks_for_course[track][year]:
-            more_informative_tracks_for_course[track][str(year)][str(semester)] = {}
-
-            for course in tracks_for_course[track][year][semester]:
-              more_informative_tracks_for_course[track][str(year)][str(semester)][course] = {}
-
-              if "elective" in course.lower() and "course_link" not in tracks_for_course[track][year][semester][course].keys() and any("course_link" not in tracks_for_course[track][year][semester][course][key].keys() for key in tracks_for_course[track][year][semester][course].keys()):
-                more_informative_tracks_for_course[track][str(year)][str(semester)][course]["course_description"] = ""
-                numbers = [int(num) for num in re.findall(r'\d+', course)]
-                if len(numbers) > 0:
-                  for n in numbers:
-                    data = str(tracks_for_course[track]["extra_course_related_info"][str(n)]).strip()
-                    if data[-1] != ".":
-                      data += "."
-                    more_informative_tracks_for_course[track][str(year)][str(semester)][course]["course_description"] += str(tracks_for_course[track]["extra_course_related_info"][str(n)]) +" "
-                continue
-
-              if "course_link" in tracks_for_course[track][year][semester][course].keys():
-                if tracks_for_course[track][year][semester][course]["course_link"] not in already_fetch_courses.keys():
-                  course_related_info = self.__formulate_api_response(
-                    api_url=tracks_for_course[track][year][semester][course]["course_link"]
-                  )
-                  if course_related_info:
-                    more_informative_tracks_for_course[track][str(year)][str(semester)][course] = {
-                      "course_code": course_related_info["course_code"],
-                      "course_name": course_related_info["course_name"],
-                      "credits": course_related_info["credits"],
-                      "contact_hours": course_related_info["contact_hours"],
-                      "prerequisites": course_related_info["prequisites"],
-                      "prerequisites_description": course_related_info["prerequisites_description"],
-                      "corequisites": course_related_info["corequisites"],
-                      "course_description": course_related_info["course_description"],
-                      "course_link": tracks_for_course[track][year][semester][course]["course_link"]
-                    }
-                  else:
-                    more_informative_tracks_for_course[track][str(year)][str(semester)][course] = {
-                      "course_link": tracks_for_course[track][year][semester][course]["course_link"]
-                    }
-                  already_fetch_courses[tracks_for_course[track][year][semester][course]["course_link"]] = more_informative_tracks_for_course[track][str(year)][str(semester)][course]
-                else:
-                  more_informative_tracks_for_course[track][str(year)][str(semester)][course] = already_fetch_courses[tracks_for_course[track][year][semester][course]["course_link"]]
-
-              elif "course_link" not in tracks_for_course[track][year][semester][course].keys():
-                for key in tracks_for_course[track][year][semester][course].keys():
-                  key = str(key)
-                  if "course_link" in tracks_for_course[track][year][semester][course][key].keys():
-                    if tracks_for_course[track][year][semester][course][key]["course_link"] not in already_fetch_courses.keys():
-                      course_related_info = self.__formulate_api_response(
-                        api_url=tracks_for_course[track][year][semester][course][key]["course_link"]
-                      )
-                      if course_related_info:
-                        more_informative_tracks_for_course[track][str(year)][str(semester)][course][key] = {
-                          "course_code": course_related_info["course_code"],
-                          "course_name": course_related_info["course_name"],
-                          "credits": course_related_info["credits"],
-                          "contact_hours": course_related_info["contact_hours"],
-                          "prequisites": course_related_info["prequisites"],
-                          "prerequisites_description": course_related_info["prerequisites_description"],
-                          "corequisites": course_related_info["corequisites"],
-                          "course_description": course_related_info["course_description"],
-                          "course_link": tracks_for_course[track][year][semester][course][key]["course_link"]
-                        }
-                      else:
-                        more_informative_tracks_for_course[track][str(year)][str(semester)][course][key] = {
-                          "course_link": tracks_for_course[track][year][semester][course][key]["course_link"]
-                        }
-                    else:
-                      more_informative_tracks_for_course[track][str(year)][str(semester)][course][key] = already_fetch_courses[tracks_for_course[track][year][semester][course][key]["course_link"]]
-
-        self.database_handler.add_course_catalog_information(
-          course_catalog_information=more_informative_tracks_for_course[track].copy(),
+
+          if "course_link" in course_links.keys():
+            track_record.plan_entries.append(
+              PlanEntry(
+                key=course,
+                track=track,
+                year=str(year),
+                semester=str(semester),
+                course=self.__get_course(
+                  course_link=course_links["course_link"],
+                  already_fetch_courses=already_fetch_courses,
+                ),
+              )
+            )
+            continue
+
+          track_record.plan_entries.append(
+            PlanEntry(
+              key=course,
+              track=track,
+              year=str(year),
+              semester=str(semester),
+            )
+          )
+          for key in course_links.keys():
+            if "course_link" in course_links[key].keys():
+              track_record.plan_entries.append(
+                PlanEntry(
+                  key=str(key),
+                  track=track,
+                  year=str(year),
+                  semester=str(semester),
+                  group=course,
+                  course=self.__get_course(
+                    course_link=course_links[key]["course_link"],
+                    already_fetch_courses=already_fetch_courses,
+                  ),
+                )
+              )
+
+    self.database_handler.add_course_catalog_information(
+      track=track_record,
+    )
+
+    return track_record
+
+
+  def __structurize_scrapped_data(self,
+                                  tracks_for_course: dict,
+                                  prefetched_courses: dict | None = None) -> dict | bool:
+    """
+    To structurize the scrapped data into track records with complete information about the 
+    course code, course name, credits, contact hours, pre-requisites, co-requisites and 
+    course description for all the tracks.
+
+    Args:
+      - tracks_for_course (dict): The scrapped data for all the tracks
+      - prefetched_courses (dict | None): The course records already fetched, e.g. by the 
+                                          workers of a distributed crawl, keyed by the course link
+    
+    Returns:
+      - dict: The track records keyed by the track name
+    """
+
+    try:
+      already_fetch_courses = dict(prefetched_courses) if prefetched_courses else {}
+      more_informative_tracks_for_course = {}
+      self.__prefetch_courses(
+        tracks_for_course=tracks_for_course,
+        already_fetch_courses=already_fetch_courses,
+      )
+      self.__prefetch_prerequisite_closure(
+        already_fetch_courses=already_fetch_courses,
+      )
+
+      for track in tracks_for_course:
+        more_informative_tracks_for_course[track] = self.__build_track_record(
+          track=track,
+          tracks_for_course=tracks_for_course,
+          already_fetch_courses=already_fetch_courses,
         )
 
       return more_informative_tracks_for_course
     
+    except BudgetExhaustedError:
+      raise
+
     except Exception as e:
       self.logger.error(f"Error related to structurizing scrapped data: {e}, line: {e.__traceback__.tb_lineno}, in file: {__file__}")
       return False
     
 
+  def __start_run(self,
+                  course_catalog_name: str,
+                  run_id: str | None,
+                  resume: bool) -> None:
+    """
+    To start a scrape run of a course catalog, loading the courses checkpointed by the run 
+    when it is resumed.
+
+    Args:
+      - course_catalog_name (str): The name of the course catalog, used to tag the checkpoints
+      - run_id (str | None): The identifier of the scrape run, a new one is generated if not given
+      - resume (bool): Whether to skip the courses already checkpointed by the run, the latest 
+                       run of the course catalog is resumed if no run identifier is given
+    
+    Returns:
+      - None
+    """
+
+    self.course_catalog_name = course_catalog_name
+
+    if resume and run_id is None:
+      run_id = self.checkpoint_handler.get_latest_run_id(
+        program=course_catalog_name
+      )
+    self.run_id = run_id if run_id else uuid.uuid4().hex
+    self.__checkpointed_courses = self.checkpoint_handler.load_checkpointed_courses(
+      program=course_catalog_name,
+      run_id=self.run_id,
+    ) if resume else {}
+
+    self.__usage_accountant.start_run(
+      program=course_catalog_name,
+      run_id=self.run_id,
+      totals=self.checkpoint_handler.load_run_usage(
+        program=course_catalog_name,
+        run_id=self.run_id,
+      ) if resume else None,
+    )
+
+    if resume:
+      self.logger.info(
+        message=f"Resuming the run: {self.run_id} of {course_catalog_name} with {len(self.__checkpointed_courses)} checkpointed courses"
+      )
+
+
+  def get_run_usage(self) -> dict:
+    """
+    To get the Gemini usage totals of the current run.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The usage totals of the run
+    """
+
+    return self.__usage_accountant.get_totals(
+      program=self.course_catalog_name,
+      run_id=self.run_id,
+    )
+
+
+  def save_run_usage(self) -> dict:
+    """
+    To persist the Gemini usage totals of the current run along with its checkpoints.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The usage totals of the run
+    """
+
+    usage = self.get_run_usage()
+    self.checkpoint_handler.save_run_usage(
+      program=self.course_catalog_name,
+      run_id=self.run_id,
+      usage=usage,
+    )
+    self.logger.info(
+      message=f"The run: {self.run_id} of {self.course_catalog_name} made {usage['requests']} Gemini requests using {usage['total_tokens']} tokens"
+    )
+    for tier, tier_statistics in self.__course_description_segregation_model.get_tier_statistics().items():
+      if tier_statistics["attempts"]:
+        self.logger.info(
+          message=f"The model: {tier} accepted {tier_statistics['accepted']} of the {tier_statistics['attempts']} course descriptions sent to it so far ({tier_statistics['success_rate']:.0%})"
+        )
+    return usage
+
+
+  def __estimate_prerequisite_closure(self,
+                                      course_links: list,
+                                      known_courses: dict,
+                                      closure_courses_per_course: float) -> dict:
+    """
+    To estimate the prerequisites and corequisites missing from the plan grid which the run
+    would fetch, by following the requisites of the courses already known from the prefetched
+    courses, the checkpoints of the run or the courses registry, wave after wave up to the 
+    maximum depth. The requisites of the courses not known yet cannot be followed, so they are
+    projected from the missing requisites named per known listed course, or from the
+    configured share when none of the listed courses is known.
+
+    Args:
+      - course_links (list): The course links listed by the course catalog page
+      - known_courses (dict): The course records already known, keyed by the course code
+      - closure_courses_per_course (float): The missing requisites named per course, when it cannot be observed
+
+    Returns:
+      - dict: The codes of the missing requisites found and the number of the projected ones
+    """
+
+    closure = {"course_codes": [], "projected_courses": 0}
+    if not self.__prerequisite_closure_consts["enabled"]:
+      return closure
+
+    wave_course_codes = [
+      unquote(course_link[len(self.__course_description_api):]).strip()
+      for course_link in course_links
+      if course_link.startswith(self.__course_description_api)
+    ]
+    seen_course_codes = set(wave_course_codes)
+    unknown_courses = 0
+    for depth in range(self.__prerequisite_closure_consts["max_depth"]):
+      stored_courses = self.database_handler.get_courses(
+        course_codes=sorted(course_code for course_code in wave_course_codes if course_code not in known_courses),
+        fields=["course_link", "course_code", "prerequisites", "corequisites"],
+      )
+      next_course_codes, wave_known_courses = [], 0
+      for course_code in wave_course_codes:
+        course = known_courses.get(course_code)
+        if course is None and course_code in stored_courses:
+          course = Course.from_document(stored_courses[course_code])
+        if course is None or not course.is_fetched:
+          unknown_courses += 1
+          continue
+
+        wave_known_courses += 1
+        for requisite_course_code in sorted(course.requisite_course_codes - seen_course_codes):
+          seen_course_codes.add(requisite_course_code)
+          next_course_codes.append(requisite_course_code)
+
+      if depth == 0:
+        if wave_known_courses:
+          closure_courses_per_course = len(next_course_codes) / wave_known_courses
+        closure["projected_courses"] = math.ceil(unknown_courses * closure_courses_per_course)
+      closure["course_codes"] += next_course_codes
+      wave_course_codes = next_course_codes
+      if not wave_course_codes:
+        break
+
+    return closure
+
+
+  def __estimate_scrape(self,
+                        tracks_for_course: dict,
+                        run_id: str | None,
+                        resume: bool,
+                        prefetched_courses: dict | None) -> dict:
+    """
+    To estimate the work of a scrape out of the course links listed by the course catalog 
+    page alone: the courses are checked against the prefetched courses, the checkpoints of 
+    the run when it is resumed and the courses registry, the prerequisites missing from the
+    plan grid are estimated, and the Gemini calls, tokens and wall-clock time are projected
+    under the configured concurrency and rate limits. Nothing is fetched, segregated or 
+    written.
+
+    Args:
+      - tracks_for_course (dict): The scrapped data for all the tracks
+      - run_id (str | None): The identifier of the scrape run, the latest run is used if not given
+      - resume (bool): Whether the run would skip the courses already checkpointed by it
+      - prefetched_courses (dict | None): The course records already fetched, keyed by the course link
+
+    Returns:
+      - dict: The course links listed and to be fetched, the missing prerequisites, the 
+              expected HTTP fetches, Gemini calls and tokens, and the projected wall-clock
+              time in seconds
+    """
+
+    estimate_consts = ScrapeEstimateConsts().get_constants()
+    course_links = self.__collect_course_links(tracks_for_course)
+
+    if run_id is None:
+      run_id = self.checkpoint_handler.get_latest_run_id(
+        program=self.course_catalog_name
+      )
+    checkpointed_courses = self.checkpoint_handler.load_checkpointed_courses(
+      program=self.course_catalog_name,
+      run_id=run_id,
+    ) if resume and run_id else {}
+    cached_course_links = set(prefetched_courses or {}) | set(checkpointed_courses)
+    course_links_to_fetch = [course_link for course_link in course_links if course_link not in cached_course_links]
+
+    course_codes = {
+      unquote(course_link[len(self.__course_description_api):]).strip(): course_link
+      for course_link in course_links_to_fetch
+      if course_link.startswith(self.__course_description_api)
+    }
+    stored_course_codes = set(self.database_handler.get_courses(
+      course_codes=sorted(course_codes),
+      fields=["course_link"],
+    ))
+
+    known_courses = [
+      *(prefetched_courses or {}).values(),
+      *(Course.from_document(course_document) for course_document in checkpointed_courses.values()),
+    ]
+    prerequisite_closure = self.__estimate_prerequisite_closure(
+      course_links=course_links,
+      known_courses={course.course_code: course for course in known_courses if course.is_fetched},
+      closure_courses_per_course=estimate_consts["closure_courses_per_course"],
+    )
+    closure_course_links_to_fetch = [
+      course_link
+      for course_link in (
+        f"{self.__course_description_api}{course_code.strip().replace(' ', '%20')}"
+        for course_code in prerequisite_closure["course_codes"]
+      )
+      if course_link not in cached_course_links
+    ]
+    http_fetches = len(course_links_to_fetch) + len(closure_course_links_to_fetch) + prerequisite_closure["projected_courses"]
+
+    previous_usage = self.checkpoint_handler.load_run_usage(
+      program=self.course_catalog_name,
+      run_id=run_id,
+    ) if run_id else None
+    if previous_usage and previous_usage["requests"]:
+      prompt_tokens_per_call = previous_usage["prompt_tokens"] / previous_usage["requests"]
+      output_tokens_per_call = previous_usage["output_tokens"] / previous_usage["requests"]
+    else:
+      prompt_tokens_per_call = estimate_consts["prompt_tokens_per_call"]
+      output_tokens_per_call = estimate_consts["output_tokens_per_call"]
+
+    rule_based_share = estimate_consts["rule_based_share"] if self.__prerequisite_parser is not None else 0.0
+    segregation_calls = math.ceil(http_fetches * (1 - rule_based_share))
+    gemini_clients = self.__course_description_segregation_model.size
+    priming_calls = gemini_clients if segregation_calls else 0
+    gemini_calls = segregation_calls + priming_calls
+
+    http_seconds = http_fetches * estimate_consts["seconds_per_fetch"] / max(1, self.__http_client.max_concurrency)
+    gemini_latency_seconds = gemini_calls * estimate_consts["seconds_per_gemini_call"] / max(1, gemini_clients)
+    gemini_rate_limit_seconds = max(0, math.ceil(gemini_calls / max(1, gemini_clients * self.__google_gemini_consts["requests_per_window"])) - 1) * self.__google_gemini_consts["rate_limit_window_seconds"]
+
+    return {
+      "listed_course_links": len(course_links),
+      "cached_course_links": len(course_links) - len(course_links_to_fetch),
+      "stored_courses": len(stored_course_codes),
+      "new_courses": len(course_links_to_fetch) - len(stored_course_codes),
+      "closure_courses": len(prerequisite_closure["course_codes"]),
+      "projected_closure_courses": prerequisite_closure["projected_courses"],
+      "expected_http_fetches": http_fetches,
+      "expected_gemini_calls": gemini_calls,
+      "expected_prompt_tokens": round(gemini_calls * prompt_tokens_per_call),
+      "expected_output_tokens": round(gemini_calls * output_tokens_per_call),
+      "projected_seconds": round(max(http_seconds, gemini_latency_seconds, gemini_rate_limit_seconds), 1),
+      "bottleneck": "http" if http_seconds >= max(gemini_latency_seconds, gemini_rate_limit_seconds) else "gemini_rate_limit" if gemini_rate_limit_seconds >= gemini_latency_seconds else "gemini_latency",
+    }
+
+
+  def crawl_course_links(self,
+                         url_to_course_catalog: str,
+                         course_catalog_name: str) -> list:
+    """
+    To crawl the course catalog page of a course catalog and list the links of its courses,
+    without fetching the courses themselves.
+
+    Args:
+      - url_to_course_catalog (str): The URL to the course catalog page
+      - course_catalog_name (str): The name of the course catalog
+
+    Returns:
+      - list: The course links listed by the tracks of the course catalog
+    """
+
+    self.course_catalog_name = course_catalog_name
+    return self.__collect_course_links(
+      tracks_for_course=self.__scrape_course_data(
+        url_to_course_catalog=url_to_course_catalog
+      )
+    )
+
+
+  def fetch_course(self,
+                   course_link: str,
+                   course_catalog_name: str,
+                   run_id: str) -> Course | None:
+    """
+    To fetch a single course of a scrape run, reusing the course if it was already
+    checkpointed by the run.
+
+    Args:
+      - course_link (str): The link to the course description
+      - course_catalog_name (str): The name of the course catalog
+      - run_id (str): The identifier of the scrape run
+
+    Returns:
+      - Course | None: The course record, None if the course could not be fetched
+    """
+
+    if (self.course_catalog_name, self.run_id) != (course_catalog_name, run_id):
+      self.__start_run(
+        course_catalog_name=course_catalog_name,
+        run_id=run_id,
+        resume=True,
+      )
+    return self.__fetch_course_related_info(
+      api_url=course_link
+    )
+
+
   def scrape_course_catalog(self,
-                            url_to_course_catalog: str) -> dict | bool:
+                            url_to_course_catalog: str,
+                            course_catalog_name: str,
+                            run_id: str | None = None,
+                            resume: bool = False,
+                            prefetched_courses: dict | None = None,
+                            dry_run: bool = False) -> dict | bool:
     """
     To scrape the course catalog data for a particular major/minor from the NJIT website.
+    A dry run only crawls the course catalog page and estimates the work of the scrape.
 
     Args:
       - url_to_course_catalog (str): The URL to the course catalog page
+      - course_catalog_name (str): The name of the course catalog, used to tag the checkpoints
+      - run_id (str | None): The identifier of the scrape run, a new one is generated if not given
+      - resume (bool): Whether to skip the courses already checkpointed by the run, the latest 
+                       run of the course catalog is resumed if no run identifier is given
+      - prefetched_courses (dict | None): The course records already fetched, e.g. by the 
+                                          workers of a distributed crawl, keyed by the course link
+      - dry_run (bool): Whether to only estimate the work of the scrape, without any Gemini
+                        call or write
 
     Returns:
-      - dict: The course catalog data for a particular major/minor from the NJIT website
+      - dict: The course catalog data for a particular major/minor from the NJIT website, or 
+              the estimate of the scrape for a dry run
     """
     
+    if dry_run:
+      self.course_catalog_name = course_catalog_name
+      return self.__estimate_scrape(
+        tracks_for_course=self.__scrape_course_data(
+          url_to_course_catalog=url_to_course_catalog
+        ),
+        run_id=run_id,
+        resume=resume,
+        prefetched_courses=prefetched_courses,
+      )
+
     start = time()
+    self.__start_run(
+      course_catalog_name=course_catalog_name,
+      run_id=run_id,
+      resume=resume,
+    )
     
     tracks_for_course = self.__scrape_course_data(
       url_to_course_catalog=url_to_course_catalog
@@ -506,8 +1434,9 @@ class WebsiteScrapper:
     
     structured_complete_scrapped_data = self.__structurize_scrapped_data(
       tracks_for_course=tracks_for_course,
+      prefetched_courses=prefetched_courses,
     )
-    
+    self.save_run_usage()
 
     end = time()
 
@@ -525,3 +1454,192 @@ class WebsiteScrapper:
         message=f"Scraping the course catalog website with URL: {url_to_course_catalog} failed! Time taken: {time_taken}"
       )
       return False
+
+
+  def stream_course_catalog(self,
+                            url_to_course_catalog: str,
+                            course_catalog_name: str,
+                            run_id: str | None = None,
+                            resume: bool = False,
+                            prefetched_courses: dict | None = None):
+    """
+    To scrape the course catalog data of a major/minor one track at a time. The courses of a
+    track are fetched just before the track is built, and the track record is handed over as 
+    soon as it is built, so the caller can store and release it before the next track. Only
+    the course records, shared by the tracks, are kept for the whole run.
+
+    Args:
+      - url_to_course_catalog (str): The URL to the course catalog page
+      - course_catalog_name (str): The name of the course catalog, used to tag the checkpoints
+      - run_id (str | None): The identifier of the scrape run, a new one is generated if not given
+      - resume (bool): Whether to skip the courses already checkpointed by the run
+      - prefetched_courses (dict | None): The course records already fetched, keyed by the course link
+
+    Returns:
+      - Generator: The name of each track along with its track record, or False if the track failed
+    """
+
+    self.__start_run(
+      course_catalog_name=course_catalog_name,
+      run_id=run_id,
+      resume=resume,
+    )
+    tracks_for_course = self.__scrape_course_data(
+      url_to_course_catalog=url_to_course_catalog
+    )
+    already_fetch_courses = dict(prefetched_courses) if prefetched_courses else {}
+
+    for track in tracks_for_course:
+      try:
+        self.__prefetch_courses(
+          tracks_for_course={track: tracks_for_course[track]},
+          already_fetch_courses=already_fetch_courses,
+        )
+        self.__prefetch_prerequisite_closure(
+          already_fetch_courses=already_fetch_courses,
+        )
+        track_record = self.__build_track_record(
+          track=track,
+          tracks_for_course=tracks_for_course,
+          already_fetch_courses=already_fetch_courses,
+        )
+
+      except BudgetExhaustedError:
+        raise
+
+      except Exception as e:
+        self.logger.error(
+          message=f"An error '{e}' occurred while structurizing the track: {track} of {course_catalog_name}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+        )
+        track_record = False
+
+      yield track, track_record
+
+    self.save_run_usage()
+
+
+  def scrape_course_catalogs(self,
+                             course_catalogs: dict,
+                             run_id: str | None = None,
+                             resume: bool = False) -> dict:
+    """
+    To scrape the course catalogs of several programs at once. The course links of every
+    program are planned up front, so a course listed by several programs is fetched and
+    segregated exactly once, by the run of the first program listing it, and then shared by
+    every program.
+
+    Args:
+      - course_catalogs (dict): The URL to the course catalog page, keyed by the name of the course catalog
+      - run_id (str | None): The identifier of the scrape run of every program, a new one is 
+                             generated per program if not given
+      - resume (bool): Whether to skip the courses already checkpointed by the runs
+
+    Returns:
+      - dict: The track records, or False if the scrape failed, and the run identifier of each
+              program, along with the number of course links listed, planned once deduplicated,
+              fetched, reused from the checkpoints and failed, and whether the scrape stopped
+              on an exhausted Gemini budget, leaving the remaining programs unscraped
+    """
+
+    tracks_by_course_catalog = {}
+    course_links_by_course_catalog = {}
+    for course_catalog_name, url_to_course_catalog in course_catalogs.items():
+      self.course_catalog_name = course_catalog_name
+      try:
+        tracks_for_course = self.__scrape_course_data(
+          url_to_course_catalog=url_to_course_catalog
+        )
+      except Exception as e:
+        self.logger.error(
+          message=f"An error '{e}' occurred while crawling the course catalog page of {course_catalog_name}, with URL: {url_to_course_catalog}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+        )
+        continue
+      if not tracks_for_course:
+        continue
+      tracks_by_course_catalog[course_catalog_name] = tracks_for_course
+      course_links_by_course_catalog[course_catalog_name] = self.__collect_course_links(tracks_for_course)
+
+    owned_course_links = {}
+    for course_catalog_name, course_links in course_links_by_course_catalog.items():
+      for course_link in course_links:
+        owned_course_links.setdefault(course_link, course_catalog_name)
+
+    listed_course_links = sum(len(course_links) for course_links in course_links_by_course_catalog.values())
+    self.logger.info(
+      message=f"Planned {len(owned_course_links)} unique courses out of the {listed_course_links} courses listed by {len(course_links_by_course_catalog)} course catalogs"
+    )
+
+    run_ids = {}
+    shared_courses = {}
+    fetch_counts = {"fetched": 0, "resumed": 0, "failed": 0}
+    budget_exhausted = False
+    try:
+      for course_catalog_name in tracks_by_course_catalog:
+        self.__start_run(
+          course_catalog_name=course_catalog_name,
+          run_id=run_id,
+          resume=resume,
+        )
+        run_ids[course_catalog_name] = self.run_id
+        course_catalog_fetch_counts = self.__fetch_courses(
+          course_links=[
+            course_link
+            for course_link in course_links_by_course_catalog[course_catalog_name]
+            if owned_course_links[course_link] == course_catalog_name
+          ],
+          already_fetch_courses=shared_courses,
+          keep_failed_courses=True,
+        )
+        prerequisite_closure_fetch_counts = self.__prefetch_prerequisite_closure(
+          already_fetch_courses=shared_courses,
+        )
+        for outcome in fetch_counts:
+          fetch_counts[outcome] += course_catalog_fetch_counts[outcome] + prerequisite_closure_fetch_counts[outcome]
+
+    except BudgetExhaustedError as e:
+      budget_exhausted = True
+      self.logger.error(
+        message=f"The bulk scrape stopped while fetching the courses of {self.course_catalog_name}: {e}",
+      )
+
+    self.logger.info(
+      message=f"Fetched {fetch_counts['fetched']} courses, reused {fetch_counts['resumed']} checkpointed courses and failed to fetch {fetch_counts['failed']} courses for {len(tracks_by_course_catalog)} course catalogs"
+    )
+
+    scrapped_course_catalogs = {}
+    for course_catalog_name in course_catalogs:
+      if course_catalog_name not in run_ids:
+        scrapped_course_catalogs[course_catalog_name] = {"tracks": False, "run_id": None, "usage": None, "budget_exhausted": False}
+        continue
+
+      self.course_catalog_name = course_catalog_name
+      self.run_id = run_ids[course_catalog_name]
+      tracks = False
+      if not budget_exhausted:
+        try:
+          tracks = self.__structurize_scrapped_data(
+            tracks_for_course=tracks_by_course_catalog[course_catalog_name],
+            prefetched_courses=shared_courses,
+          )
+        except BudgetExhaustedError as e:
+          budget_exhausted = True
+          self.logger.error(
+            message=f"The bulk scrape stopped while structurizing the course catalog of {course_catalog_name}: {e}",
+          )
+
+      scrapped_course_catalogs[course_catalog_name] = {
+        "tracks": tracks,
+        "run_id": self.run_id,
+        "usage": self.save_run_usage(),
+        "budget_exhausted": budget_exhausted,
+      }
+
+    return {
+      "course_catalogs": scrapped_course_catalogs,
+      "listed_course_links": listed_course_links,
+      "planned_course_links": len(owned_course_links),
+      "fetched_course_links": fetch_counts["fetched"],
+      "resumed_course_links": fetch_counts["resumed"],
+      "failed_course_links": fetch_counts["failed"],
+      "budget_exhausted": budget_exhausted,
+    }
\ No newline at end of file
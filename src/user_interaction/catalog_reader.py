@@ -0,0 +1,471 @@
+import os
+import json
+import hashlib
+import threading
+from time import monotonic, perf_counter
+from consts import CatalogSnapshotConsts, ReadCacheConsts, SearchIndexConsts
+from src.scrape_data.course_records import Track
+from src.utils.cache_handler import LRUCache
+from src.utils.catalog_snapshot import CatalogSnapshot
+from src.utils.database_handler import COURSES_CATALOG_DATABASE, COURSES_REGISTRY_DATABASE, DatabaseHandler
+from src.utils.metrics_handler import metrics_handler
+from src.user_interaction.eligibility_engine import EligibilityEngine
+from src.user_interaction.search_index import SEARCHED_FIELDS, SearchIndex
+
+
+class CatalogReader:
+  """
+  A class that serves the scraped course catalogs and tracks back to the consumers. The
+  serialized responses and their ETags are kept in an in-process LRU cache, so the hot reads
+  never touch the MongoDB and the revalidations are answered without serializing again. The
+  cache follows the versions stamped on the storage by every write, so the scrapes run by
+  the CLI or the workers in other processes drop the stale responses as well.
+  """
+
+
+  def __init__(self,
+               logger) -> None:
+    self.logger = logger
+    read_cache_consts = ReadCacheConsts().get_constants()
+    self.cache = LRUCache(
+      max_entries=read_cache_consts["max_entries"],
+      ttl_seconds=read_cache_consts["ttl_seconds"],
+    )
+    self.__version_check_seconds = read_cache_consts["version_check_seconds"]
+    self.__versions = None
+    self.__versions_checked_at = None
+    self.__versions_lock = threading.Lock()
+    self.__database_handler = None
+    self.__lock = threading.Lock()
+    self.__snapshot_directory = CatalogSnapshotConsts().get_constants()["directory"]
+    self.__snapshots = {}
+    self.__search_index_consts = SearchIndexConsts().get_constants()
+    self.__search_index = None
+    self.__search_index_lock = threading.Lock()
+
+
+  def __get_database_handler(self) -> DatabaseHandler:
+    """
+    Returns the database handler, connecting to the MongoDB only on the first cache miss
+
+    Args:
+      - None
+
+    Returns:
+      - DatabaseHandler: The database handler
+    """
+
+    with self.__lock:
+      if self.__database_handler is None:
+        self.__database_handler = DatabaseHandler(
+          logger=self.logger
+        )
+      return self.__database_handler
+
+
+  def __refresh_versions(self,
+                         force: bool = False) -> None:
+    """
+    Compares the versions stamped on the storage with the ones the cache was filled from, at
+    most once every version check interval. A new version of the courses registry drops the
+    whole cache and the search index, since every program embeds the shared course records,
+    while a new version of a program drops and re-indexes only that program.
+
+    Args:
+      - force (bool): Whether to compare the versions even within the version check interval
+
+    Returns:
+      - None
+    """
+
+    with self.__versions_lock:
+      now = monotonic()
+      if not force and self.__versions_checked_at is not None and now - self.__versions_checked_at < self.__version_check_seconds:
+        return None
+      self.__versions_checked_at = now
+
+      versions = self.__get_database_handler().get_versions()
+      previous_versions, self.__versions = self.__versions, versions
+      if previous_versions is None or versions == previous_versions:
+        return None
+
+      if versions.get(COURSES_REGISTRY_DATABASE) != previous_versions.get(COURSES_REGISTRY_DATABASE):
+        self.cache.clear()
+        with self.__search_index_lock:
+          self.__search_index = None
+        return None
+
+      changed_programs = [
+        program
+        for program in versions.keys() | previous_versions.keys()
+        if versions.get(program) != previous_versions.get(program)
+      ]
+      for program in changed_programs:
+        self.cache.invalidate(
+          program=program
+        )
+      with self.__search_index_lock:
+        if self.__search_index is not None:
+          for program in changed_programs:
+            self.__index_program(self.__search_index, program)
+      return None
+
+
+  def __build_response(self,
+                       payload) -> dict:
+    """
+    Serializes a payload once and computes its ETag from the serialized bytes
+
+    Args:
+      - payload: The documents to be returned
+
+    Returns:
+      - dict: The serialized body and the ETag of the payload
+    """
+
+    body = json.dumps(
+      payload,
+      default=str,
+      separators=(",", ":"),
+    ).encode("utf-8")
+    return {
+      "body": body,
+      "etag": f'"{hashlib.sha1(body).hexdigest()}"',
+    }
+
+
+  def __read_through(self,
+                     key: tuple,
+                     fetch) -> dict | None:
+    """
+    Returns the cached response for a key, fetching and caching it on a miss
+
+    Args:
+      - key (tuple): The cache key, its first element being the program
+      - fetch: A callable returning the documents from the database, None if they do not exist
+
+    Returns:
+      - dict | None: The serialized body and the ETag, None if the documents do not exist
+    """
+
+    self.__refresh_versions()
+    response = self.cache.get(key)
+    metrics_handler.increment(
+      name="scraper_cache_requests_total",
+      labels={"cache": "read_api", "result": "miss" if response is None else "hit", "program": key[0]},
+    )
+    if response is not None:
+      return response
+
+    payload = fetch()
+    if not payload:
+      return None
+
+    response = self.__build_response(payload)
+    self.cache.set(key, response)
+    return response
+
+
+  def get_course_catalog(self,
+                         course_catalog_name: str,
+                         tracks: list | None = None) -> dict | None:
+    """
+    Returns the course catalog of a program, one document per track
+
+    Args:
+      - course_catalog_name (str): The name of the program
+      - tracks (list | None): The tracks to be returned, all the tracks if not given
+
+    Returns:
+      - dict | None: The serialized body and the ETag, None if the program was never scraped
+    """
+
+    course_catalog_name = course_catalog_name.replace(" ", "_").lower()
+    tracks = sorted(tracks) if tracks else None
+    return self.__read_through(
+      key=(course_catalog_name, "course_catalog", tuple(tracks or ())),
+      fetch=lambda: self.__get_database_handler().get_course_catalog(
+        course_name=course_catalog_name,
+        tracks=tracks,
+      ),
+    )
+
+
+  def get_track(self,
+                course_catalog_name: str,
+                track: str,
+                courses: list | None = None) -> dict | None:
+    """
+    Returns the complete track information of a track of a program
+
+    Args:
+      - course_catalog_name (str): The name of the program
+      - track (str): The track to be returned
+      - courses (list | None): The course codes to be returned, all the courses if not given
+
+    Returns:
+      - dict | None: The serialized body and the ETag, None if the track does not exist
+    """
+
+    course_catalog_name = course_catalog_name.replace(" ", "_").lower()
+    courses = sorted(courses) if courses else None
+    return self.__read_through(
+      key=(course_catalog_name, "track", track, tuple(courses or ())),
+      fetch=lambda: self.__get_database_handler().get_track_information(
+        course_name=course_catalog_name,
+        track=track,
+        courses=courses,
+      ),
+    )
+
+
+  def get_course(self,
+                 course_catalog_name: str,
+                 course_code: str,
+                 fields: list | None = None) -> dict | None:
+    """
+    Returns the information of a single course of a program
+
+    Args:
+      - course_catalog_name (str): The name of the program
+      - course_code (str): The code of the course to be returned
+      - fields (list | None): The fields of the course to be returned, all the fields if not given
+
+    Returns:
+      - dict | None: The serialized body and the ETag, None if the course does not exist
+    """
+
+    course_catalog_name = course_catalog_name.replace(" ", "_").lower()
+    fields = sorted(fields) if fields else None
+    return self.__read_through(
+      key=(course_catalog_name, "course", course_code, tuple(fields or ())),
+      fetch=lambda: self.__get_database_handler().get_course_information(
+        course_name=course_catalog_name,
+        course_code=course_code,
+        fields=fields,
+      ),
+    )
+
+
+  def get_eligibility_engine(self,
+                             course_catalog_name: str,
+                             track: str) -> EligibilityEngine | None:
+    """
+    Returns the eligibility engine of a track, compiled once and kept in the cache alongside
+    the responses of the program so that it is dropped whenever the program is scraped again
+
+    Args:
+      - course_catalog_name (str): The name of the program
+      - track (str): The track whose engine is to be returned
+
+    Returns:
+      - EligibilityEngine | None: The compiled engine, None if the track does not exist
+    """
+
+    course_catalog_name = course_catalog_name.replace(" ", "_").lower()
+    key = (course_catalog_name, "eligibility_engine", track)
+    self.__refresh_versions()
+    eligibility_engine = self.cache.get(key)
+    metrics_handler.increment(
+      name="scraper_cache_requests_total",
+      labels={"cache": "eligibility_engine", "result": "miss" if eligibility_engine is None else "hit", "program": course_catalog_name},
+    )
+    if eligibility_engine is not None:
+      return eligibility_engine
+
+    track_information = self.__get_database_handler().get_track_information(
+      course_name=course_catalog_name,
+      track=track,
+    )
+    if not track_information:
+      return None
+
+    eligibility_engine = EligibilityEngine.from_track_information(
+      track_information=track_information
+    )
+    self.cache.set(key, eligibility_engine)
+    return eligibility_engine
+
+
+  def get_catalog_snapshot(self,
+                           course_catalog_name: str) -> CatalogSnapshot | None:
+    """
+    Returns the memory-mapped snapshot of a program. The snapshot file is checked on every
+    call, so a snapshot swapped in by a new scrape is mapped on the next call while the 
+    callers still holding the previous one keep reading it undisturbed.
+
+    Args:
+      - course_catalog_name (str): The name of the program
+
+    Returns:
+      - CatalogSnapshot | None: The snapshot, None if the program has no snapshot
+    """
+
+    course_catalog_name = course_catalog_name.replace(" ", "_").lower()
+    path = os.path.join(self.__snapshot_directory, f"{course_catalog_name}.snapshot")
+    try:
+      file_status = os.stat(path)
+    except FileNotFoundError:
+      return None
+
+    with self.__lock:
+      snapshot = self.__snapshots.get(course_catalog_name)
+      if snapshot is None or snapshot.file_id != (file_status.st_ino, file_status.st_mtime_ns):
+        try:
+          snapshot = CatalogSnapshot(
+            path=path
+          )
+        except Exception as e:
+          self.logger.error(
+            message=f"An error '{e}' occurred while mapping the snapshot of {course_catalog_name}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+          )
+          return snapshot
+        self.__snapshots[course_catalog_name] = snapshot
+        metrics_handler.increment(
+          name="scraper_snapshot_loads_total",
+          labels={"program": course_catalog_name},
+        )
+      return snapshot
+
+
+  def __index_program(self,
+                      search_index: SearchIndex,
+                      course_catalog_name: str) -> None:
+    """
+    Indexes the courses listed by the tracks of a program, their names and descriptions
+    being read from the courses registry, or from the catalog documents predating it
+
+    Args:
+      - search_index (SearchIndex): The search index
+      - course_catalog_name (str): The name of the program
+
+    Returns:
+      - None
+    """
+
+    try:
+      database_handler = self.__get_database_handler()
+      listed_courses = {}
+      for document in database_handler.storage_backend.find(
+        database=COURSES_CATALOG_DATABASE,
+        collection=course_catalog_name,
+      ):
+        track = Track.from_catalog_document(
+          track_name=document["_id"],
+          document=document,
+        )
+        for plan_entry in track.plan_entries:
+          if plan_entry.course is not None and plan_entry.course.course_code:
+            listed_courses[plan_entry.course.course_code] = plan_entry.course
+
+      registry_courses = database_handler.get_courses(
+        course_codes=sorted(listed_courses),
+        fields=list(SEARCHED_FIELDS),
+      )
+      search_index.index_program(
+        program=course_catalog_name,
+        courses={
+          course_code: registry_courses.get(course_code) or {field: getattr(course, field) for field in SEARCHED_FIELDS}
+          for course_code, course in listed_courses.items()
+        },
+      )
+      metrics_handler.increment(
+        name="scraper_search_index_updates_total",
+        labels={"program": course_catalog_name},
+      )
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while indexing the courses of {course_catalog_name} for the search. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+
+
+  def get_search_index(self) -> SearchIndex:
+    """
+    Returns the full-text search index of the courses, built over every scraped program on
+    the first call and then kept up to date one program at a time as they are scraped again
+
+    Args:
+      - None
+
+    Returns:
+      - SearchIndex: The search index
+    """
+
+    with self.__search_index_lock:
+      if self.__search_index is None:
+        search_index = SearchIndex(
+          k1=self.__search_index_consts["k1"],
+          b=self.__search_index_consts["b"],
+          course_name_weight=self.__search_index_consts["course_name_weight"],
+        )
+        for database, collection in self.__get_database_handler().storage_backend.list_collections():
+          if database == COURSES_CATALOG_DATABASE:
+            self.__index_program(search_index, collection)
+        self.__search_index = search_index
+      return self.__search_index
+
+
+  def search(self,
+             query: str,
+             course_catalog_name: str | None = None,
+             limit: int | None = None) -> dict:
+    """
+    Searches the courses by keywords or by the beginning of their course code
+
+    Args:
+      - query (str): The keywords, or the beginning of a course code
+      - course_catalog_name (str | None): The program whose courses are searched, all the programs if not given
+      - limit (int | None): The maximum number of courses to be returned, the configured default if not given
+
+    Returns:
+      - dict: The best matching courses and the time taken to find them
+    """
+
+    self.__refresh_versions()
+    search_index = self.get_search_index()
+    course_catalog_name = course_catalog_name.replace(" ", "_").lower() if course_catalog_name else None
+    limit = min(limit or self.__search_index_consts["default_limit"], self.__search_index_consts["max_limit"])
+
+    start = perf_counter()
+    results = search_index.search(
+      query=query,
+      program=course_catalog_name,
+      limit=limit,
+    )
+    took_seconds = perf_counter() - start
+    metrics_handler.observe(
+      name="scraper_search_duration_seconds",
+      value=took_seconds,
+      labels={"program": course_catalog_name or "all"},
+    )
+
+    return {
+      "query": query,
+      "indexed_courses": search_index.size,
+      "took_ms": round(took_seconds * 1000, 3),
+      "results": results,
+    }
+
+
+  def invalidate(self,
+                 course_catalog_name: str) -> None:
+    """
+    Drops the cached responses made stale by a scrape run in this process right away, rather
+    than on the next version check. The courses registry being shared, a scrape that updated
+    any course drops the responses of every program.
+
+    Args:
+      - course_catalog_name (str): The name of the program
+
+    Returns:
+      - None
+    """
+
+    self.__refresh_versions(
+      force=True
+    )
+    if not self.__versions:
+      self.cache.clear()
+      with self.__search_index_lock:
+        self.__search_index = None
\ No newline at end of file
@@ -0,0 +1,381 @@
+MAX_CLAUSES_PER_COURSE = 512
+
+
+def requirement_to_dnf(requirement: list | None,
+                       truncate: bool = True) -> list | None:
+  """
+  Converts a nested prerequisite list into its disjunctive normal form. The top level list is
+  a conjunction whose elements are either a course code or a group of alternatives, and an
+  alternative is either a course code or a list of course codes required together. Past
+  MAX_CLAUSES_PER_COURSE clauses, only the shortest clauses are kept, or nothing at all.
+
+  Args:
+    - requirement (list | None): The nested prerequisite list of a course
+    - truncate (bool): Whether to keep the shortest clauses of an oversized form, rather than
+                       returning None
+
+  Returns:
+    - list | None: The clauses, each a frozenset of the course codes satisfying the requirement
+                   together, None if there are too many clauses and they are not truncated
+  """
+
+  def flatten(alternative) -> frozenset:
+    if isinstance(alternative, str):
+      return frozenset([alternative])
+    return frozenset(
+      course_code
+      for item in alternative
+      for course_code in flatten(item)
+    )
+
+  clauses = [frozenset()]
+  for element in requirement or []:
+    alternatives = [frozenset([element])] if isinstance(element, str) else [flatten(alternative) for alternative in element]
+    alternatives = [alternative for alternative in alternatives if alternative]
+    if not alternatives:
+      continue
+
+    clauses = list({clause | alternative for clause in clauses for alternative in alternatives})
+    clauses = [
+      clause
+      for clause in clauses
+      if not any(other < clause for other in clauses)
+    ]
+    if len(clauses) > MAX_CLAUSES_PER_COURSE:
+      if not truncate:
+        return None
+      clauses = sorted(clauses, key=len)[:MAX_CLAUSES_PER_COURSE]
+
+  return clauses
+
+
+def iterate_requirement_course_codes(requirement: list | None):
+  """
+  Iterates over every course code of a nested prerequisite list
+  """
+
+  for element in requirement or []:
+    if isinstance(element, str):
+      yield element
+    else:
+      yield from iterate_requirement_course_codes(element)
+
+
+def compile_requirement(requirement: list | None,
+                        course_ids: dict) -> tuple:
+  """
+  Compiles a nested prerequisite list into a tree of 'and' and 'or' nodes over course IDs,
+  evaluated directly for the courses whose disjunctive normal form has too many clauses
+
+  Args:
+    - requirement (list | None): The nested prerequisite list of a course
+    - course_ids (dict): The integer ID of every course code
+
+  Returns:
+    - tuple: The root 'and' node of the requirement
+  """
+
+  def compile_alternative(alternative):
+    if isinstance(alternative, str):
+      return course_ids[alternative]
+    return ("and", [course_ids[course_code] for course_code in iterate_requirement_course_codes(alternative)])
+
+  return ("and", [
+    course_ids[element] if isinstance(element, str) else ("or", [compile_alternative(alternative) for alternative in element if alternative])
+    for element in requirement or []
+    if isinstance(element, str) or any(element)
+  ])
+
+
+def evaluate_requirement(node,
+                         course_bits,
+                         all_bits: int) -> int:
+  """
+  Evaluates a compiled requirement over bitsets, either a single bit telling whether a
+  student completed each course or the cohort sliced one bitset per course
+
+  Args:
+    - node: The compiled requirement, a course ID or an 'and' or 'or' node
+    - course_bits: A callable returning the bits of a course ID
+    - all_bits (int): The bitset with every bit set, the result of an empty 'and'
+
+  Returns:
+    - int: The bits for which the requirement is satisfied
+  """
+
+  if isinstance(node, int):
+    return course_bits(node)
+
+  operator, children = node
+  if operator == "and":
+    bits = all_bits
+    for child in children:
+      bits &= evaluate_requirement(child, course_bits, all_bits)
+      if not bits:
+        break
+    return bits
+
+  bits = 0
+  for child in children:
+    bits |= evaluate_requirement(child, course_bits, all_bits)
+    if bits == all_bits:
+      break
+  return bits
+
+
+class EligibilityEngine:
+  """
+  An engine answering which courses of a catalog a student may take next. The prerequisites
+  of every course are compiled once into clauses of a disjunctive normal form over integer
+  course IDs, each clause being a bitmask, so a student is checked with a few bitwise ANDs.
+  A cohort is checked all at once by slicing it per course, one bit per student. The few
+  courses whose normal form would have more than MAX_CLAUSES_PER_COURSE clauses keep their
+  nested requirement instead, evaluated directly over the same bitsets.
+  """
+
+
+  def __init__(self,
+               prerequisites: dict) -> None:
+    self.course_codes = []
+    self.course_ids = {}
+    self.catalog_courses = list(prerequisites.keys())
+
+    for course_code, requirement in prerequisites.items():
+      self.__get_course_id(course_code)
+      for required_course_code in iterate_requirement_course_codes(requirement):
+        self.__get_course_id(required_course_code)
+
+    self.clause_masks = {}
+    self.clause_course_ids = {}
+    self.nested_requirements = {}
+    for course_code, requirement in prerequisites.items():
+      clauses = requirement_to_dnf(requirement, truncate=False)
+      if clauses is None:
+        self.nested_requirements[course_code] = compile_requirement(requirement, self.course_ids)
+        continue
+
+      self.clause_masks[course_code] = [
+        sum(1 << self.course_ids[required_course_code] for required_course_code in clause)
+        for clause in clauses
+      ]
+      self.clause_course_ids[course_code] = [
+        [self.course_ids[required_course_code] for required_course_code in clause]
+        for clause in clauses
+      ]
+
+
+  @classmethod
+  def from_track_information(cls,
+                             track_information: dict):
+    """
+    Compiles the engine for a track from its stored track information
+
+    Args:
+      - track_information (dict): The track information, keyed by the course code
+
+    Returns:
+      - EligibilityEngine: The compiled engine
+    """
+
+    return cls(
+      prerequisites={
+        entry["course_code"]: entry.get("prerequisites") or []
+        for entry in track_information.values()
+        if isinstance(entry, dict) and entry.get("course_code")
+      }
+    )
+
+
+  def __get_course_id(self,
+                      course_code: str) -> int:
+    """
+    Returns the integer ID of a course, assigning the next one the first time it is seen
+    """
+
+    if course_code not in self.course_ids:
+      self.course_ids[course_code] = len(self.course_codes)
+      self.course_codes.append(course_code)
+    return self.course_ids[course_code]
+
+
+  def encode(self,
+             completed_courses) -> int:
+    """
+    Encodes the completed courses of a student into a bitset over the course IDs, ignoring
+    the courses unknown to the catalog
+
+    Args:
+      - completed_courses: The codes of the courses the student completed
+
+    Returns:
+      - int: The bitset of the completed courses
+    """
+
+    return sum(
+      1 << self.course_ids[course_code]
+      for course_code in set(completed_courses)
+      if course_code in self.course_ids
+    )
+
+
+  def is_eligible(self,
+                  course_code: str,
+                  completed_courses_bitset: int) -> bool:
+    """
+    Returns whether a course, not completed yet, has its prerequisites satisfied
+
+    Args:
+      - course_code (str): The code of the course
+      - completed_courses_bitset (int): The bitset of the completed courses of the student
+
+    Returns:
+      - bool: True if the student may take the course
+    """
+
+    if completed_courses_bitset >> self.course_ids[course_code] & 1:
+      return False
+    if course_code in self.nested_requirements:
+      return evaluate_requirement(
+        node=self.nested_requirements[course_code],
+        course_bits=lambda course_id: completed_courses_bitset >> course_id & 1,
+        all_bits=1,
+      ) == 1
+    return any(
+      completed_courses_bitset & clause_mask == clause_mask
+      for clause_mask in self.clause_masks[course_code]
+    )
+
+
+  def eligible_courses(self,
+                       completed_courses) -> list:
+    """
+    Returns every course of the catalog a student may take next
+
+    Args:
+      - completed_courses: The codes of the courses the student completed
+
+    Returns:
+      - list: The codes of the courses the student may take next, in catalog order
+    """
+
+    completed_courses_bitset = self.encode(completed_courses)
+    return [
+      course_code
+      for course_code in self.catalog_courses
+      if self.is_eligible(course_code, completed_courses_bitset)
+    ]
+
+
+  def slice_cohort(self,
+                   cohort: list) -> list:
+    """
+    Slices a cohort per course into a bitset with one bit per student, set when the student
+    completed the course
+
+    Args:
+      - cohort (list): The completed courses of every student
+
+    Returns:
+      - list: The bitset of the students who completed each course, indexed by the course ID
+    """
+
+    slice_size = (len(cohort) + 7) // 8
+    student_slices = [None] * len(self.course_codes)
+    for student, completed_courses in enumerate(cohort):
+      byte_index, bit = student >> 3, 1 << (student & 7)
+      for course_code in completed_courses:
+        course_id = self.course_ids.get(course_code)
+        if course_id is None:
+          continue
+        if student_slices[course_id] is None:
+          student_slices[course_id] = bytearray(slice_size)
+        student_slices[course_id][byte_index] |= bit
+
+    return [
+      int.from_bytes(student_slice, "little") if student_slice is not None else 0
+      for student_slice in student_slices
+    ]
+
+
+  def eligible_students_by_course(self,
+                                  cohort: list) -> dict:
+    """
+    Checks a whole cohort at once. The cohort is sliced per course into a bitset with one bit
+    per student, so every clause is evaluated for every student by a single AND per course.
+
+    Args:
+      - cohort (list): The completed courses of every student
+
+    Returns:
+      - dict: The bitset of the students who may take each course, keyed by the course code
+    """
+
+    return self.eligible_students_by_slices(
+      student_slices=self.slice_cohort(cohort),
+      cohort_size=len(cohort),
+    )
+
+
+  def eligible_students_by_slices(self,
+                                  student_slices: list,
+                                  cohort_size: int) -> dict:
+    """
+    Checks a cohort already sliced per course, e.g. kept sliced between the checks
+
+    Args:
+      - student_slices (list): The bitset of the students who completed each course, indexed by the course ID
+      - cohort_size (int): The number of students of the cohort
+
+    Returns:
+      - dict: The bitset of the students who may take each course, keyed by the course code
+    """
+
+    all_students = (1 << cohort_size) - 1
+    eligible_students = {}
+    for course_code in self.catalog_courses:
+      if course_code in self.nested_requirements:
+        satisfied_students = evaluate_requirement(
+          node=self.nested_requirements[course_code],
+          course_bits=student_slices.__getitem__,
+          all_bits=all_students,
+        )
+        eligible_students[course_code] = satisfied_students & ~student_slices[self.course_ids[course_code]]
+        continue
+
+      satisfied_students = 0
+      for clause in self.clause_course_ids[course_code]:
+        clause_students = all_students
+        for course_id in clause:
+          clause_students &= student_slices[course_id]
+          if not clause_students:
+            break
+        satisfied_students |= clause_students
+        if satisfied_students == all_students:
+          break
+
+      eligible_students[course_code] = satisfied_students & ~student_slices[self.course_ids[course_code]]
+
+    return eligible_students
+
+
+  def eligible_courses_for_cohort(self,
+                                  cohort: list) -> list:
+    """
+    Returns every course each student of a cohort may take next
+
+    Args:
+      - cohort (list): The completed courses of every student
+
+    Returns:
+      - list: The codes of the courses each student may take next, in the order of the cohort
+    """
+
+    eligible_courses = [[] for _ in cohort]
+    for course_code, students in self.eligible_students_by_course(cohort).items():
+      students_bits = bin(students)[:1:-1]
+      student = students_bits.find("1")
+      while student != -1:
+        eligible_courses[student].append(course_code)
+        student = students_bits.find("1", student + 1)
+
+    return eligible_courses
\ No newline at end of file
@@ -0,0 +1,277 @@
+import re
+import math
+import heapq
+import bisect
+import threading
+from collections import Counter
+
+
+COURSE_CODE_PATTERN = re.compile(r"\b([A-Za-z]{2,4})\s?(\d{3}[A-Za-z]?)\b")
+COURSE_CODE_PREFIX_PATTERN = re.compile(r"[A-Z]{2,4}\d{0,3}[A-Z]?")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+SEARCHED_FIELDS = ("course_name", "course_description", "prerequisites_description")
+
+
+def normalize_course_code(course_code: str) -> str:
+  """
+  Normalizes a course code or a prefix of one, e.g. 'cs 28' into 'CS28'
+  """
+
+  return re.sub(r"\s+", "", course_code).upper()
+
+
+def tokenize(text: str | None) -> list:
+  """
+  Splits a text into lowercase terms, every course code mentioned in it, e.g. 'CS 280',
+  being kept as a single term, e.g. 'cs280', rather than split into its subject and number
+
+  Args:
+    - text (str | None): The text to be tokenized
+
+  Returns:
+    - list: The terms of the text, in order
+  """
+
+  if not text:
+    return []
+
+  course_code_terms = [(subject + number).lower() for subject, number in COURSE_CODE_PATTERN.findall(text)]
+  return course_code_terms + TOKEN_PATTERN.findall(COURSE_CODE_PATTERN.sub(" ", text).lower())
+
+
+class SearchIndex:
+  """
+  An in-process inverted index over the names, descriptions and prerequisites descriptions
+  of the courses, ranking the matches with BM25. A query shaped like a course code, or the
+  beginning of one, also matches the course codes by prefix, those matches ranking first.
+  The courses are indexed per program, so a program scraped again is re-indexed on its own,
+  and a course listed by several programs is indexed once.
+  """
+
+
+  def __init__(self,
+               k1: float,
+               b: float,
+               course_name_weight: int) -> None:
+    self.k1 = k1
+    self.b = b
+    self.course_name_weight = course_name_weight
+    self.__postings = {}
+    self.__documents = {}
+    self.__program_courses = {}
+    self.__course_codes = []
+    self.__total_length = 0
+    self.__lock = threading.RLock()
+
+
+  @property
+  def size(self) -> int:
+    """
+    The number of courses indexed
+    """
+
+    return len(self.__documents)
+
+
+  @property
+  def programs(self) -> list:
+    """
+    The programs indexed
+    """
+
+    with self.__lock:
+      return sorted(self.__program_courses)
+
+
+  def __remove_course(self,
+                      course_code: str) -> None:
+    """
+    Removes a course from the postings and from the course codes, keeping its programs
+    """
+
+    document = self.__documents.get(course_code)
+    if document is None:
+      return
+
+    for term in document["term_frequencies"]:
+      postings = self.__postings[term]
+      postings.pop(course_code, None)
+      if not postings:
+        del self.__postings[term]
+    self.__total_length -= document["length"]
+    document["term_frequencies"], document["length"] = {}, 0
+
+    normalized_course_code = normalize_course_code(course_code)
+    position = bisect.bisect_left(self.__course_codes, (normalized_course_code, course_code))
+    if position < len(self.__course_codes) and self.__course_codes[position] == (normalized_course_code, course_code):
+      del self.__course_codes[position]
+
+
+  def __add_course(self,
+                   course_code: str,
+                   course: dict) -> None:
+    """
+    Adds, or replaces, the terms of a course
+    """
+
+    self.__remove_course(course_code)
+
+    term_frequencies = Counter()
+    for field in SEARCHED_FIELDS:
+      weight = self.course_name_weight if field == "course_name" else 1
+      term_frequencies.update(tokenize(course.get(field)) * weight)
+
+    document = self.__documents.setdefault(course_code, {"programs": set()})
+    document["course_name"] = course.get("course_name")
+    document["term_frequencies"] = term_frequencies
+    document["length"] = sum(term_frequencies.values())
+    self.__total_length += document["length"]
+    for term, term_frequency in term_frequencies.items():
+      self.__postings.setdefault(term, {})[course_code] = term_frequency
+
+    bisect.insort(self.__course_codes, (normalize_course_code(course_code), course_code))
+
+
+  def __drop_program_course(self,
+                            program: str,
+                            course_code: str) -> None:
+    """
+    Detaches a course from a program, removing it once no program lists it
+    """
+
+    document = self.__documents.get(course_code)
+    if document is None:
+      return
+
+    document["programs"].discard(program)
+    if not document["programs"]:
+      self.__remove_course(course_code)
+      del self.__documents[course_code]
+
+
+  def index_program(self,
+                    program: str,
+                    courses: dict) -> None:
+    """
+    Indexes the courses of a program, replacing those indexed for it before. The courses no
+    longer listed by the program are dropped, unless another program still lists them.
+
+    Args:
+      - program (str): The name of the program
+      - courses (dict): The course records keyed by the course code
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      for course_code in self.__program_courses.get(program, set()) - set(courses):
+        self.__drop_program_course(program, course_code)
+
+      for course_code, course in courses.items():
+        self.__add_course(course_code, course)
+        self.__documents[course_code]["programs"].add(program)
+      self.__program_courses[program] = set(courses)
+
+
+  def remove_program(self,
+                     program: str) -> None:
+    """
+    Drops the courses of a program, unless another program still lists them
+
+    Args:
+      - program (str): The name of the program
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      for course_code in self.__program_courses.pop(program, set()):
+        self.__drop_program_course(program, course_code)
+
+
+  def __match_course_codes(self,
+                           query: str) -> list:
+    """
+    Returns the course codes starting with the query, if it is shaped like a course code
+    """
+
+    prefix = normalize_course_code(query)
+    if not COURSE_CODE_PREFIX_PATTERN.fullmatch(prefix):
+      return []
+
+    course_codes = []
+    position = bisect.bisect_left(self.__course_codes, (prefix, ""))
+    while position < len(self.__course_codes) and self.__course_codes[position][0].startswith(prefix):
+      course_codes.append(self.__course_codes[position][1])
+      position += 1
+    return course_codes
+
+
+  def search(self,
+             query: str,
+             program: str | None = None,
+             limit: int = 10) -> list:
+    """
+    Searches the indexed courses
+
+    Args:
+      - query (str): The keywords, or the beginning of a course code
+      - program (str | None): The program whose courses are searched, all the programs if not given
+      - limit (int): The maximum number of courses to be returned
+
+    Returns:
+      - list: The best matching courses, with their BM25 score and whether they matched by course code
+    """
+
+    with self.__lock:
+      if not self.__documents:
+        return []
+
+      document_count = len(self.__documents)
+      average_length = self.__total_length / document_count or 1
+      scores = {}
+      for term in set(tokenize(query)):
+        postings = self.__postings.get(term)
+        if not postings:
+          continue
+
+        inverse_document_frequency = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+        for course_code, term_frequency in postings.items():
+          length_normalization = self.k1 * (1 - self.b + self.b * self.__documents[course_code]["length"] / average_length)
+          scores[course_code] = scores.get(course_code, 0.0) + inverse_document_frequency * term_frequency * (self.k1 + 1) / (term_frequency + length_normalization)
+
+      normalized_query = normalize_course_code(query)
+      code_matches = {
+        course_code: normalize_course_code(course_code) == normalized_query
+        for course_code in self.__match_course_codes(query)
+      }
+
+      candidates = [
+        course_code
+        for course_code in set(scores) | set(code_matches)
+        if program is None or program in self.__documents[course_code]["programs"]
+      ]
+      best_course_codes = heapq.nsmallest(
+        limit,
+        candidates,
+        key=lambda course_code: (
+          not code_matches.get(course_code, False),
+          course_code not in code_matches,
+          -scores.get(course_code, 0.0),
+          len(course_code),
+          course_code,
+        ),
+      )
+
+      return [
+        {
+          "course_code": course_code,
+          "course_name": self.__documents[course_code]["course_name"],
+          "score": round(scores.get(course_code, 0.0), 4),
+          "matched_course_code": course_code in code_matches,
+          "programs": sorted(self.__documents[course_code]["programs"]),
+        }
+        for course_code in best_course_codes
+      ]
\ No newline at end of file
@@ -0,0 +1,309 @@
+import re
+import heapq
+from collections import deque
+from src.user_interaction.eligibility_engine import requirement_to_dnf
+
+
+def parse_year_and_semester(year_and_semester: str,
+                            semesters_per_year: int = 2) -> tuple:
+  """
+  Parses a year and semester such as 'year_2_semester_1' or 'Year 2, Semester 1'
+
+  Args:
+    - year_and_semester (str): The year and semester
+    - semesters_per_year (int): The number of semesters in a year
+
+  Returns:
+    - tuple: The year and the semester, raising a ValueError if they could not be parsed
+  """
+
+  numbers = [int(number) for number in re.findall(r"\d+", year_and_semester or "")]
+  if len(numbers) != 2 or numbers[0] < 1 or not 1 <= numbers[1] <= semesters_per_year:
+    raise ValueError(f"'{year_and_semester}' is not a year and semester such as 'year_2_semester_1'")
+  return numbers[0], numbers[1]
+
+
+def find_strongly_connected_components(nodes: list,
+                                       edges: dict) -> list:
+  """
+  Finds the strongly connected components of a directed graph with Tarjan's algorithm, 
+  iteratively so that long chains of courses do not hit the recursion limit
+
+  Args:
+    - nodes (list): The nodes of the graph
+    - edges (dict): The nodes each node points to, keyed by the node
+
+  Returns:
+    - list: The components, each a sorted list of nodes
+  """
+
+  index, lowlink, on_stack, stack, components = {}, {}, set(), [], []
+  for root in nodes:
+    if root in index:
+      continue
+
+    work = [(root, iter(sorted(edges.get(root, ()))))]
+    index[root] = lowlink[root] = len(index)
+    stack.append(root)
+    on_stack.add(root)
+    while work:
+      node, neighbours = work[-1]
+      for neighbour in neighbours:
+        if neighbour not in index:
+          index[neighbour] = lowlink[neighbour] = len(index)
+          stack.append(neighbour)
+          on_stack.add(neighbour)
+          work.append((neighbour, iter(sorted(edges.get(neighbour, ())))))
+          break
+        if neighbour in on_stack:
+          lowlink[node] = min(lowlink[node], index[neighbour])
+      else:
+        work.pop()
+        if work:
+          lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[node])
+        if lowlink[node] == index[node]:
+          component = []
+          while True:
+            member = stack.pop()
+            on_stack.discard(member)
+            component.append(member)
+            if member == node:
+              break
+          components.append(sorted(component))
+
+  return components
+
+
+class SemesterPlanner:
+  """
+  A scheduler of the remaining courses of a track. The prerequisites of every course are
+  resolved against the completed courses, the earliest feasible semester of every course is
+  found by topological layering, and the courses are then placed semester by semester under
+  a credit cap, the courses heading the longest chains of dependent courses first. Courses
+  which are corequisites of each other, e.g. a lecture and its lab, are scheduled as a single
+  unit placed in one semester, only the cycles through a prerequisite being circular.
+  """
+
+
+  def __init__(self,
+               track_information: dict,
+               credit_cap: int,
+               semesters_per_year: int = 2) -> None:
+    self.credit_cap = credit_cap
+    self.semesters_per_year = semesters_per_year
+    self.courses = {
+      entry["course_code"]: entry
+      for entry in track_information.values()
+      if isinstance(entry, dict) and entry.get("course_code")
+    }
+
+
+  def __catalog_position(self,
+                         course_code: str) -> tuple:
+    """
+    Returns the year and semester in which the catalog lists a course
+    """
+
+    entry = self.courses[course_code]
+    try:
+      return int(entry.get("year")), int(entry.get("semester"))
+    except (TypeError, ValueError):
+      return 99, 99
+
+
+  def __credits(self,
+                course_code: str) -> int:
+    """
+    Returns the credits of a course, 0 if they are unknown
+    """
+
+    credits = self.courses[course_code].get("credits")
+    return credits if isinstance(credits, int) else 0
+
+
+  def __resolve_requirements(self,
+                             remaining_courses: set,
+                             completed_courses: set) -> tuple:
+    """
+    Picks, for every remaining course, the clause of its prerequisites needing the fewest
+    remaining courses, and the remaining corequisites which have to be taken the same
+    semester at the latest
+
+    Args:
+      - remaining_courses (set): The codes of the courses still to be taken
+      - completed_courses (set): The codes of the completed courses
+
+    Returns:
+      - tuple: The prerequisites and corequisites among the remaining courses keyed by the
+               course code, and the courses whose prerequisites can never be satisfied
+    """
+
+    prerequisites, corequisites, blocked_courses = {}, {}, {}
+    for course_code in remaining_courses:
+      feasible_clauses = [
+        clause - completed_courses
+        for clause in requirement_to_dnf(self.courses[course_code].get("prerequisites"))
+        if clause - completed_courses <= remaining_courses
+      ]
+      if not feasible_clauses:
+        blocked_courses[course_code] = "prerequisites not offered by the track"
+        continue
+
+      prerequisites[course_code] = min(feasible_clauses, key=lambda clause: (len(clause), sorted(clause)))
+      corequisite_clauses = requirement_to_dnf(self.courses[course_code].get("corequisites"))
+      corequisites[course_code] = min(
+        [clause - completed_courses for clause in corequisite_clauses if clause - completed_courses <= remaining_courses] or [frozenset()],
+        key=len,
+      )
+
+    return prerequisites, corequisites, blocked_courses
+
+
+  def plan(self,
+           completed_courses: list,
+           year_and_semester: str | None = None) -> dict:
+    """
+    Plans the remaining semesters of the track
+
+    Args:
+      - completed_courses (list): The codes of the courses already completed
+      - year_and_semester (str | None): The first semester to be planned, e.g. 'year_2_semester_1',
+                                        the first semester of the track if not given
+
+    Returns:
+      - dict: The semesters of the plan with their courses and credits, the earliest feasible
+              semester of every course, the critical path length in semesters and the courses
+              which could not be scheduled
+    """
+
+    completed_courses = set(completed_courses)
+    remaining_courses = set(self.courses) - completed_courses
+
+    blocked_courses = {}
+    while True:
+      prerequisites, corequisites, newly_blocked_courses = self.__resolve_requirements(remaining_courses, completed_courses)
+      if not newly_blocked_courses:
+        break
+      blocked_courses |= newly_blocked_courses
+      remaining_courses -= set(newly_blocked_courses)
+
+    corequisite_units = find_strongly_connected_components(
+      nodes=sorted(remaining_courses),
+      edges=corequisites,
+    )
+    unit_of = {
+      course_code: corequisite_unit[0]
+      for corequisite_unit in corequisite_units
+      for course_code in corequisite_unit
+    }
+    units = {corequisite_unit[0]: corequisite_unit for corequisite_unit in corequisite_units}
+
+    unit_lags = {}
+    for course_code in remaining_courses:
+      for required_course_code, lag in [(code, 1) for code in prerequisites[course_code]] + [(code, 0) for code in corequisites[course_code]]:
+        unit_edge = (unit_of[required_course_code], unit_of[course_code])
+        if unit_edge[0] != unit_edge[1] or lag:
+          unit_lags[unit_edge] = max(unit_lags.get(unit_edge, 0), lag)
+
+    dependents = {unit: [] for unit in units}
+    in_degree = {unit: 0 for unit in units}
+    for (required_unit, unit), lag in sorted(unit_lags.items()):
+      dependents[required_unit].append((unit, lag))
+      in_degree[unit] += 1
+
+    earliest_semester = {unit: 0 for unit in units}
+    topological_order = []
+    ready_units = deque(sorted(unit for unit, degree in in_degree.items() if degree == 0))
+    while ready_units:
+      unit = ready_units.popleft()
+      topological_order.append(unit)
+      for dependent_unit, lag in dependents[unit]:
+        earliest_semester[dependent_unit] = max(earliest_semester[dependent_unit], earliest_semester[unit] + lag)
+        in_degree[dependent_unit] -= 1
+        if in_degree[dependent_unit] == 0:
+          ready_units.append(dependent_unit)
+
+    unsorted_units = set(units) - set(topological_order)
+    for cyclic_units in find_strongly_connected_components(
+      nodes=sorted(unsorted_units),
+      edges={unit: [dependent_unit for dependent_unit, _ in dependents[unit] if dependent_unit in unsorted_units] for unit in unsorted_units},
+    ):
+      is_circular = len(cyclic_units) > 1 or (cyclic_units[0], cyclic_units[0]) in unit_lags
+      for unit in cyclic_units:
+        for course_code in units[unit]:
+          blocked_courses[course_code] = "circular prerequisites" if is_circular else "requires a course with circular prerequisites"
+    units = {unit: units[unit] for unit in topological_order}
+    remaining_courses = {course_code for unit in units for course_code in units[unit]}
+
+    chain_length = {}
+    for unit in reversed(topological_order):
+      chain_length[unit] = max(
+        [chain_length[dependent_unit] + lag for dependent_unit, lag in dependents[unit] if dependent_unit in units] or [0]
+      )
+    critical_path_length = max(
+      [earliest_semester[unit] + chain_length[unit] + 1 for unit in units] or [0]
+    )
+
+    priority = {
+      unit: (-chain_length[unit], min(self.__catalog_position(course_code) for course_code in units[unit]), -len(dependents[unit]), unit)
+      for unit in units
+    }
+    unit_credits = {
+      unit: sum(self.__credits(course_code) for course_code in units[unit])
+      for unit in units
+    }
+    pending_requirements = {unit: 0 for unit in units}
+    for unit in units:
+      for dependent_unit, _ in dependents[unit]:
+        pending_requirements[dependent_unit] += 1
+    available_from_semester = {unit: 0 for unit in units}
+    ready_units = [
+      (priority[unit], unit)
+      for unit in units
+      if pending_requirements[unit] == 0
+    ]
+    heapq.heapify(ready_units)
+
+    semesters = []
+    while ready_units:
+      semester_index = len(semesters)
+      semester_courses, semester_credits, postponed_units = [], 0, []
+      while ready_units:
+        ready_unit = heapq.heappop(ready_units)
+        unit = ready_unit[1]
+        if available_from_semester[unit] > semester_index or (semester_courses and semester_credits + unit_credits[unit] > self.credit_cap):
+          postponed_units.append(ready_unit)
+          continue
+
+        semester_courses += units[unit]
+        semester_credits += unit_credits[unit]
+        for dependent_unit, lag in dependents[unit]:
+          available_from_semester[dependent_unit] = max(available_from_semester[dependent_unit], semester_index + lag)
+          pending_requirements[dependent_unit] -= 1
+          if pending_requirements[dependent_unit] == 0:
+            heapq.heappush(ready_units, (priority[dependent_unit], dependent_unit))
+
+      semesters.append({
+        "courses": semester_courses,
+        "credits": semester_credits,
+      })
+      ready_units = postponed_units
+      heapq.heapify(ready_units)
+
+    year, semester = parse_year_and_semester(year_and_semester, self.semesters_per_year) if year_and_semester else (1, 1)
+    first_semester_index = (year - 1) * self.semesters_per_year + (semester - 1)
+    for semester_index, planned_semester in enumerate(semesters):
+      planned_year, planned_semester_of_year = divmod(first_semester_index + semester_index, self.semesters_per_year)
+      planned_semester["year"] = planned_year + 1
+      planned_semester["semester"] = planned_semester_of_year + 1
+
+    return {
+      "semesters": semesters,
+      "earliest_semester": {
+        course_code: earliest_semester[unit] + 1
+        for unit in sorted(units, key=priority.get)
+        for course_code in units[unit]
+      },
+      "critical_path_length": critical_path_length,
+      "blocked_courses": blocked_courses,
+    }
\ No newline at end of file
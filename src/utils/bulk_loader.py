@@ -0,0 +1,77 @@
+from time import time
+from consts import StorageConsts
+from src.utils.logging_handler import LoggingHandler
+from src.utils.storage_backends import StorageBackend, get_storage_backend
+
+
+class BulkLoader:
+  """
+  A class that ships every document of a local storage backend to another backend, usually
+  the MongoDB, in large batches, so that a crawl written at local disk speed is synced once.
+  """
+
+
+  def __init__(self,
+               logger,
+               source_backend: StorageBackend,
+               target_backend: StorageBackend,
+               batch_size: int | None = None) -> None:
+    self.logger = logger
+    self.source_backend = source_backend
+    self.target_backend = target_backend
+    self.batch_size = batch_size if batch_size else StorageConsts().get_constants()["bulk_load_batch_size"]
+
+
+  def load(self,
+           databases: list | None = None) -> dict:
+    """
+    Ships the documents of every collection of the source backend to the target backend
+
+    Args:
+      - databases (list | None): The databases to be shipped, all the databases if not given
+
+    Returns:
+      - dict: The number of documents shipped, keyed by 'database.collection'
+    """
+
+    start = time()
+    loaded_documents = {}
+
+    for database, collection in self.source_backend.list_collections():
+      if databases and database not in databases:
+        continue
+
+      try:
+        documents = self.source_backend.find(
+          database=database,
+          collection=collection,
+        )
+        for i in range(0, len(documents), self.batch_size):
+          self.target_backend.bulk_replace(
+            database=database,
+            collection=collection,
+            documents={
+              document["_id"]: {key: value for key, value in document.items() if key != "_id"}
+              for document in documents[i:i + self.batch_size]
+            },
+          )
+        loaded_documents[f"{database}.{collection}"] = len(documents)
+
+      except Exception as e:
+        self.logger.error(
+          message=f"An error '{e}' occurred while loading the collection: {database}.{collection} into the {self.target_backend.name} storage. At line {e.__traceback__.tb_lineno} in {__file__}.",
+        )
+
+    self.logger.info(
+      message=f"Loaded {sum(loaded_documents.values())} documents from the {self.source_backend.name} storage into the {self.target_backend.name} storage in {time() - start:.2f} seconds"
+    )
+    return loaded_documents
+
+
+if __name__ == "__main__":
+  bulk_loader = BulkLoader(
+    logger=LoggingHandler(),
+    source_backend=get_storage_backend("sqlite"),
+    target_backend=get_storage_backend("mongo"),
+  )
+  print(bulk_loader.load())
\ No newline at end of file
@@ -0,0 +1,100 @@
+import threading
+from time import monotonic
+from collections import OrderedDict
+
+
+class LRUCache:
+  """
+  A thread-safe least recently used cache whose entries also expire after a fixed time to
+  live, so that the hot reads are served from memory while stale entries are never served
+  for longer than the time to live.
+  """
+
+
+  def __init__(self,
+               max_entries: int,
+               ttl_seconds: float) -> None:
+    self.max_entries = max_entries
+    self.ttl_seconds = ttl_seconds
+    self.hits = 0
+    self.misses = 0
+    self.__entries = OrderedDict()
+    self.__lock = threading.Lock()
+
+
+  def get(self,
+          key: tuple):
+    """
+    Returns the value cached for a key, marking it as the most recently used
+
+    Args:
+      - key (tuple): The key of the entry, its first element being the program it belongs to
+
+    Returns:
+      - The cached value, None if the key is not cached or has expired
+    """
+
+    with self.__lock:
+      entry = self.__entries.get(key)
+      if entry is None or entry[0] < monotonic():
+        if entry is not None:
+          del self.__entries[key]
+        self.misses += 1
+        return None
+
+      self.__entries.move_to_end(key)
+      self.hits += 1
+      return entry[1]
+
+
+  def set(self,
+          key: tuple,
+          value) -> None:
+    """
+    Caches a value for a key, evicting the least recently used entry when the cache is full
+
+    Args:
+      - key (tuple): The key of the entry, its first element being the program it belongs to
+      - value: The value to be cached
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      self.__entries[key] = (monotonic() + self.ttl_seconds, value)
+      self.__entries.move_to_end(key)
+      while len(self.__entries) > self.max_entries:
+        self.__entries.popitem(last=False)
+
+
+  def invalidate(self,
+                 program: str) -> None:
+    """
+    Removes every entry belonging to a program, for example after it is scraped again
+
+    Args:
+      - program (str): The program whose entries are to be removed
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      for key in [key for key in self.__entries if key[0] == program]:
+        del self.__entries[key]
+
+
+  def clear(self) -> None:
+    """
+    Removes every entry, for example after the courses shared by the programs are updated
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      self.__entries.clear()
\ No newline at end of file
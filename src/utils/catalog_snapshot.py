@@ -0,0 +1,361 @@
+import os
+import sys
+import mmap
+import struct
+import tempfile
+from array import array
+from time import time_ns
+from src.scrape_data.course_records import iterate_course_codes
+
+
+SNAPSHOT_MAGIC = b"NJCS"
+SNAPSHOT_FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHQII")
+SECTION = struct.Struct("<8sQQ")
+SECTION_ALIGNMENT = 8
+COURSE_FIELDS = 4
+MEMBERSHIP_FIELDS = 4
+UNKNOWN = -1
+
+
+def to_int(value) -> int:
+  """
+  Converts a credit count, year or semester to an integer, -1 if it is not a number
+  """
+
+  try:
+    return int(value)
+  except (TypeError, ValueError):
+    return UNKNOWN
+
+
+def to_little_endian(values: array) -> bytes:
+  """
+  Returns the bytes of an array in little endian order, the byte order of the snapshot
+  """
+
+  if sys.byteorder != "little":
+    values = array(values.typecode, values)
+    values.byteswap()
+  return values.tobytes()
+
+
+def write_catalog_snapshot(path: str,
+                           tracks_information: dict,
+                           courses: dict) -> dict:
+  """
+  Writes the snapshot of a course catalog: an interned string table, a course table sorted
+  by the course code, the prerequisites and corequisites as CSR arrays of course indexes, the
+  courses of every track with their per-track fields and the embedding matrix of the courses.
+  The snapshot is written next to its path and swapped in with a single rename, so a reader
+  sees either the previous or the new snapshot, never a partial one.
+
+  Args:
+    - path (str): The path of the snapshot
+    - tracks_information (dict): The track information documents keyed by the track, each
+                                 holding the course documents keyed by the course
+    - courses (dict): The documents of the courses named as prerequisites or corequisites
+                      but listed by none of the tracks, keyed by the course code
+
+  Returns:
+    - dict: The version, the number of courses, tracks and edges and the size of the snapshot
+  """
+
+  course_documents = dict(courses)
+  for track_information in tracks_information.values():
+    for course_document in track_information.values():
+      if isinstance(course_document, dict) and course_document.get("course_code"):
+        course_documents[course_document["course_code"]] = course_document
+  for course_document in list(course_documents.values()):
+    for field in ("prerequisites", "corequisites"):
+      for course_code in iterate_course_codes(course_document.get(field)):
+        course_documents.setdefault(course_code, {"course_code": course_code})
+
+  course_codes = sorted(course_documents)
+  course_indexes = {course_code: index for index, course_code in enumerate(course_codes)}
+
+  strings, string_ids = [], {}
+
+  def add_string(value) -> int:
+    """
+    Adds a string to the string table once, returning its identifier, -1 for None
+    """
+
+    if value is None:
+      return UNKNOWN
+    value = str(value)
+    if value not in string_ids:
+      string_ids[value] = len(strings)
+      strings.append(value.encode("utf-8"))
+    return string_ids[value]
+
+  course_table = array("i")
+  requisite_arrays = {field: (array("I", [0]), array("I")) for field in ("prerequisites", "corequisites")}
+  embedding_dimension = max(
+    [len(course_documents[course_code].get("embedding") or []) for course_code in course_codes] or [0]
+  )
+  embeddings = array("f")
+  for course_code in course_codes:
+    course_document = course_documents[course_code]
+    course_table.extend((
+      add_string(course_code),
+      add_string(course_document.get("course_name")),
+      to_int(course_document.get("credits")),
+      add_string(course_document.get("course_description")),
+    ))
+    for field, (pointers, indexes) in requisite_arrays.items():
+      indexes.extend(sorted({course_indexes[code] for code in iterate_course_codes(course_document.get(field))}))
+      pointers.append(len(indexes))
+    if embedding_dimension:
+      embedding = list(course_document.get("embedding") or [])
+      embeddings.extend(embedding if len(embedding) == embedding_dimension else [0.0] * embedding_dimension)
+
+  track_names, track_pointers, track_courses, memberships = array("i"), array("I", [0]), array("I"), array("i")
+  for track, track_information in sorted(tracks_information.items()):
+    track_names.append(add_string(track))
+    for course_document in track_information.values():
+      if not isinstance(course_document, dict) or not course_document.get("course_code"):
+        continue
+      track_courses.append(course_indexes[course_document["course_code"]])
+      memberships.extend((
+        to_int(course_document.get("year")),
+        to_int(course_document.get("semester")),
+        to_int(course_document.get("dependency_count")),
+        to_int(course_document.get("on_dependant_courses_count")),
+      ))
+    track_pointers.append(len(track_courses))
+
+  string_offsets = array("I", [0])
+  for string in strings:
+    string_offsets.append(string_offsets[-1] + len(string))
+
+  sections = [
+    (b"STRDATA", b"".join(strings)),
+    (b"STROFFS", to_little_endian(string_offsets)),
+    (b"COURSES", to_little_endian(course_table)),
+    (b"PREPTR", to_little_endian(requisite_arrays["prerequisites"][0])),
+    (b"PREIDX", to_little_endian(requisite_arrays["prerequisites"][1])),
+    (b"COPTR", to_little_endian(requisite_arrays["corequisites"][0])),
+    (b"COIDX", to_little_endian(requisite_arrays["corequisites"][1])),
+    (b"TRACKS", to_little_endian(track_names)),
+    (b"TRKPTR", to_little_endian(track_pointers)),
+    (b"TRKIDX", to_little_endian(track_courses)),
+    (b"TRKMETA", to_little_endian(memberships)),
+    (b"EMBED", to_little_endian(embeddings)),
+  ]
+
+  version = time_ns()
+  offset = HEADER.size + SECTION.size * len(sections)
+  section_table, payload = [], []
+  for name, data in sections:
+    padding = -offset % SECTION_ALIGNMENT
+    payload.append(b"\0" * padding + data)
+    offset += padding
+    section_table.append(SECTION.pack(name, offset, len(data)))
+    offset += len(data)
+
+  directory = os.path.dirname(os.path.abspath(path))
+  os.makedirs(directory, exist_ok=True)
+  file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+  try:
+    with os.fdopen(file_descriptor, "wb") as snapshot_file:
+      snapshot_file.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, 0, version, len(sections), embedding_dimension))
+      snapshot_file.writelines(section_table)
+      snapshot_file.writelines(payload)
+      snapshot_file.flush()
+      os.fsync(snapshot_file.fileno())
+    os.replace(temporary_path, path)
+  except BaseException:
+    if os.path.exists(temporary_path):
+      os.remove(temporary_path)
+    raise
+
+  return {
+    "version": version,
+    "courses": len(course_codes),
+    "tracks": len(track_names),
+    "prerequisite_edges": len(requisite_arrays["prerequisites"][1]),
+    "corequisite_edges": len(requisite_arrays["corequisites"][1]),
+    "embedding_dimension": embedding_dimension,
+    "bytes": offset,
+  }
+
+
+class CatalogSnapshot:
+  """
+  A course catalog snapshot mapped into memory. Its arrays are views over the mapped file,
+  so opening a snapshot costs no parsing and no copy whatever its size, the pages being read
+  from the disk, or shared with the other processes mapping the same file, as they are used.
+  Only the strings asked for are decoded.
+  """
+
+
+  def __init__(self,
+               path: str) -> None:
+    self.path = path
+    with open(path, "rb") as snapshot_file:
+      self.__mmap = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+      file_status = os.fstat(snapshot_file.fileno())
+      self.file_id = file_status.st_ino, file_status.st_mtime_ns
+
+    magic, format_version, _, self.version, section_count, self.embedding_dimension = HEADER.unpack_from(self.__mmap, 0)
+    if magic != SNAPSHOT_MAGIC or format_version != SNAPSHOT_FORMAT_VERSION:
+      raise ValueError(f"{path} is not a course catalog snapshot of the format version {SNAPSHOT_FORMAT_VERSION}")
+
+    buffer = memoryview(self.__mmap)
+    sections = {}
+    for section_index in range(section_count):
+      name, offset, length = SECTION.unpack_from(self.__mmap, HEADER.size + section_index * SECTION.size)
+      sections[name.rstrip(b"\0").decode("ascii")] = buffer[offset:offset + length]
+
+    self.__strings = sections["STRDATA"]
+    self.__string_offsets = self.__view(sections["STROFFS"], "I")
+    self.__courses = self.__view(sections["COURSES"], "i")
+    self.__requisites = {
+      "prerequisites": (self.__view(sections["PREPTR"], "I"), self.__view(sections["PREIDX"], "I")),
+      "corequisites": (self.__view(sections["COPTR"], "I"), self.__view(sections["COIDX"], "I")),
+    }
+    self.__track_pointers = self.__view(sections["TRKPTR"], "I")
+    self.__track_courses = self.__view(sections["TRKIDX"], "I")
+    self.__memberships = self.__view(sections["TRKMETA"], "i")
+    self.embeddings = self.__view(sections["EMBED"], "f")
+    self.course_count = len(self.__courses) // COURSE_FIELDS
+    self.tracks = {
+      self.__string(string_id): track_index
+      for track_index, string_id in enumerate(self.__view(sections["TRACKS"], "i"))
+    }
+
+
+  @staticmethod
+  def __view(section: memoryview,
+             typecode: str):
+    """
+    Returns a section as an array of the given type, a view over the mapped file on little
+    endian machines and a byte swapped copy otherwise
+    """
+
+    if sys.byteorder == "little":
+      return section.cast(typecode)
+    values = array(typecode, section.tobytes())
+    values.byteswap()
+    return values
+
+
+  def __string(self,
+               string_id: int) -> str | None:
+    """
+    Decodes a string of the string table, None for an unknown string
+    """
+
+    if string_id == UNKNOWN:
+      return None
+    return self.__strings[self.__string_offsets[string_id]:self.__string_offsets[string_id + 1]].tobytes().decode("utf-8")
+
+
+  def course_code_at(self,
+                     course_index: int) -> str:
+    """
+    Returns the code of the course at an index of the course table
+    """
+
+    return self.__string(self.__courses[course_index * COURSE_FIELDS])
+
+
+  def find_course(self,
+                  course_code: str) -> int | None:
+    """
+    Finds a course by a binary search over the course table, sorted by the course code
+
+    Args:
+      - course_code (str): The code of the course
+
+    Returns:
+      - int | None: The index of the course, None if the snapshot does not hold it
+    """
+
+    low, high = 0, self.course_count
+    while low < high:
+      middle = (low + high) // 2
+      if self.course_code_at(middle) < course_code:
+        low = middle + 1
+      else:
+        high = middle
+    return low if low < self.course_count and self.course_code_at(low) == course_code else None
+
+
+  def requisite_indexes(self,
+                        course_index: int,
+                        field: str = "prerequisites"):
+    """
+    Returns the indexes of the prerequisites or corequisites of a course, a view over the snapshot
+    """
+
+    pointers, indexes = self.__requisites[field]
+    return indexes[pointers[course_index]:pointers[course_index + 1]]
+
+
+  def embedding(self,
+                course_index: int):
+    """
+    Returns the embedding of a course, a view over the snapshot, None without embeddings
+    """
+
+    if not self.embedding_dimension:
+      return None
+    return self.embeddings[course_index * self.embedding_dimension:(course_index + 1) * self.embedding_dimension]
+
+
+  def get_course(self,
+                 course_code: str) -> dict | None:
+    """
+    Returns a course of the snapshot with the codes of its prerequisites and corequisites
+
+    Args:
+      - course_code (str): The code of the course
+
+    Returns:
+      - dict | None: The course, None if the snapshot does not hold it
+    """
+
+    course_index = self.find_course(course_code)
+    if course_index is None:
+      return None
+
+    _, course_name, credits, course_description = self.__courses[course_index * COURSE_FIELDS:(course_index + 1) * COURSE_FIELDS]
+    return {
+      "course_code": course_code,
+      "course_name": self.__string(course_name),
+      "credits": None if credits == UNKNOWN else credits,
+      "course_description": self.__string(course_description),
+      "prerequisites": [self.course_code_at(index) for index in self.requisite_indexes(course_index, "prerequisites")],
+      "corequisites": [self.course_code_at(index) for index in self.requisite_indexes(course_index, "corequisites")],
+    }
+
+
+  def get_track_courses(self,
+                        track: str) -> list | None:
+    """
+    Returns the courses of a track with their year, semester and per-track counts
+
+    Args:
+      - track (str): The name of the track
+
+    Returns:
+      - list | None: The courses of the track, None if the snapshot does not hold the track
+    """
+
+    track_index = self.tracks.get(track)
+    if track_index is None:
+      return None
+
+    track_courses = []
+    for membership_index in range(self.__track_pointers[track_index], self.__track_pointers[track_index + 1]):
+      year, semester, dependency_count, on_dependant_courses_count = self.__memberships[membership_index * MEMBERSHIP_FIELDS:(membership_index + 1) * MEMBERSHIP_FIELDS]
+      track_courses.append({
+        "course_code": self.course_code_at(self.__track_courses[membership_index]),
+        "year": None if year == UNKNOWN else year,
+        "semester": None if semester == UNKNOWN else semester,
+        "dependency_count": None if dependency_count == UNKNOWN else dependency_count,
+        "on_dependant_courses_count": None if on_dependant_courses_count == UNKNOWN else on_dependant_courses_count,
+      })
+    return track_courses
\ No newline at end of file
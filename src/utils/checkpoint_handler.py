@@ -0,0 +1,273 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from consts import CheckpointConsts
+
+
+class CheckpointHandler:
+  """
+  A class that journals every enriched course of a scrape into a local SQLite database, so
+  that a scrape which dies midway can be resumed without fetching and segregating the
+  already completed courses again.
+  """
+
+
+  def __init__(self,
+               logger) -> None:
+    self.logger = logger
+    checkpoint_consts = CheckpointConsts().get_constants()
+    self.__lock = threading.Lock()
+    self.__connection = sqlite3.connect(
+      database=checkpoint_consts["checkpoint_database"],
+      check_same_thread=False,
+    )
+    self.__connection.execute("PRAGMA journal_mode=WAL")
+    self.__connection.execute("PRAGMA synchronous=NORMAL")
+    self.__connection.execute(
+      """
+      CREATE TABLE IF NOT EXISTS course_checkpoints (
+        program TEXT NOT NULL,
+        run_id TEXT NOT NULL,
+        course_link TEXT NOT NULL,
+        course_related_info TEXT NOT NULL,
+        checkpointed_at TEXT NOT NULL,
+        PRIMARY KEY (program, run_id, course_link)
+      )
+      """
+    )
+    self.__connection.execute(
+      """
+      CREATE TABLE IF NOT EXISTS run_usage (
+        program TEXT NOT NULL,
+        run_id TEXT NOT NULL,
+        usage TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        PRIMARY KEY (program, run_id)
+      )
+      """
+    )
+    self.__connection.commit()
+
+
+  def checkpoint_course(self,
+                        program: str,
+                        run_id: str,
+                        course_link: str,
+                        course_related_info: dict,
+                        usage: dict | None = None) -> None:
+    """
+    Durably records the enriched information of a single course for a run, along with the
+    Gemini usage totals of the run if given, in a single transaction
+
+    Args:
+      - program (str): The name of the program being scraped
+      - run_id (str): The identifier of the scrape run
+      - course_link (str): The link from which the course information was fetched
+      - course_related_info (dict): The enriched course information
+      - usage (dict | None): The usage totals of the run
+
+    Returns:
+      - None
+    """
+
+    try:
+      with self.__lock:
+        self.__connection.execute(
+          "INSERT OR REPLACE INTO course_checkpoints VALUES (?, ?, ?, ?, ?)",
+          (
+            program,
+            run_id,
+            course_link,
+            json.dumps(course_related_info, default=list),
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+          )
+        )
+        if usage is not None:
+          self.__save_run_usage(program, run_id, usage)
+        self.__connection.commit()
+      return None
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while checkpointing the course: {course_link} of the program: {program}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return None
+
+
+  def checkpoint_courses(self,
+                         program: str,
+                         run_id: str,
+                         courses_related_info: dict,
+                         usage: dict | None = None) -> None:
+    """
+    Durably records the enriched information of a batch of courses for a run, along with the
+    Gemini usage totals of the run if given, in a single transaction
+
+    Args:
+      - program (str): The name of the program being scraped
+      - run_id (str): The identifier of the scrape run
+      - courses_related_info (dict): The enriched course information keyed by the course link
+      - usage (dict | None): The usage totals of the run
+
+    Returns:
+      - None
+    """
+
+    try:
+      checkpointed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+      with self.__lock:
+        self.__connection.executemany(
+          "INSERT OR REPLACE INTO course_checkpoints VALUES (?, ?, ?, ?, ?)",
+          [
+            (program, run_id, course_link, json.dumps(course_related_info, default=list), checkpointed_at)
+            for course_link, course_related_info in courses_related_info.items()
+          ]
+        )
+        if usage is not None:
+          self.__save_run_usage(program, run_id, usage)
+        self.__connection.commit()
+      return None
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while checkpointing {len(courses_related_info)} courses of the program: {program}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return None
+
+
+  def load_checkpointed_courses(self,
+                                program: str,
+                                run_id: str) -> dict:
+    """
+    Loads all the courses checkpointed for a run of a program
+
+    Args:
+      - program (str): The name of the program being scraped
+      - run_id (str): The identifier of the scrape run
+
+    Returns:
+      - dict: The enriched course information keyed by the course link
+    """
+
+    try:
+      with self.__lock:
+        rows = self.__connection.execute(
+          "SELECT course_link, course_related_info FROM course_checkpoints WHERE program = ? AND run_id = ?",
+          (program, run_id)
+        ).fetchall()
+      return {
+        course_link: json.loads(course_related_info)
+        for course_link, course_related_info in rows
+      }
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while loading the checkpointed courses of the program: {program} for run: {run_id}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return {}
+
+
+  def __save_run_usage(self,
+                       program: str,
+                       run_id: str,
+                       usage: dict) -> None:
+    """
+    Writes the usage totals of a run, the caller holding the lock and committing
+    """
+
+    self.__connection.execute(
+      "INSERT OR REPLACE INTO run_usage VALUES (?, ?, ?, ?)",
+      (
+        program,
+        run_id,
+        json.dumps(usage),
+        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+      )
+    )
+
+
+  def save_run_usage(self,
+                     program: str,
+                     run_id: str,
+                     usage: dict) -> None:
+    """
+    Persists the Gemini usage totals of a run, so that the cost of every run can be compared
+    and a resumed run keeps counting against its budget
+
+    Args:
+      - program (str): The name of the program being scraped
+      - run_id (str): The identifier of the scrape run
+      - usage (dict): The usage totals of the run
+
+    Returns:
+      - None
+    """
+
+    try:
+      with self.__lock:
+        self.__save_run_usage(program, run_id, usage)
+        self.__connection.commit()
+      return None
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while saving the usage of the program: {program} for run: {run_id}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return None
+
+
+  def load_run_usage(self,
+                     program: str,
+                     run_id: str) -> dict | None:
+    """
+    Loads the Gemini usage totals persisted by a run
+
+    Args:
+      - program (str): The name of the program being scraped
+      - run_id (str): The identifier of the scrape run
+
+    Returns:
+      - dict | None: The usage totals of the run, None if the run never persisted any
+    """
+
+    try:
+      with self.__lock:
+        row = self.__connection.execute(
+          "SELECT usage FROM run_usage WHERE program = ? AND run_id = ?",
+          (program, run_id)
+        ).fetchone()
+      return json.loads(row[0]) if row else None
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while loading the usage of the program: {program} for run: {run_id}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return None
+
+
+  def get_latest_run_id(self,
+                        program: str) -> str | None:
+    """
+    Returns the identifier of the most recently checkpointed run of a program
+
+    Args:
+      - program (str): The name of the program being scraped
+
+    Returns:
+      - str | None: The identifier of the latest run, None if the program was never checkpointed
+    """
+
+    try:
+      with self.__lock:
+        row = self.__connection.execute(
+          "SELECT run_id FROM course_checkpoints WHERE program = ? ORDER BY checkpointed_at DESC LIMIT 1",
+          (program,)
+        ).fetchone()
+      return row[0] if row else None
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while fetching the latest run of the program: {program}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return None
\ No newline at end of file
@@ -0,0 +1,308 @@
+import os
+import tempfile
+from time import time
+from consts import ColumnarExportConsts
+from src.utils.logging_handler import LoggingHandler
+from src.scrape_data.course_records import Track
+from src.utils.storage_backends import StorageBackend, get_storage_backend
+from src.utils.database_handler import COURSES_CATALOG_DATABASE, COURSES_COLLECTION, COURSES_REGISTRY_DATABASE, COURSES_TRACK_DATABASE
+
+
+EXPORT_FORMATS = ("parquet", "arrow")
+
+
+def to_int(value) -> int | None:
+  """
+  Converts a credit or dependency count to an integer, None if it is not a number
+  """
+
+  try:
+    return int(value)
+  except (TypeError, ValueError):
+    return None
+
+
+def iterate_requisite_edges(course_code: str,
+                            requirement: list | None,
+                            relation: str):
+  """
+  Flattens a nested prerequisites or corequisites list into edges, keeping its AND/OR
+  structure in two columns: the edges of the same group are alternatives of each other
+  (OR), the groups are all required (AND), and the edges sharing a group and an alternative
+  are required together
+
+  Args:
+    - course_code (str): The code of the course having the requirement
+    - requirement (list | None): The nested prerequisites or corequisites list
+    - relation (str): 'prerequisite' or 'corequisite'
+
+  Returns:
+    - Generator: The edges as rows
+  """
+
+  for group_index, element in enumerate(requirement or []):
+    alternatives = [element] if isinstance(element, str) else element
+    for alternative_index, alternative in enumerate(alternatives):
+      for requisite_course_code in [alternative] if isinstance(alternative, str) else alternative:
+        if isinstance(requisite_course_code, str):
+          yield {
+            "course_code": course_code,
+            "requisite_course_code": requisite_course_code,
+            "relation": relation,
+            "group_index": group_index,
+            "alternative_index": alternative_index,
+          }
+
+
+class ColumnarExporter:
+  """
+  A class that flattens the enriched course catalogs of a storage backend into columnar
+  tables for analytics: the courses, the plan entries of every track, the prerequisite and
+  corequisite edges and the per-track metrics. Every table is written as Parquet or Arrow
+  in batches, so that only a batch of rows is held as Arrow buffers at a time, and swapped
+  in with a single rename once complete.
+  """
+
+
+  def __init__(self,
+               logger,
+               storage_backend: StorageBackend,
+               directory: str | None = None,
+               batch_size: int | None = None,
+               export_format: str | None = None) -> None:
+    columnar_export_consts = ColumnarExportConsts().get_constants()
+    self.logger = logger
+    self.storage_backend = storage_backend
+    self.directory = directory if directory else columnar_export_consts["directory"]
+    self.batch_size = batch_size if batch_size else columnar_export_consts["batch_size"]
+    self.export_format = export_format if export_format else columnar_export_consts["format"]
+    if self.export_format not in EXPORT_FORMATS:
+      raise ValueError(f"The export format must be one of {', '.join(EXPORT_FORMATS)}, not {self.export_format}")
+
+
+  def __build_schemas(self,
+                      pyarrow) -> dict:
+    """
+    Builds the schema of every table
+    """
+
+    return {
+      "courses": pyarrow.schema([
+        ("course_code", pyarrow.string()),
+        ("course_name", pyarrow.string()),
+        ("credits", pyarrow.int32()),
+        ("contact_hours", pyarrow.string()),
+        ("prerequisites_description", pyarrow.string()),
+        ("course_description", pyarrow.string()),
+        ("course_link", pyarrow.string()),
+      ]),
+      "plan_entries": pyarrow.schema([
+        ("program", pyarrow.string()),
+        ("track", pyarrow.string()),
+        ("year", pyarrow.string()),
+        ("semester", pyarrow.string()),
+        ("group", pyarrow.string()),
+        ("entry_key", pyarrow.string()),
+        ("course_code", pyarrow.string()),
+        ("elective_description", pyarrow.string()),
+      ]),
+      "requisite_edges": pyarrow.schema([
+        ("course_code", pyarrow.string()),
+        ("requisite_course_code", pyarrow.string()),
+        ("relation", pyarrow.string()),
+        ("group_index", pyarrow.int32()),
+        ("alternative_index", pyarrow.int32()),
+      ]),
+      "track_metrics": pyarrow.schema([
+        ("program", pyarrow.string()),
+        ("track", pyarrow.string()),
+        ("course_key", pyarrow.string()),
+        ("course_code", pyarrow.string()),
+        ("year", pyarrow.string()),
+        ("semester", pyarrow.string()),
+        ("dependency_count", pyarrow.int32()),
+        ("on_dependant_courses_count", pyarrow.int32()),
+        ("complete_path_length", pyarrow.int32()),
+      ]),
+    }
+
+
+  def __iterate_courses(self):
+    """
+    Iterates over the rows of the courses table and of the requisite edges table, the
+    courses being stored once in the courses registry however many programs list them
+    """
+
+    for course in self.storage_backend.find(
+      database=COURSES_REGISTRY_DATABASE,
+      collection=COURSES_COLLECTION,
+    ):
+      course_code = course.get("course_code") or course["_id"]
+      yield "courses", {
+        "course_code": course_code,
+        "course_name": course.get("course_name"),
+        "credits": to_int(course.get("credits")),
+        "contact_hours": course.get("contact_hours"),
+        "prerequisites_description": course.get("prerequisites_description"),
+        "course_description": course.get("course_description"),
+        "course_link": course.get("course_link"),
+      }
+      for relation, field in (("prerequisite", "prerequisites"), ("corequisite", "corequisites")):
+        for edge in iterate_requisite_edges(course_code, course.get(field), relation):
+          yield "requisite_edges", edge
+
+
+  def __iterate_plan_entries(self,
+                             program: str):
+    """
+    Iterates over the rows of the plan entries table of a program, out of its course catalog
+    """
+
+    for document in self.storage_backend.find(
+      database=COURSES_CATALOG_DATABASE,
+      collection=program,
+    ):
+      track = Track.from_catalog_document(
+        track_name=document["_id"],
+        document=document,
+      )
+      for plan_entry in track.plan_entries:
+        if plan_entry.is_group_header:
+          continue
+        yield "plan_entries", {
+          "program": program,
+          "track": track.track_name,
+          "year": str(plan_entry.year),
+          "semester": str(plan_entry.semester),
+          "group": plan_entry.group,
+          "entry_key": plan_entry.key,
+          "course_code": plan_entry.course.course_code if plan_entry.course else None,
+          "elective_description": plan_entry.course_description,
+        }
+
+
+  def __iterate_track_metrics(self,
+                              program: str):
+    """
+    Iterates over the rows of the track metrics table of a program, out of its track information
+    """
+
+    for document in self.storage_backend.find(
+      database=COURSES_TRACK_DATABASE,
+      collection=program,
+    ):
+      for course_key, course in document.items():
+        if course_key == "_id" or not isinstance(course, dict):
+          continue
+        yield "track_metrics", {
+          "program": program,
+          "track": document["_id"],
+          "course_key": course_key,
+          "course_code": course.get("course_code"),
+          "year": str(course["year"]) if course.get("year") is not None else None,
+          "semester": str(course["semester"]) if course.get("semester") is not None else None,
+          "dependency_count": to_int(course.get("dependency_count")),
+          "on_dependant_courses_count": to_int(course.get("on_dependant_courses_count")),
+          "complete_path_length": len(course["complete_path"]) if isinstance(course.get("complete_path"), list) else None,
+        }
+
+
+  def export(self,
+             programs: list | None = None) -> dict | None:
+    """
+    Exports the courses registry and the course catalogs and track information of the programs
+
+    Args:
+      - programs (list | None): The programs to be exported, all the programs if not given
+
+    Returns:
+      - dict | None: The path and the number of rows of every table, None if the export failed
+    """
+
+    try:
+      import pyarrow
+      import pyarrow.ipc
+      import pyarrow.parquet
+    except ImportError as e:
+      self.logger.error(
+        message=f"The columnar export requires pyarrow, which could not be imported: '{e}'. Install it with 'pip install pyarrow'.",
+      )
+      return None
+
+    start = time()
+    schemas = self.__build_schemas(pyarrow)
+    stored_programs = sorted({
+      collection
+      for database, collection in self.storage_backend.list_collections()
+      if database in (COURSES_CATALOG_DATABASE, COURSES_TRACK_DATABASE)
+    })
+    programs = [program for program in stored_programs if not programs or program in programs]
+
+    os.makedirs(self.directory, exist_ok=True)
+    extension = "parquet" if self.export_format == "parquet" else "arrow"
+    writers, temporary_paths, pending_rows, row_counts = {}, {}, {}, {}
+
+    def flush(table: str) -> None:
+      if not pending_rows.get(table):
+        return
+      writers[table].write_batch(
+        pyarrow.RecordBatch.from_pylist(pending_rows[table], schema=schemas[table])
+      )
+      row_counts[table] += len(pending_rows[table])
+      pending_rows[table] = []
+
+    try:
+      for table, schema in schemas.items():
+        file_descriptor, temporary_paths[table] = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(file_descriptor)
+        if self.export_format == "parquet":
+          writers[table] = pyarrow.parquet.ParquetWriter(temporary_paths[table], schema)
+        else:
+          writers[table] = pyarrow.ipc.new_file(temporary_paths[table], schema)
+        pending_rows[table], row_counts[table] = [], 0
+
+      def iterate_rows():
+        yield from self.__iterate_courses()
+        for program in programs:
+          yield from self.__iterate_plan_entries(program)
+          yield from self.__iterate_track_metrics(program)
+
+      for table, row in iterate_rows():
+        pending_rows[table].append(row)
+        if len(pending_rows[table]) >= self.batch_size:
+          flush(table)
+
+      exported_tables = {}
+      for table in schemas:
+        flush(table)
+        writers.pop(table).close()
+        path = os.path.join(self.directory, f"{table}.{extension}")
+        os.replace(temporary_paths.pop(table), path)
+        exported_tables[table] = {"path": path, "rows": row_counts[table]}
+
+      self.logger.info(
+        message=f"Exported {sum(row_counts.values())} rows of {len(programs)} programs as {self.export_format} into {self.directory} in {time() - start:.2f} seconds"
+      )
+      return exported_tables
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while exporting the course catalogs as {self.export_format}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return None
+
+    finally:
+      for writer in writers.values():
+        writer.close()
+      for temporary_path in temporary_paths.values():
+        if os.path.exists(temporary_path):
+          os.remove(temporary_path)
+
+
+
+if __name__ == "__main__":
+  columnar_exporter = ColumnarExporter(
+    logger=LoggingHandler(),
+    storage_backend=get_storage_backend("mongo"),
+  )
+  print(columnar_exporter.export())
\ No newline at end of file
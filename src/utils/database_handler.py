@@ -1,19 +1,287 @@
-import pymongo
-import pymongo.collection
-from consts import MondoDBConsts
+import json
+import uuid
+import hashlib
+from src.scrape_data.course_records import Track
+from src.utils.metrics_handler import metrics_handler
+from src.utils.storage_backends import StorageBackend, get_storage_backend
+
+
+COURSES_CATALOG_DATABASE = "courses_catalog"
+COURSES_TRACK_DATABASE = "courses_track_information"
+COURSES_REGISTRY_DATABASE = "courses_registry"
+COURSES_COLLECTION = "courses"
+CATALOG_VERSIONS_DATABASE = "catalog_versions"
+VERSIONS_COLLECTION = "versions"
+
+
+SHARED_COURSE_FIELDS = (
+  "course_code",
+  "course_name",
+  "credits",
+  "contact_hours",
+  "prerequisites",
+  "prerequisites_description",
+  "corequisites",
+  "course_description",
+  "course_link",
+)
 
 
 class DatabaseHandler:
   def __init__(self,
-               logger) -> None:
+               logger,
+               storage_backend: StorageBackend | None = None) -> None:
     
     self.logger = logger
-    mongo_db_consts = MondoDBConsts().get_constants()
-    pymongo_client = pymongo.MongoClient(
-      host=mongo_db_consts["host"],
+    self.storage_backend = storage_backend if storage_backend else get_storage_backend()
+    self.__write_stage = f"{self.storage_backend.name}_write"
+    self.course_name = None
+    self.course_catalog_collection = None
+    self.track_information_collection = None
+    self.__course_indexes_created = False
+    self.__stored_courses = {}
+    self.__stored_course_hashes = {}
+
+
+  def __collect_course_references(self,
+                                  document,
+                                  course_codes: set) -> None:
+    """
+    Collects the course codes of every course reference inside a document
+
+    Args:
+      - document: The document, or a part of it, to be searched
+      - course_codes (set): The course codes collected so far
+
+    Returns:
+      - None
+    """
+
+    if not isinstance(document, dict):
+      return None
+
+    if "course_code" in document:
+      course_codes.add(document["course_code"])
+      return None
+
+    for value in document.values():
+      self.__collect_course_references(value, course_codes)
+    return None
+
+
+  def __merge_course_references(self,
+                                document,
+                                courses: dict):
+    """
+    Replaces every course reference inside a document by the full course record
+
+    Args:
+      - document: The document, or a part of it, to be resolved
+      - courses (dict): The shared course records keyed by the course code
+
+    Returns:
+      - The resolved document
+    """
+
+    if not isinstance(document, dict):
+      return document
+
+    if "course_code" in document:
+      return courses.get(document["course_code"], {}) | document
+
+    return {
+      key: self.__merge_course_references(value, courses)
+      for key, value in document.items()
+    }
+
+
+  def __resolve_course_references(self,
+                                  documents: list) -> list:
+    """
+    Resolves the course references of a batch of documents with a single $in lookup on the
+    courses collection
+
+    Args:
+      - documents (list): The normalized documents
+
+    Returns:
+      - list: The documents with the full course records
+    """
+
+    course_codes = set()
+    for document in documents:
+      self.__collect_course_references(document, course_codes)
+
+    courses = self.get_courses(
+      course_codes=list(course_codes)
     )
-    self.courses_catalog_db = pymongo_client["courses_catalog"]
-    self.courses_track_db = pymongo_client["courses_track_information"]
+    return [
+      self.__merge_course_references(document, courses)
+      for document in documents
+    ]
+
+
+  def __bump_version(self,
+                     version_id: str) -> None:
+    """
+    Stamps a new version on the courses registry or on a program, so that the read caches of 
+    every process, e.g. the API serving the reads while a CLI or worker scrapes, drop the
+    responses built from the previous version
+
+    Args:
+      - version_id (str): The courses registry database or the name of the program
+
+    Returns:
+      - None
+    """
+
+    self.storage_backend.replace_one(
+      database=CATALOG_VERSIONS_DATABASE,
+      collection=VERSIONS_COLLECTION,
+      document_id=version_id,
+      document={"version": uuid.uuid4().hex},
+    )
+
+
+  def get_versions(self) -> dict:
+    """
+    Returns the version stamped on the courses registry and on every program
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The versions keyed by the courses registry database or the name of the program
+    """
+
+    try:
+      return {
+        document["_id"]: document.get("version")
+        for document in self.storage_backend.find(
+          database=CATALOG_VERSIONS_DATABASE,
+          collection=VERSIONS_COLLECTION,
+        )
+      }
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while fetching the catalog versions from the {self.storage_backend.name} storage. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return {}
+
+
+  def __ensure_course_indexes(self) -> None:
+    """
+    Creates the indexes of the courses collection, once per handler
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    if self.__course_indexes_created:
+      return None
+
+    self.storage_backend.create_index(
+      database=COURSES_REGISTRY_DATABASE,
+      collection=COURSES_COLLECTION,
+      field="course_link",
+      unique=True,
+    )
+    self.storage_backend.create_index(
+      database=COURSES_REGISTRY_DATABASE,
+      collection=COURSES_COLLECTION,
+      field="course_name",
+    )
+    self.__course_indexes_created = True
+    return None
+
+
+  def add_courses(self,
+                  courses: dict) -> None:
+    """
+    Upserts the shared course records into the courses collection, keyed by the course code.
+    The records unchanged since they were last written by this handler are skipped.
+
+    Args:
+      - courses (dict): The shared course records (Course) keyed by the course code
+
+    Returns:
+      - None
+    """
+
+    try:
+      course_documents = {}
+      for course_code, course in courses.items():
+        if self.__stored_courses.get(course_code) is course:
+          continue
+
+        course_document = course.to_document()
+        course_hash = hashlib.sha1(
+          json.dumps(course_document, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        self.__stored_courses[course_code] = course
+        if self.__stored_course_hashes.get(course_code) == course_hash:
+          continue
+
+        course_documents[course_code] = course_document
+        self.__stored_course_hashes[course_code] = course_hash
+
+      if course_documents:
+        with metrics_handler.time_stage(self.__write_stage, self.course_name):
+          self.__ensure_course_indexes()
+          self.storage_backend.bulk_replace(
+            database=COURSES_REGISTRY_DATABASE,
+            collection=COURSES_COLLECTION,
+            documents=course_documents,
+          )
+          self.__bump_version(COURSES_REGISTRY_DATABASE)
+      return None
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while adding the courses to the {self.storage_backend.name} storage. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return None
+
+
+  def get_courses(self,
+                  course_codes: list,
+                  fields: list | None = None) -> dict:
+    """
+    Get the shared course records for a batch of course codes with a single $in lookup, or
+    its equivalent for the local storage backends
+
+    Args:
+      - course_codes (list): The codes of the courses to be fetched
+      - fields (list | None): The fields of the courses to be projected, all the fields if not given
+
+    Returns:
+      - dict: The course records keyed by the course code
+    """
+
+    try:
+      if not course_codes:
+        return {}
+
+      projection = {field: 1 for field in fields} if fields else None
+      return {
+        course["_id"]: {key: value for key, value in course.items() if key != "_id"}
+        for course in self.storage_backend.find(
+          database=COURSES_REGISTRY_DATABASE,
+          collection=COURSES_COLLECTION,
+          document_ids=course_codes,
+          projection=projection,
+        )
+      }
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while fetching the courses from the {self.storage_backend.name} storage. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return {}
   
 
   def create_collection_for_course_catalog(self,
@@ -28,7 +296,8 @@ class DatabaseHandler:
       - None
     """
     try:
-      self.course_catalog_collection = self.courses_catalog_db[course_name]
+      self.course_name = course_name
+      self.course_catalog_collection = course_name
       return None
     
     except Exception as e:
@@ -51,7 +320,7 @@ class DatabaseHandler:
     """
 
     try:
-      self.track_information_collection = self.courses_track_db[course_name]
+      self.track_information_collection = course_name
       return None
   
     except Exception as e:
@@ -62,52 +331,199 @@ class DatabaseHandler:
 
 
   def add_course_catalog_information(self,
-                                     course_catalog_information: dict) -> None:
+                                     track: Track) -> None:
     """
-    Add the track related information to the course collection
+    Add the track related information to the course collection, replacing the information
+    stored for the track by an earlier scrape. The full course records are stored once in 
+    the courses collection and the track document only holds references to them.
     
     Args:
-      - course_collection (pymongo.collection.Collection): The collection for the course
-      - track_related_information (dict): The track related information to be added
+      - track (Track): The track record to be added, its name being used as the document ID
     
     Returns:
       - None
     """
 
     try:
-      self.course_catalog_collection.insert_one(
-        document=course_catalog_information,
+      courses = {}
+      course_catalog_information = track.to_catalog_document(
+        courses=courses
       )
+      self.add_courses(
+        courses=courses
+      )
+      with metrics_handler.time_stage(self.__write_stage, self.course_name):
+        self.storage_backend.replace_one(
+          database=COURSES_CATALOG_DATABASE,
+          collection=self.course_catalog_collection,
+          document_id=track.track_name,
+          document=course_catalog_information,
+        )
+        self.__bump_version(self.course_catalog_collection)
       return None
 
     except Exception as e:
       self.logger.error(
-        message=f"An error '{e}' occurred while adding the course catalog information to the MongoDB. At line {e.__traceback__.tb_lineno} in {__file__}.",
+        message=f"An error '{e}' occurred while adding the course catalog information to the {self.storage_backend.name} storage. At line {e.__traceback__.tb_lineno} in {__file__}.",
       )
       return None
   
 
   def add_track_information(self,
+                            track: str,
                             track_information: dict) -> None:
     """
-    Add the complete track related information to the track collection
+    Add the complete track related information to the track collection, replacing the 
+    information stored for the track by an earlier scrape. Only the references to the
+    courses and the per-track fields are stored in the track document.
 
     Args:
-      - track_collection (pymongo.collection.Collection): The collection for the track information
-      - track_information (dict): The complete track information to be added
+      - track (str): The track to which the information belongs, used as the document ID
+      - track_information (dict): The plan entries (PlanEntry) of the track keyed by the course
     
     Returns:
       - None
     """
 
     try:
-      self.track_information_collection.insert_one(
-        document=track_information,
+      courses = {}
+      track_information = {
+        course: plan_entry.to_document(
+          courses=courses,
+          include_track_fields=True,
+        )
+        for course, plan_entry in track_information.items()
+      }
+      self.add_courses(
+        courses=courses
       )
+      with metrics_handler.time_stage(self.__write_stage, self.course_name):
+        self.storage_backend.replace_one(
+          database=COURSES_TRACK_DATABASE,
+          collection=self.track_information_collection,
+          document_id=track,
+          document=track_information,
+        )
+        self.__bump_version(self.track_information_collection)
       return None
     
     except Exception as e:
       self.logger.error(
-        message=f"An error '{e}' occurred while adding the track information to the MongoDB. At line {e.__traceback__.tb_lineno} in {__file__}.",
+        message=f"An error '{e}' occurred while adding the track information to the {self.storage_backend.name} storage. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return None
+
+
+  def get_course_catalog(self,
+                         course_name: str,
+                         tracks: list | None = None) -> list | None:
+    """
+    Get the course catalog documents, one per track, stored for a course with the course 
+    references resolved
+
+    Args:
+      - course_name (str): The name of the course whose catalog is to be fetched
+      - tracks (list | None): The tracks to be fetched, all the tracks if not given
+
+    Returns:
+      - list | None: The course catalog documents, None if an error occurred
+    """
+
+    try:
+      return self.__resolve_course_references(
+        documents=self.storage_backend.find(
+          database=COURSES_CATALOG_DATABASE,
+          collection=course_name,
+          document_ids=tracks,
+        )
+      )
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while fetching the course catalog of the course: {course_name}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return None
+
+
+  def get_track_information(self,
+                            course_name: str,
+                            track: str,
+                            courses: list | None = None) -> dict | None:
+    """
+    Get the complete track related information stored for a track of a course with the 
+    course references resolved
+
+    Args:
+      - course_name (str): The name of the course to which the track belongs
+      - track (str): The track whose information is to be fetched
+      - courses (list | None): The course codes to be projected, all the courses if not given
+
+    Returns:
+      - dict | None: The track information, None if the track does not exist or an error occurred
+    """
+
+    try:
+      projection = {course: 1 for course in courses} if courses else None
+      track_information = self.storage_backend.find_one(
+        database=COURSES_TRACK_DATABASE,
+        collection=course_name,
+        document_id=track,
+        projection=projection,
+      )
+      if not track_information:
+        return None
+      return self.__resolve_course_references(
+        documents=[track_information]
+      )[0]
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while fetching the track information of the track: {track} of the course: {course_name}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return None
+
+
+  def get_course_information(self,
+                             course_name: str,
+                             course_code: str,
+                             fields: list | None = None) -> dict | None:
+    """
+    Get the information of a single course, the shared course record merged with the 
+    per-track fields of the first track of a course listing it
+
+    Args:
+      - course_name (str): The name of the course whose tracks are searched
+      - course_code (str): The code of the course whose information is to be fetched
+      - fields (list | None): The fields of the course to be projected, all the fields if not given
+
+    Returns:
+      - dict | None: The course information, None if the course does not exist or an error occurred
+    """
+
+    try:
+      projection = {f"{course_code}.{field}": 1 for field in fields} if fields else {course_code: 1}
+      track_information = self.storage_backend.find_one_with_field(
+        database=COURSES_TRACK_DATABASE,
+        collection=course_name,
+        field=course_code,
+        projection=projection,
+      )
+      if not track_information:
+        return None
+
+      course_reference = track_information[course_code]
+      shared_course_fields = [field for field in fields if field in SHARED_COURSE_FIELDS] if fields else None
+      if fields and not shared_course_fields:
+        return course_reference
+
+      course = self.get_courses(
+        course_codes=[course_code],
+        fields=shared_course_fields,
+      ).get(course_code, {})
+      return course | course_reference
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while fetching the course: {course_code} of the course: {course_name}. At line {e.__traceback__.tb_lineno} in {__file__}.",
       )
       return None
@@ -0,0 +1,316 @@
+import threading
+import requests
+from datetime import datetime
+from urllib.parse import urlparse
+from time import monotonic, perf_counter
+from email.utils import parsedate_to_datetime
+from urllib.robotparser import RobotFileParser
+from consts import HttpConsts
+from src.utils.metrics_handler import metrics_handler
+from src.utils.single_flight import SingleFlight
+
+
+THROTTLING_STATUS_CODES = (429, 503)
+
+
+class HostConcurrencyController:
+  """
+  An AIMD controller of the requests in flight to a single host. The limit grows by one
+  request per round trip while the latency stays close to the best latency seen, and is
+  halved, at most once per round trip, when the host throttles, fails or slows down. A
+  Retry-After header pauses the host, and the crawl-delay of robots.txt spaces out the requests.
+  """
+
+
+  def __init__(self,
+               host: str,
+               initial_concurrency: int,
+               min_concurrency: int,
+               max_concurrency: int,
+               latency_tolerance: float,
+               crawl_delay_seconds: float) -> None:
+    self.host = host
+    self.limit = float(initial_concurrency)
+    self.min_concurrency = min_concurrency
+    self.max_concurrency = max_concurrency
+    self.latency_tolerance = latency_tolerance
+    self.crawl_delay_seconds = crawl_delay_seconds
+    self.in_flight = 0
+    self.baseline_latency = None
+    self.smoothed_latency = None
+    self.blocked_until = 0.0
+    self.next_request_at = 0.0
+    self.last_decrease_at = 0.0
+    self.__condition = threading.Condition()
+
+
+  def acquire(self) -> None:
+    """
+    Waits until a request may be sent to the host and counts it as in flight
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    with self.__condition:
+      while True:
+        now = monotonic()
+        wait = max(self.blocked_until, self.next_request_at) - now
+        if self.in_flight < int(self.limit) and wait <= 0:
+          self.in_flight += 1
+          self.next_request_at = now + self.crawl_delay_seconds
+          return None
+
+        self.__condition.wait(
+          timeout=wait if wait > 0 else None
+        )
+
+
+  def __decrease(self,
+                 now: float) -> None:
+    """
+    Halves the limit, at most once per round trip so that the responses of the requests sent
+    before the decrease do not shrink it again, the lock must be held by the caller
+    """
+
+    if now - self.last_decrease_at >= (self.smoothed_latency or 1.0):
+      self.limit = max(float(self.min_concurrency), self.limit / 2)
+      self.last_decrease_at = now
+
+
+  def release(self,
+              latency: float | None,
+              status_code: int | None,
+              retry_after_seconds: float | None = None) -> None:
+    """
+    Counts a request as no longer in flight and adapts the limit to its outcome
+
+    Args:
+      - latency (float | None): The latency of the request in seconds, None if it failed
+      - status_code (int | None): The status code of the response, None if the request failed
+      - retry_after_seconds (float | None): The time the host asked to wait before retrying
+
+    Returns:
+      - None
+    """
+
+    with self.__condition:
+      self.in_flight -= 1
+      now = monotonic()
+
+      if status_code is None or status_code in THROTTLING_STATUS_CODES:
+        self.__decrease(now)
+      else:
+        self.baseline_latency = latency if self.baseline_latency is None else min(self.baseline_latency, latency)
+        self.smoothed_latency = latency if self.smoothed_latency is None else 0.8 * self.smoothed_latency + 0.2 * latency
+        if self.smoothed_latency > self.baseline_latency * self.latency_tolerance:
+          self.__decrease(now)
+        else:
+          self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+
+      if retry_after_seconds:
+        self.blocked_until = max(self.blocked_until, now + retry_after_seconds)
+      self.__condition.notify_all()
+
+
+host_controllers = {}
+host_controllers_lock = threading.Lock()
+robots_txt_reads = SingleFlight(
+  name="robots_txt_read"
+)
+
+
+class HttpClient:
+  """
+  The HTTP layer of the scraper. Every host gets its own adaptive concurrency controller,
+  shared by every client of the process, so the concurrent crawls of a host together run at
+  the fastest rate the host tolerates, and the throttled requests are retried once the host
+  allows it.
+  """
+
+
+  def __init__(self,
+               logger) -> None:
+    self.logger = logger
+    http_consts = HttpConsts().get_constants()
+    self.initial_concurrency = http_consts["initial_concurrency"]
+    self.min_concurrency = http_consts["min_concurrency"]
+    self.max_concurrency = http_consts["max_concurrency"]
+    self.latency_tolerance = http_consts["latency_tolerance"]
+    self.max_retries = http_consts["max_retries"]
+    self.timeout_seconds = http_consts["timeout_seconds"]
+    self.respect_robots_txt = http_consts["respect_robots_txt"]
+    self.user_agent = http_consts["user_agent"]
+    self.__session = requests.Session()
+
+
+  def __read_crawl_delay(self,
+                         scheme: str,
+                         host: str) -> float:
+    """
+    Reads the crawl-delay asked by the robots.txt of a host
+
+    Args:
+      - scheme (str): The scheme of the host, e.g. 'https'
+      - host (str): The host, e.g. 'catalog.njit.edu'
+
+    Returns:
+      - float: The crawl-delay in seconds, 0 if the host does not ask for one
+    """
+
+    try:
+      response = self.__session.get(
+        url=f"{scheme}://{host}/robots.txt",
+        headers={"User-Agent": self.user_agent},
+        timeout=self.timeout_seconds,
+      )
+      if response.status_code != 200:
+        return 0.0
+
+      robot_file_parser = RobotFileParser()
+      robot_file_parser.parse(response.text.splitlines())
+      crawl_delay = robot_file_parser.crawl_delay(self.user_agent)
+      return float(crawl_delay) if crawl_delay else 0.0
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while reading the robots.txt of the host: {host}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
+      return 0.0
+
+
+  def get_controller(self,
+                     url: str) -> HostConcurrencyController:
+    """
+    Returns the process-wide concurrency controller of the host of a URL, reading the 
+    robots.txt of the host the first time it is seen. The robots.txt is read outside of the
+    lock, so a slow host does not hold back the requests to the other hosts, and only once
+    however many requests wait for it.
+
+    Args:
+      - url (str): The URL to be requested
+
+    Returns:
+      - HostConcurrencyController: The concurrency controller of the host
+    """
+
+    parsed_url = urlparse(url)
+    host = parsed_url.netloc
+    with host_controllers_lock:
+      controller = host_controllers.get(host)
+    if controller is not None:
+      return controller
+
+    crawl_delay_seconds = robots_txt_reads.do(
+      key=host,
+      function=lambda: self.__read_crawl_delay(parsed_url.scheme, host),
+    ) if self.respect_robots_txt else 0.0
+
+    with host_controllers_lock:
+      if host not in host_controllers:
+        host_controllers[host] = HostConcurrencyController(
+          host=host,
+          initial_concurrency=self.initial_concurrency,
+          min_concurrency=self.min_concurrency,
+          max_concurrency=self.max_concurrency,
+          latency_tolerance=self.latency_tolerance,
+          crawl_delay_seconds=crawl_delay_seconds,
+        )
+      return host_controllers[host]
+
+
+  def __parse_retry_after(self,
+                          retry_after: str | None) -> float | None:
+    """
+    Parses a Retry-After header, given either in seconds or as an HTTP date
+
+    Args:
+      - retry_after (str | None): The value of the header
+
+    Returns:
+      - float | None: The time to wait in seconds, None if the header is missing or invalid
+    """
+
+    if not retry_after:
+      return None
+
+    try:
+      return max(0.0, float(retry_after))
+    except ValueError:
+      pass
+
+    try:
+      retry_at = parsedate_to_datetime(retry_after)
+      return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+    except (TypeError, ValueError):
+      return None
+
+
+  def get(self,
+          url: str,
+          headers: dict | None = None,
+          program: str | None = None) -> requests.Response:
+    """
+    Sends a GET request once the concurrency controller of the host allows it, retrying the
+    throttled and failed requests
+
+    Args:
+      - url (str): The URL to be requested
+      - headers (dict | None): The headers of the request
+      - program (str | None): The program being processed, used to label the metrics
+
+    Returns:
+      - requests.Response: The response of the last attempt
+    """
+
+    controller = self.get_controller(url)
+    headers = {"User-Agent": self.user_agent} | (headers or {})
+
+    for attempt in range(self.max_retries + 1):
+      controller.acquire()
+      start = perf_counter()
+      try:
+        response = self.__session.get(
+          url=url,
+          headers=headers,
+          timeout=self.timeout_seconds,
+        )
+
+      except requests.RequestException:
+        controller.release(
+          latency=None,
+          status_code=None,
+        )
+        if attempt == self.max_retries:
+          raise
+        metrics_handler.increment(
+          name="scraper_retries_total",
+          labels={"stage": "http_fetch", "reason": "connection_error", "program": program},
+        )
+        continue
+
+      controller.release(
+        latency=perf_counter() - start,
+        status_code=response.status_code,
+        retry_after_seconds=self.__parse_retry_after(response.headers.get("Retry-After")),
+      )
+      metrics_handler.increment(
+        name="scraper_http_responses_total",
+        labels={"host": controller.host, "status_code": str(response.status_code)},
+      )
+      metrics_handler.set_gauge(
+        name="scraper_http_concurrency_limit",
+        value=int(controller.limit),
+        labels={"host": controller.host},
+      )
+
+      if response.status_code not in THROTTLING_STATUS_CODES or attempt == self.max_retries:
+        return response
+
+      metrics_handler.increment(
+        name="scraper_retries_total",
+        labels={"stage": "http_fetch", "reason": "throttled", "program": program},
+      )
\ No newline at end of file
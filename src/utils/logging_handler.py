@@ -1,9 +1,13 @@
 import os
 import json
+import threading
 from datetime import datetime
 
 
 class LoggingHandler:
+  lock = threading.Lock()
+
+
   def __init__(self) -> None:
     if os.path.exists("logfile.json"):
       with open("logfile.json", "r") as f:
@@ -14,67 +18,71 @@ class LoggingHandler:
   
   def info(self,
             message: str) -> None:
-    if datetime.now().strftime("%Y-%m-%d") not in self.log_data:
-      self.log_data[datetime.now().strftime("%Y-%m-%d")] = []
+    with self.lock:
+      if datetime.now().strftime("%Y-%m-%d") not in self.log_data:
+        self.log_data[datetime.now().strftime("%Y-%m-%d")] = []
 
-    self.log_data[datetime.now().strftime("%Y-%m-%d")].append(
-      {
-        "level": "info",
-        "message": message,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-      }
-    )
+      self.log_data[datetime.now().strftime("%Y-%m-%d")].append(
+        {
+          "level": "info",
+          "message": message,
+          "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+      )
 
-    with open("logfile.json", "w") as f:
-      json.dump(self.log_data, f, indent=2)
+      with open("logfile.json", "w") as f:
+        json.dump(self.log_data, f, indent=2)
   
 
   def warning(self,
             message: str) -> None:
-    if datetime.now().strftime("%Y-%m-%d") not in self.log_data:
-      self.log_data[datetime.now().strftime("%Y-%m-%d")] = []
+    with self.lock:
+      if datetime.now().strftime("%Y-%m-%d") not in self.log_data:
+        self.log_data[datetime.now().strftime("%Y-%m-%d")] = []
 
-    self.log_data[datetime.now().strftime("%Y-%m-%d")].append(
-      {
-        "level": "warning",
-        "message": message,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-      }
-    )
+      self.log_data[datetime.now().strftime("%Y-%m-%d")].append(
+        {
+          "level": "warning",
+          "message": message,
+          "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+      )
 
-    with open("logfile.json", "w") as f:
-      json.dump(self.log_data, f, indent=2)
+      with open("logfile.json", "w") as f:
+        json.dump(self.log_data, f, indent=2)
 
 
   def debug(self,
             message: str) -> None:
-    if datetime.now().strftime("%Y-%m-%d") not in self.log_data:
-      self.log_data[datetime.now().strftime("%Y-%m-%d")] = []
-    
-    self.log_data[datetime.now().strftime("%Y-%m-%d")].append(
-      {
-        "level": "debug",
-        "message": message,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-      }
-    )
+    with self.lock:
+      if datetime.now().strftime("%Y-%m-%d") not in self.log_data:
+        self.log_data[datetime.now().strftime("%Y-%m-%d")] = []
+      
+      self.log_data[datetime.now().strftime("%Y-%m-%d")].append(
+        {
+          "level": "debug",
+          "message": message,
+          "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+      )
 
-    with open("logfile.json", "w") as f:
-      json.dump(self.log_data, f, indent=2)
+      with open("logfile.json", "w") as f:
+        json.dump(self.log_data, f, indent=2)
   
 
   def error(self,
             message: str) -> None:
-    if datetime.now().strftime("%Y-%m-%d") not in self.log_data:
-      self.log_data[datetime.now().strftime("%Y-%m-%d")] = []
+    with self.lock:
+      if datetime.now().strftime("%Y-%m-%d") not in self.log_data:
+        self.log_data[datetime.now().strftime("%Y-%m-%d")] = []
 
-    self.log_data[datetime.now().strftime("%Y-%m-%d")].append(
-      {
-        "level": "error",
-        "message": message,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-      }
-    )
-    
-    with open("logfile.json", "w") as f:
-      json.dump(self.log_data, f, indent=2)
\ No newline at end of file
+      self.log_data[datetime.now().strftime("%Y-%m-%d")].append(
+        {
+          "level": "error",
+          "message": message,
+          "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+      )
+      
+      with open("logfile.json", "w") as f:
+        json.dump(self.log_data, f, indent=2)
\ No newline at end of file
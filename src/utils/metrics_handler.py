@@ -0,0 +1,327 @@
+import threading
+from time import perf_counter
+from contextlib import contextmanager
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class MetricsHandler:
+  """
+  A process-wide registry of counters, gauges and histograms, labelled by stage and program, which
+  is rendered in the Prometheus text exposition format so that the time of a scrape can be
+  broken down into its stages.
+  """
+
+
+  def __init__(self) -> None:
+    self.__lock = threading.Lock()
+    self.__descriptions = {}
+    self.__counters = {}
+    self.__gauges = {}
+    self.__histograms = {}
+
+
+  def __label_key(self,
+                  labels: dict | None) -> tuple:
+    """
+    Converts the labels into a hashable key with a stable order
+    """
+
+    return tuple(sorted((labels or {}).items()))
+
+
+  def describe(self,
+               name: str,
+               metric_type: str,
+               description: str) -> None:
+    """
+    Registers the type and the help text of a metric
+
+    Args:
+      - name (str): The name of the metric
+      - metric_type (str): The Prometheus type of the metric, 'counter', 'gauge' or 'histogram'
+      - description (str): The help text of the metric
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      self.__descriptions[name] = (metric_type, description)
+
+
+  def increment(self,
+                name: str,
+                labels: dict | None = None,
+                value: float = 1) -> None:
+    """
+    Increments a counter
+
+    Args:
+      - name (str): The name of the counter
+      - labels (dict | None): The labels of the counter
+      - value (float): The amount by which the counter is incremented
+
+    Returns:
+      - None
+    """
+
+    key = (name, self.__label_key(labels))
+    with self.__lock:
+      self.__counters[key] = self.__counters.get(key, 0) + value
+
+
+  def set_gauge(self,
+                name: str,
+                value: float,
+                labels: dict | None = None) -> None:
+    """
+    Sets a gauge to its current value
+
+    Args:
+      - name (str): The name of the gauge
+      - value (float): The current value of the gauge
+      - labels (dict | None): The labels of the gauge
+
+    Returns:
+      - None
+    """
+
+    key = (name, self.__label_key(labels))
+    with self.__lock:
+      self.__gauges[key] = value
+
+
+  def observe(self,
+              name: str,
+              value: float,
+              labels: dict | None = None) -> None:
+    """
+    Records an observation into a histogram
+
+    Args:
+      - name (str): The name of the histogram
+      - value (float): The observed value
+      - labels (dict | None): The labels of the histogram
+
+    Returns:
+      - None
+    """
+
+    key = (name, self.__label_key(labels))
+    with self.__lock:
+      histogram = self.__histograms.get(key)
+      if histogram is None:
+        histogram = self.__histograms[key] = [[0] * len(DEFAULT_BUCKETS), 0.0, 0]
+
+      for i, bucket in enumerate(DEFAULT_BUCKETS):
+        if value <= bucket:
+          histogram[0][i] += 1
+      histogram[1] += value
+      histogram[2] += 1
+
+
+  @contextmanager
+  def time_stage(self,
+                 stage: str,
+                 program: str | None):
+    """
+    Times the enclosed block into the stage duration histogram, counting it as an error
+    when it raises
+
+    Args:
+      - stage (str): The name of the stage, e.g. 'http_fetch' or 'mongo_write'
+      - program (str | None): The program being processed
+
+    Returns:
+      - None
+    """
+
+    labels = {
+      "stage": stage,
+      "program": program or "unknown",
+    }
+    start = perf_counter()
+    try:
+      yield
+    except Exception:
+      self.increment(
+        name="scraper_stage_errors_total",
+        labels=labels,
+      )
+      raise
+    finally:
+      self.observe(
+        name="scraper_stage_duration_seconds",
+        value=perf_counter() - start,
+        labels=labels,
+      )
+
+
+  def __escape_label_value(self,
+                           value) -> str:
+    """
+    Escapes the backslashes, double quotes and line feeds of a label value
+    """
+
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+  def __format_labels(self,
+                      label_key: tuple,
+                      extra_labels: tuple = ()) -> str:
+    """
+    Formats the labels of a sample in the Prometheus text format
+    """
+
+    labels = list(label_key) + list(extra_labels)
+    if not labels:
+      return ""
+
+    formatted_labels = ",".join(
+      f'{key}="{self.__escape_label_value(value)}"'
+      for key, value in labels
+    )
+    return "{" + formatted_labels + "}"
+
+
+  def render(self) -> str:
+    """
+    Renders every metric in the Prometheus text exposition format
+
+    Args:
+      - None
+
+    Returns:
+      - str: The metrics in the Prometheus text exposition format
+    """
+
+    with self.__lock:
+      counters = dict(self.__counters)
+      gauges = dict(self.__gauges)
+      histograms = {
+        key: [list(value[0]), value[1], value[2]]
+        for key, value in self.__histograms.items()
+      }
+      descriptions = dict(self.__descriptions)
+
+    lines = []
+    for name in sorted({key[0] for key in counters}):
+      metric_type, description = descriptions.get(name, ("counter", name))
+      lines.append(f"# HELP {name} {description}")
+      lines.append(f"# TYPE {name} {metric_type}")
+      for (counter_name, label_key), value in sorted(counters.items()):
+        if counter_name == name:
+          lines.append(f"{name}{self.__format_labels(label_key)} {value}")
+
+    for name in sorted({key[0] for key in gauges}):
+      metric_type, description = descriptions.get(name, ("gauge", name))
+      lines.append(f"# HELP {name} {description}")
+      lines.append(f"# TYPE {name} {metric_type}")
+      for (gauge_name, label_key), value in sorted(gauges.items()):
+        if gauge_name == name:
+          lines.append(f"{name}{self.__format_labels(label_key)} {value}")
+
+    for name in sorted({key[0] for key in histograms}):
+      metric_type, description = descriptions.get(name, ("histogram", name))
+      lines.append(f"# HELP {name} {description}")
+      lines.append(f"# TYPE {name} {metric_type}")
+      for (histogram_name, label_key), (bucket_counts, total, count) in sorted(histograms.items()):
+        if histogram_name != name:
+          continue
+        for bucket, bucket_count in zip(DEFAULT_BUCKETS, bucket_counts):
+          lines.append(f"{name}_bucket{self.__format_labels(label_key, (('le', bucket),))} {bucket_count}")
+        lines.append(f"{name}_bucket{self.__format_labels(label_key, (('le', '+Inf'),))} {count}")
+        lines.append(f"{name}_sum{self.__format_labels(label_key)} {total}")
+        lines.append(f"{name}_count{self.__format_labels(label_key)} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+metrics_handler = MetricsHandler()
+metrics_handler.describe(
+  name="scraper_stage_duration_seconds",
+  metric_type="histogram",
+  description="Time spent in each stage of a scrape, in seconds",
+)
+metrics_handler.describe(
+  name="scraper_stage_errors_total",
+  metric_type="counter",
+  description="Number of stage executions which raised an error",
+)
+metrics_handler.describe(
+  name="scraper_rate_limiter_wait_seconds",
+  metric_type="histogram",
+  description="Time spent waiting on the Gemini rate limiter, in seconds",
+)
+metrics_handler.describe(
+  name="scraper_cache_requests_total",
+  metric_type="counter",
+  description="Number of cache lookups by cache and result",
+)
+metrics_handler.describe(
+  name="scraper_retries_total",
+  metric_type="counter",
+  description="Number of retried calls by stage and reason",
+)
+metrics_handler.describe(
+  name="scraper_segregation_total",
+  metric_type="counter",
+  description="Number of course descriptions segregated by the rule based parser or by Gemini",
+)
+metrics_handler.describe(
+  name="scraper_http_concurrency_limit",
+  metric_type="gauge",
+  description="Number of requests allowed in flight to a host by the adaptive concurrency controller",
+)
+metrics_handler.describe(
+  name="scraper_http_responses_total",
+  metric_type="counter",
+  description="Number of HTTP responses by host and status code",
+)
+metrics_handler.describe(
+  name="scraper_single_flight_calls_total",
+  metric_type="counter",
+  description="Number of calls doing the work (leader) or awaiting an identical call in flight (coalesced)",
+)
+metrics_handler.describe(
+  name="scraper_pipeline_queue_depth",
+  metric_type="gauge",
+  description="Number of items waiting in front of a stage of a staged pipeline",
+)
+metrics_handler.describe(
+  name="scraper_pipeline_backpressure_seconds",
+  metric_type="histogram",
+  description="Time spent waiting to put an item in front of a stage of a staged pipeline, in seconds",
+)
+metrics_handler.describe(
+  name="scraper_gemini_requests_total",
+  metric_type="counter",
+  description="Number of Gemini calls by kind of call and finish reason",
+)
+metrics_handler.describe(
+  name="scraper_gemini_tokens_total",
+  metric_type="counter",
+  description="Number of Gemini prompt and output tokens by kind of call",
+)
+metrics_handler.describe(
+  name="scraper_model_tier_responses_total",
+  metric_type="counter",
+  description="Number of course descriptions accepted, rejected by the validation or failed, by model tier",
+)
+metrics_handler.describe(
+  name="scraper_snapshot_loads_total",
+  metric_type="counter",
+  description="Number of course catalog snapshots memory-mapped by the read API, once at startup and once per swap",
+)
+metrics_handler.describe(
+  name="scraper_search_duration_seconds",
+  metric_type="histogram",
+  description="Time spent answering a full-text search of the courses, in seconds",
+)
+metrics_handler.describe(
+  name="scraper_search_index_updates_total",
+  metric_type="counter",
+  description="Number of programs indexed by the full-text search index, when it is built and whenever a program is scraped again",
+)
\ No newline at end of file
@@ -0,0 +1,240 @@
+import os
+import sys
+import json
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from datetime import datetime
+from contextlib import contextmanager
+from consts import ProfilingConsts
+
+
+# tracemalloc and the profile hook of the new threads are process-wide, so the profiled
+# stages are run one at a time
+profiling_lock = threading.Lock()
+
+
+class StackSampler:
+  """
+  A sampling profiler which periodically records the call stacks of a set of threads, the
+  threads started while sampling being added by the caller, and writes the samples as
+  collapsed stacks ready to be rendered as a flamegraph.
+  """
+
+
+  def __init__(self,
+               thread_ids: set,
+               interval_seconds: float) -> None:
+    self.thread_ids = thread_ids
+    self.interval_seconds = interval_seconds
+    self.collapsed_stacks = {}
+    self.__stop_event = threading.Event()
+    self.__thread = threading.Thread(
+      target=self.__sample,
+      daemon=True,
+    )
+
+
+  def __sample(self) -> None:
+    """
+    Records the call stacks of the sampled threads until the sampler is stopped
+    """
+
+    while not self.__stop_event.wait(self.interval_seconds):
+      for thread_id, frame in sys._current_frames().items():
+        if thread_id not in self.thread_ids:
+          continue
+
+        stack = []
+        while frame is not None:
+          stack.append(f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_firstlineno})")
+          frame = frame.f_back
+
+        if stack:
+          collapsed_stack = ";".join(reversed(stack))
+          self.collapsed_stacks[collapsed_stack] = self.collapsed_stacks.get(collapsed_stack, 0) + 1
+
+
+  def start(self) -> None:
+    """
+    Starts sampling the threads in the background
+    """
+
+    self.__thread.start()
+
+
+  def stop(self) -> None:
+    """
+    Stops sampling the threads and waits for the sampler to finish
+    """
+
+    self.__stop_event.set()
+    self.__thread.join()
+
+
+  def dump(self,
+           file_path: str) -> None:
+    """
+    Writes the samples in the collapsed stack format, one 'frame;frame;frame count' per line
+    """
+
+    with open(file_path, "w") as f:
+      for collapsed_stack, count in sorted(self.collapsed_stacks.items()):
+        f.write(f"{collapsed_stack} {count}\n")
+
+
+class ProfilingHandler:
+  """
+  A class that profiles a stage of a run on demand. When enabled, the stage is run under
+  the deterministic profiler and a stack sampler while tracemalloc tracks its peak memory,
+  and the pstats, collapsed stacks and memory snapshot are saved tagged with the program.
+  The calling thread and the threads it starts during the stage, e.g. the fetch and the
+  segregation workers, are profiled, while the memory is traced for the whole process.
+  When disabled, the stage runs untouched.
+  """
+
+
+  def __init__(self,
+               logger) -> None:
+    self.logger = logger
+    profiling_consts = ProfilingConsts().get_constants()
+    self.enabled = profiling_consts["enabled"]
+    self.output_directory = profiling_consts["output_directory"]
+    self.sampling_interval_seconds = profiling_consts["sampling_interval_ms"] / 1000
+    self.artifacts = []
+
+
+  @contextmanager
+  def profile(self,
+              program: str,
+              stage: str,
+              enabled: bool = False):
+    """
+    Profiles the enclosed block if profiling is requested or enabled in the configuration
+
+    Args:
+      - program (str): The name of the program being processed, used to tag the artifacts
+      - stage (str): The name of the profiled stage, e.g. 'scrape_course_catalog'
+      - enabled (bool): Whether profiling is requested for this run
+
+    Returns:
+      - None
+    """
+
+    if not (enabled or self.enabled):
+      yield
+      return
+
+    with profiling_lock:
+      started_tracemalloc = not tracemalloc.is_tracing()
+      if started_tracemalloc:
+        tracemalloc.start()
+      tracemalloc.reset_peak()
+
+      profiler = cProfile.Profile()
+      thread_profilers = []
+      sampler = StackSampler(
+        thread_ids={threading.get_ident()},
+        interval_seconds=self.sampling_interval_seconds,
+      )
+
+      # Before Python 3.12 the deterministic profiler only sees the thread enabling it, so
+      # every thread started during the stage enables its own
+      def profile_thread(frame, event, arg) -> None:
+        sampler.thread_ids.add(threading.get_ident())
+        sys.setprofile(None)
+        if sys.version_info < (3, 12):
+          thread_profiler = cProfile.Profile()
+          thread_profilers.append(thread_profiler)
+          thread_profiler.enable()
+
+      threading.setprofile(profile_thread)
+      sampler.start()
+      profiler.enable()
+      try:
+        yield
+      finally:
+        profiler.disable()
+        threading.setprofile(None)
+        sampler.stop()
+        current_memory, peak_memory = tracemalloc.get_traced_memory()
+        memory_snapshot = tracemalloc.take_snapshot()
+        if started_tracemalloc:
+          tracemalloc.stop()
+
+        self.__save_artifacts(
+          program=program,
+          stage=stage,
+          profilers=[profiler, *thread_profilers],
+          sampler=sampler,
+          current_memory=current_memory,
+          peak_memory=peak_memory,
+          memory_snapshot=memory_snapshot,
+        )
+
+
+  def __save_artifacts(self,
+                       program: str,
+                       stage: str,
+                       profilers: list,
+                       sampler: StackSampler,
+                       current_memory: int,
+                       peak_memory: int,
+                       memory_snapshot: tracemalloc.Snapshot) -> None:
+    """
+    Saves the pstats, the collapsed stacks and the memory report of a profiled stage
+
+    Args:
+      - program (str): The name of the program being processed
+      - stage (str): The name of the profiled stage
+      - profilers (list): The deterministic profilers (cProfile.Profile) of the threads of the stage
+      - sampler (StackSampler): The stack sampler of the stage
+      - current_memory (int): The memory traced in the process at the end of the stage, in bytes
+      - peak_memory (int): The peak memory traced in the process during the stage, in bytes
+      - memory_snapshot (tracemalloc.Snapshot): The memory snapshot at the end of the stage
+
+    Returns:
+      - None
+    """
+
+    try:
+      program_directory = os.path.join(self.output_directory, program)
+      os.makedirs(program_directory, exist_ok=True)
+      file_prefix = os.path.join(
+        program_directory,
+        f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{stage}",
+      )
+
+      pstats.Stats(*[profiler for profiler in profilers if profiler.getstats()]).dump_stats(f"{file_prefix}.pstats")
+      sampler.dump(f"{file_prefix}.collapsed")
+      with open(f"{file_prefix}.memory.json", "w") as f:
+        json.dump(
+          {
+            "program": program,
+            "stage": stage,
+            "memory_scope": "process",
+            "current_memory_bytes": current_memory,
+            "peak_memory_bytes": peak_memory,
+            "top_allocations": [
+              {
+                "location": str(statistic.traceback),
+                "size_bytes": statistic.size,
+                "count": statistic.count,
+              }
+              for statistic in memory_snapshot.statistics("lineno")[:25]
+            ],
+          },
+          f,
+          indent=2,
+        )
+
+      self.artifacts.append(file_prefix)
+      self.logger.info(
+        message=f"Profiled the stage: {stage} of {program}, process peak memory: {peak_memory / (1024 * 1024):.2f} MB, artifacts saved at: {file_prefix}.*"
+      )
+
+    except Exception as e:
+      self.logger.error(
+        message=f"An error '{e}' occurred while saving the profile of the stage: {stage} of {program}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+      )
\ No newline at end of file
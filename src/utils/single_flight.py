@@ -0,0 +1,83 @@
+import threading
+from src.utils.metrics_handler import metrics_handler
+
+
+class InFlightCall:
+  """
+  A call in flight, which the callers coalesced onto it wait for
+  """
+
+
+  def __init__(self) -> None:
+    self.done = threading.Event()
+    self.result = None
+    self.error = None
+
+
+class SingleFlight:
+  """
+  A process-wide coalescing of the identical calls in flight. The first caller of a key does
+  the work while the callers arriving before it is done wait for, and share, its result or
+  its error. Nothing is kept once the call is done, so later callers do the work again.
+  """
+
+
+  def __init__(self,
+               name: str) -> None:
+    self.name = name
+    self.__calls = {}
+    self.__lock = threading.Lock()
+
+
+  def do(self,
+         key: str,
+         function,
+         program: str | None = None):
+    """
+    Calls a function, unless a call with the same key is already in flight, in which case
+    its result is awaited instead
+
+    Args:
+      - key (str): The key identifying the call, e.g. the course link
+      - function: The function to be called, without arguments
+      - program (str | None): The program being processed, used to label the metrics
+
+    Returns:
+      - The result of the function, raising its error if it failed
+    """
+
+    with self.__lock:
+      call = self.__calls.get(key)
+      is_leader = call is None
+      if is_leader:
+        call = self.__calls[key] = InFlightCall()
+
+    metrics_handler.increment(
+      name="scraper_single_flight_calls_total",
+      labels={"group": self.name, "result": "leader" if is_leader else "coalesced", "program": program or "unknown"},
+    )
+
+    if not is_leader:
+      call.done.wait()
+      if call.error is not None:
+        raise call.error
+      return call.result
+
+    try:
+      call.result = function()
+      return call.result
+    except Exception as e:
+      call.error = e
+      raise
+    finally:
+      with self.__lock:
+        del self.__calls[key]
+      call.done.set()
+
+
+course_page_fetches = SingleFlight(
+  name="course_page_fetch"
+)
+course_description_segregations = SingleFlight(
+  name="course_description_segregation"
+)
\ No newline at end of file
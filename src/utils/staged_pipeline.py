@@ -0,0 +1,219 @@
+import queue
+import threading
+from time import perf_counter
+from src.utils.metrics_handler import metrics_handler
+
+
+class PipelineStage:
+  """
+  A stage of a staged pipeline: a function applied by its own pool of workers to the items
+  taken from the bounded queue in front of the stage. A batching stage hands the function
+  every item waiting in its queue, up to the batch size, at once.
+  """
+
+
+  def __init__(self,
+               name: str,
+               function,
+               workers: int,
+               queue_size: int,
+               batch_size: int | None = None) -> None:
+    self.name = name
+    self.function = function
+    self.workers = max(1, workers)
+    self.queue_size = max(1, queue_size)
+    self.batch_size = batch_size
+
+
+class StagedPipeline:
+  """
+  A pipeline of stages joined by bounded queues. A worker putting into a full queue blocks
+  until the next stage catches up, so the fastest stage never runs ahead of the slowest by more
+  than a queue, and the depth of every queue is published as a gauge to spot the bottleneck.
+  A function returning None drops the item, and a function raising drops it as an error,
+  unless the error is one of the fatal errors of the pipeline: the pipeline then stops taking
+  new items, drops those waiting in front of the failed stage and of the stages before it, 
+  lets the later stages finish the items they already hold, and raises the error once every
+  worker is done.
+  """
+
+  __end_of_stream = object()
+
+
+  def __init__(self,
+               logger,
+               name: str,
+               stages: list,
+               program: str | None = None,
+               fatal_errors: tuple = ()) -> None:
+    self.logger = logger
+    self.name = name
+    self.stages = stages
+    self.program = program or "unknown"
+    self.fatal_errors = fatal_errors
+
+
+  def __publish_queue_depth(self,
+                            stage: PipelineStage,
+                            stage_queue: queue.Queue) -> None:
+    """
+    Publishes the number of items waiting in front of a stage
+    """
+
+    metrics_handler.set_gauge(
+      name="scraper_pipeline_queue_depth",
+      value=stage_queue.qsize(),
+      labels={"pipeline": self.name, "stage": stage.name, "program": self.program},
+    )
+
+
+  def __put(self,
+            stage: PipelineStage,
+            stage_queue: queue.Queue,
+            item) -> None:
+    """
+    Puts an item in front of a stage, recording how long the caller was held back by a full queue
+    """
+
+    start = perf_counter()
+    stage_queue.put(item)
+    metrics_handler.observe(
+      name="scraper_pipeline_backpressure_seconds",
+      value=perf_counter() - start,
+      labels={"pipeline": self.name, "stage": stage.name, "program": self.program},
+    )
+    self.__publish_queue_depth(stage, stage_queue)
+
+
+  def __take(self,
+             stage: PipelineStage,
+             stage_queue: queue.Queue) -> list:
+    """
+    Takes the next item, or for a batching stage every waiting item up to the batch size,
+    the end of the stream being returned alone
+    """
+
+    items = [stage_queue.get()]
+    while stage.batch_size and len(items) < stage.batch_size and items[-1] is not self.__end_of_stream:
+      try:
+        items.append(stage_queue.get_nowait())
+      except queue.Empty:
+        break
+
+    self.__publish_queue_depth(stage, stage_queue)
+    if items[-1] is self.__end_of_stream and len(items) > 1:
+      stage_queue.put(items.pop())
+    return items
+
+
+  def __work(self,
+             stage_index: int,
+             stage_queues: list,
+             results: list,
+             finished_workers: list,
+             abort: dict,
+             lock: threading.Lock) -> None:
+    """
+    Runs a worker of a stage until the end of the stream reaches it, then hands the end of
+    the stream to the next stage once every worker of the stage is done
+
+    Args:
+      - stage_index (int): The index of the stage of the worker
+      - stage_queues (list): The queue in front of every stage
+      - results (list): The items coming out of the last stage
+      - finished_workers (list): The number of workers done, per stage
+      - abort (dict): The fatal error which aborted the pipeline and the index of its stage
+      - lock (threading.Lock): The lock guarding the results, the finished workers and the abort
+
+    Returns:
+      - None
+    """
+
+    stage = self.stages[stage_index]
+    stage_queue = stage_queues[stage_index]
+    is_last_stage = stage_index == len(self.stages) - 1
+
+    while True:
+      items = self.__take(stage, stage_queue)
+      if items[0] is self.__end_of_stream:
+        break
+      if abort["error"] is not None and stage_index <= abort["stage_index"]:
+        continue
+
+      try:
+        with metrics_handler.time_stage(stage.name, self.program):
+          outputs = stage.function(items) if stage.batch_size else [stage.function(items[0])]
+      except self.fatal_errors as e:
+        with lock:
+          if abort["error"] is None:
+            abort["error"], abort["stage_index"] = e, stage_index
+        self.logger.error(
+          message=f"A fatal error '{e}' occurred in the stage: {stage.name} of the pipeline: {self.name}, the pipeline is aborted.",
+        )
+        continue
+      except Exception as e:
+        self.logger.error(
+          message=f"An error '{e}' occurred in the stage: {stage.name} of the pipeline: {self.name}. At line {e.__traceback__.tb_lineno} in {__file__}.",
+        )
+        continue
+
+      for output in outputs or []:
+        if output is None:
+          continue
+        if is_last_stage:
+          with lock:
+            results.append(output)
+        else:
+          self.__put(self.stages[stage_index + 1], stage_queues[stage_index + 1], output)
+
+    with lock:
+      finished_workers[stage_index] += 1
+      is_last_worker = finished_workers[stage_index] == stage.workers
+    if is_last_worker and not is_last_stage:
+      for _ in range(self.stages[stage_index + 1].workers):
+        stage_queues[stage_index + 1].put(self.__end_of_stream)
+
+
+  def run(self,
+          items) -> list:
+    """
+    Runs the items through every stage of the pipeline
+
+    Args:
+      - items: The items fed to the first stage
+
+    Returns:
+      - list: The items coming out of the last stage, in the order they came out
+    """
+
+    stage_queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+    results = []
+    finished_workers = [0] * len(self.stages)
+    abort = {"error": None, "stage_index": None}
+    lock = threading.Lock()
+
+    workers = [
+      threading.Thread(
+        target=self.__work,
+        args=(stage_index, stage_queues, results, finished_workers, abort, lock),
+        name=f"{self.name}-{stage.name}-{worker_index}",
+        daemon=True,
+      )
+      for stage_index, stage in enumerate(self.stages)
+      for worker_index in range(stage.workers)
+    ]
+    for worker in workers:
+      worker.start()
+
+    for item in items:
+      if abort["error"] is not None:
+        break
+      self.__put(self.stages[0], stage_queues[0], item)
+    for _ in range(self.stages[0].workers):
+      stage_queues[0].put(self.__end_of_stream)
+
+    for worker in workers:
+      worker.join()
+    if abort["error"] is not None:
+      raise abort["error"]
+    return results
@@ -0,0 +1,480 @@
+import copy
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from consts import MondoDBConsts, StorageConsts
+
+
+def apply_projection(document: dict,
+                     projection: dict | None) -> dict:
+  """
+  Applies an inclusion projection, whose keys may be dotted paths, to a document the way
+  MongoDB does, always keeping the document ID
+
+  Args:
+    - document (dict): The document to be projected
+    - projection (dict | None): The fields to be included, the whole document if not given
+
+  Returns:
+    - dict: The projected document
+  """
+
+  if not projection:
+    return document
+
+  projected_document = {"_id": document["_id"]} if "_id" in document else {}
+  for path in projection:
+    keys = path.split(".")
+    source, target = document, projected_document
+    for key in keys[:-1]:
+      if not isinstance(source, dict) or key not in source:
+        break
+      source = source[key]
+      target = target.setdefault(key, {})
+    else:
+      if isinstance(source, dict) and keys[-1] in source:
+        target[keys[-1]] = source[keys[-1]]
+
+  return projected_document
+
+
+class StorageBackend(ABC):
+  """
+  The interface every storage backend implements. Documents live in a collection of a
+  database and are addressed by their document ID, the way they are in MongoDB.
+  """
+
+  name = "storage"
+
+
+  @abstractmethod
+  def replace_one(self,
+                  database: str,
+                  collection: str,
+                  document_id: str,
+                  document: dict) -> None:
+    """
+    Inserts a document, replacing the document stored with the same ID
+    """
+
+
+  @abstractmethod
+  def bulk_replace(self,
+                   database: str,
+                   collection: str,
+                   documents: dict) -> None:
+    """
+    Inserts a batch of documents keyed by their ID, replacing the documents stored with the
+    same IDs
+    """
+
+
+  @abstractmethod
+  def find_one(self,
+               database: str,
+               collection: str,
+               document_id: str,
+               projection: dict | None = None) -> dict | None:
+    """
+    Returns the document with an ID, None if it does not exist
+    """
+
+
+  @abstractmethod
+  def find(self,
+           database: str,
+           collection: str,
+           document_ids: list | None = None,
+           projection: dict | None = None) -> list:
+    """
+    Returns the documents with the given IDs, every document of the collection if not given
+    """
+
+
+  @abstractmethod
+  def find_one_with_field(self,
+                          database: str,
+                          collection: str,
+                          field: str,
+                          projection: dict | None = None) -> dict | None:
+    """
+    Returns the first document having a top level field, None if there is none
+    """
+
+
+  def create_index(self,
+                   database: str,
+                   collection: str,
+                   field: str,
+                   unique: bool = False) -> None:
+    """
+    Creates an index on a field, a no-op for the backends which only look documents up by ID
+    """
+
+    return None
+
+
+  @abstractmethod
+  def list_collections(self) -> list:
+    """
+    Returns every (database, collection) pair holding documents
+    """
+
+
+class MongoStorageBackend(StorageBackend):
+  """
+  The storage backend writing to the MongoDB Atlas cluster. The client connects on the first
+  operation rather than on construction.
+  """
+
+  name = "mongo"
+
+
+  def __init__(self,
+               host: str) -> None:
+    self.host = host
+    self.__client = None
+    self.__lock = threading.Lock()
+
+
+  def __collection(self,
+                   database: str,
+                   collection: str):
+    """
+    Returns a collection of the cluster, connecting to it on the first call
+    """
+
+    import pymongo
+
+    with self.__lock:
+      if self.__client is None:
+        self.__client = pymongo.MongoClient(
+          host=self.host,
+        )
+    return self.__client[database][collection]
+
+
+  def replace_one(self,
+                  database: str,
+                  collection: str,
+                  document_id: str,
+                  document: dict) -> None:
+    self.__collection(database, collection).replace_one(
+      filter={"_id": document_id},
+      replacement=document,
+      upsert=True,
+    )
+
+
+  def bulk_replace(self,
+                   database: str,
+                   collection: str,
+                   documents: dict) -> None:
+    import pymongo
+
+    if not documents:
+      return None
+
+    self.__collection(database, collection).bulk_write(
+      requests=[
+        pymongo.ReplaceOne(
+          filter={"_id": document_id},
+          replacement=document,
+          upsert=True,
+        )
+        for document_id, document in documents.items()
+      ],
+      ordered=False,
+    )
+    return None
+
+
+  def find_one(self,
+               database: str,
+               collection: str,
+               document_id: str,
+               projection: dict | None = None) -> dict | None:
+    return self.__collection(database, collection).find_one(
+      filter={"_id": document_id},
+      projection=projection,
+    )
+
+
+  def find(self,
+           database: str,
+           collection: str,
+           document_ids: list | None = None,
+           projection: dict | None = None) -> list:
+    query = {"_id": {"$in": document_ids}} if document_ids is not None else {}
+    return list(self.__collection(database, collection).find(
+      filter=query,
+      projection=projection,
+    ))
+
+
+  def find_one_with_field(self,
+                          database: str,
+                          collection: str,
+                          field: str,
+                          projection: dict | None = None) -> dict | None:
+    return self.__collection(database, collection).find_one(
+      filter={field: {"$exists": True}},
+      projection=projection,
+    )
+
+
+  def create_index(self,
+                   database: str,
+                   collection: str,
+                   field: str,
+                   unique: bool = False) -> None:
+    import pymongo
+
+    self.__collection(database, collection).create_index(
+      keys=[(field, pymongo.ASCENDING)],
+      unique=unique,
+    )
+    return None
+
+
+  def list_collections(self) -> list:
+    self.__collection("admin", "system.version")
+    return [
+      (database, collection)
+      for database in self.__client.list_database_names()
+      if database not in ("admin", "local", "config")
+      for collection in self.__client[database].list_collection_names()
+    ]
+
+
+class SQLiteStorageBackend(StorageBackend):
+  """
+  The storage backend writing the documents as JSON into a local SQLite database, so that
+  large crawls write at local disk speed and are shipped to MongoDB afterwards.
+  """
+
+  name = "sqlite"
+
+
+  def __init__(self,
+               database_path: str) -> None:
+    self.database_path = database_path
+    self.__lock = threading.Lock()
+    self.__connection = sqlite3.connect(
+      database=database_path,
+      check_same_thread=False,
+    )
+    self.__connection.execute("PRAGMA journal_mode=WAL")
+    self.__connection.execute("PRAGMA synchronous=NORMAL")
+    self.__connection.execute(
+      """
+      CREATE TABLE IF NOT EXISTS documents (
+        database_name TEXT NOT NULL,
+        collection_name TEXT NOT NULL,
+        document_id TEXT NOT NULL,
+        document TEXT NOT NULL,
+        PRIMARY KEY (database_name, collection_name, document_id)
+      )
+      """
+    )
+    self.__connection.commit()
+
+
+  def replace_one(self,
+                  database: str,
+                  collection: str,
+                  document_id: str,
+                  document: dict) -> None:
+    self.bulk_replace(
+      database=database,
+      collection=collection,
+      documents={document_id: document},
+    )
+
+
+  def bulk_replace(self,
+                   database: str,
+                   collection: str,
+                   documents: dict) -> None:
+    with self.__lock:
+      self.__connection.executemany(
+        "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+        [
+          (database, collection, str(document_id), json.dumps(document | {"_id": document_id}, default=str))
+          for document_id, document in documents.items()
+        ]
+      )
+      self.__connection.commit()
+
+
+  def find_one(self,
+               database: str,
+               collection: str,
+               document_id: str,
+               projection: dict | None = None) -> dict | None:
+    with self.__lock:
+      row = self.__connection.execute(
+        "SELECT document FROM documents WHERE database_name = ? AND collection_name = ? AND document_id = ?",
+        (database, collection, str(document_id))
+      ).fetchone()
+    return apply_projection(json.loads(row[0]), projection) if row else None
+
+
+  def find(self,
+           database: str,
+           collection: str,
+           document_ids: list | None = None,
+           projection: dict | None = None) -> list:
+    with self.__lock:
+      if document_ids is None:
+        rows = self.__connection.execute(
+          "SELECT document FROM documents WHERE database_name = ? AND collection_name = ? ORDER BY rowid",
+          (database, collection)
+        ).fetchall()
+      else:
+        rows = []
+        document_ids = [str(document_id) for document_id in document_ids]
+        for i in range(0, len(document_ids), 500):
+          batch = document_ids[i:i + 500]
+          rows += self.__connection.execute(
+            f"SELECT document FROM documents WHERE database_name = ? AND collection_name = ? AND document_id IN ({', '.join('?' * len(batch))})",
+            (database, collection, *batch)
+          ).fetchall()
+    return [apply_projection(json.loads(row[0]), projection) for row in rows]
+
+
+  def find_one_with_field(self,
+                          database: str,
+                          collection: str,
+                          field: str,
+                          projection: dict | None = None) -> dict | None:
+    for document in self.find(database, collection):
+      if field in document:
+        return apply_projection(document, projection)
+    return None
+
+
+  def list_collections(self) -> list:
+    with self.__lock:
+      return [
+        tuple(row)
+        for row in self.__connection.execute(
+          "SELECT DISTINCT database_name, collection_name FROM documents"
+        ).fetchall()
+      ]
+
+
+class InMemoryStorageBackend(StorageBackend):
+  """
+  The storage backend keeping the documents in the memory of the process, for the offline
+  runs and benchmarks which should not need any database.
+  """
+
+  name = "memory"
+
+
+  def __init__(self) -> None:
+    self.__lock = threading.Lock()
+    self.__collections = {}
+
+
+  def replace_one(self,
+                  database: str,
+                  collection: str,
+                  document_id: str,
+                  document: dict) -> None:
+    self.bulk_replace(
+      database=database,
+      collection=collection,
+      documents={document_id: document},
+    )
+
+
+  def bulk_replace(self,
+                   database: str,
+                   collection: str,
+                   documents: dict) -> None:
+    with self.__lock:
+      stored_documents = self.__collections.setdefault((database, collection), {})
+      for document_id, document in documents.items():
+        stored_documents[document_id] = copy.deepcopy(document) | {"_id": document_id}
+
+
+  def find_one(self,
+               database: str,
+               collection: str,
+               document_id: str,
+               projection: dict | None = None) -> dict | None:
+    with self.__lock:
+      document = self.__collections.get((database, collection), {}).get(document_id)
+      return apply_projection(copy.deepcopy(document), projection) if document is not None else None
+
+
+  def find(self,
+           database: str,
+           collection: str,
+           document_ids: list | None = None,
+           projection: dict | None = None) -> list:
+    with self.__lock:
+      stored_documents = self.__collections.get((database, collection), {})
+      if document_ids is None:
+        documents = list(stored_documents.values())
+      else:
+        documents = [stored_documents[document_id] for document_id in document_ids if document_id in stored_documents]
+      return [apply_projection(copy.deepcopy(document), projection) for document in documents]
+
+
+  def find_one_with_field(self,
+                          database: str,
+                          collection: str,
+                          field: str,
+                          projection: dict | None = None) -> dict | None:
+    with self.__lock:
+      for document in self.__collections.get((database, collection), {}).values():
+        if field in document:
+          return apply_projection(copy.deepcopy(document), projection)
+    return None
+
+
+  def list_collections(self) -> list:
+    with self.__lock:
+      return list(self.__collections.keys())
+
+
+storage_backends = {}
+storage_backends_lock = threading.Lock()
+
+
+def get_storage_backend(backend_name: str | None = None) -> StorageBackend:
+  """
+  Returns the process-wide storage backend configured in the STORAGE_CONSTS section, so
+  that every handler of the process shares the same connection or in-memory documents
+
+  Args:
+    - backend_name (str | None): The backend to be returned, 'mongo', 'sqlite' or 'memory',
+                                 the configured backend if not given
+
+  Returns:
+    - StorageBackend: The storage backend
+  """
+
+  storage_consts = StorageConsts().get_constants()
+  backend_name = backend_name or storage_consts["backend"]
+
+  with storage_backends_lock:
+    if backend_name not in storage_backends:
+      if backend_name == "mongo":
+        storage_backends[backend_name] = MongoStorageBackend(
+          host=MondoDBConsts().get_constants()["host"],
+        )
+      elif backend_name == "sqlite":
+        storage_backends[backend_name] = SQLiteStorageBackend(
+          database_path=storage_consts["sqlite_database"],
+        )
+      elif backend_name == "memory":
+        storage_backends[backend_name] = InMemoryStorageBackend()
+      else:
+        raise ValueError(f"Unknown storage backend: {backend_name}, expected one of 'mongo', 'sqlite' or 'memory'")
+
+    return storage_backends[backend_name]
\ No newline at end of file
@@ -0,0 +1,181 @@
+import threading
+from src.utils.metrics_handler import metrics_handler
+
+
+class BudgetExhaustedError(Exception):
+  """
+  Raised when a scrape run ran out of its Gemini token or request budget and is set to stop
+  """
+
+
+class UsageAccountant:
+  """
+  An accounting of the Gemini calls of every scrape run: the prompt and output tokens, the
+  latency, the retries and the finish reasons, added up per run and per course. A run may be
+  given a token and a request budget, once exhausted the run either degrades to the rule
+  based parser or stops calling Gemini.
+  """
+
+
+  def __init__(self,
+               logger,
+               max_tokens_per_run: int,
+               max_requests_per_run: int,
+               on_budget_exhausted: str) -> None:
+    self.logger = logger
+    self.max_tokens_per_run = max_tokens_per_run
+    self.max_requests_per_run = max_requests_per_run
+    self.on_budget_exhausted = on_budget_exhausted
+    self.__runs = {}
+    self.__lock = threading.Lock()
+
+
+  @staticmethod
+  def build_totals() -> dict:
+    """
+    Builds the empty usage totals of a run
+    """
+
+    return {
+      "requests": 0,
+      "prompt_tokens": 0,
+      "output_tokens": 0,
+      "total_tokens": 0,
+      "latency_seconds": 0.0,
+      "retries": 0,
+      "finish_reasons": {},
+      "by_kind": {},
+      "by_course": {},
+      "budget_exhausted": False,
+    }
+
+
+  def start_run(self,
+                program: str,
+                run_id: str,
+                totals: dict | None = None) -> None:
+    """
+    Starts accounting a run, carrying on from the totals of the run when it is resumed
+
+    Args:
+      - program (str): The program being scraped
+      - run_id (str): The identifier of the scrape run
+      - totals (dict | None): The totals persisted by the run so far, if it is resumed
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      self.__runs[(program, run_id)] = self.build_totals() | (totals or {})
+
+
+  def record(self,
+             program: str,
+             run_id: str,
+             kind: str,
+             course: str | None,
+             prompt_tokens: int,
+             output_tokens: int,
+             latency_seconds: float,
+             finish_reason: str,
+             retry: bool = False) -> None:
+    """
+    Records a Gemini call of a run
+
+    Args:
+      - program (str): The program being scraped
+      - run_id (str): The identifier of the scrape run
+      - kind (str): The kind of the call, e.g. 'priming', 'segregation' or 'embedding'
+      - course (str | None): The code of the course the call was made for
+      - prompt_tokens (int): The tokens of the prompt
+      - output_tokens (int): The tokens of the output
+      - latency_seconds (float): The latency of the call in seconds
+      - finish_reason (str): The finish reason of the call, e.g. 'STOP' or 'RECITATION'
+      - retry (bool): Whether the call retried an earlier call
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      totals = self.__runs.setdefault((program, run_id), self.build_totals())
+      totals["requests"] += 1
+      totals["prompt_tokens"] += prompt_tokens
+      totals["output_tokens"] += output_tokens
+      totals["total_tokens"] += prompt_tokens + output_tokens
+      totals["latency_seconds"] += latency_seconds
+      totals["retries"] += int(retry)
+      totals["finish_reasons"][finish_reason] = totals["finish_reasons"].get(finish_reason, 0) + 1
+      totals["by_kind"][kind] = totals["by_kind"].get(kind, 0) + prompt_tokens + output_tokens
+      if course:
+        totals["by_course"][course] = totals["by_course"].get(course, 0) + prompt_tokens + output_tokens
+
+    labels = {"program": program, "kind": kind}
+    metrics_handler.increment(
+      name="scraper_gemini_requests_total",
+      labels=labels | {"finish_reason": finish_reason},
+    )
+    metrics_handler.increment(
+      name="scraper_gemini_tokens_total",
+      labels=labels | {"type": "prompt"},
+      value=prompt_tokens,
+    )
+    metrics_handler.increment(
+      name="scraper_gemini_tokens_total",
+      labels=labels | {"type": "output"},
+      value=output_tokens,
+    )
+
+
+  def has_budget(self,
+                 program: str,
+                 run_id: str) -> bool:
+    """
+    Returns whether a run may still call Gemini, logging the first time it may not
+
+    Args:
+      - program (str): The program being scraped
+      - run_id (str): The identifier of the scrape run
+
+    Returns:
+      - bool: True if neither the token nor the request budget of the run is exhausted
+    """
+
+    with self.__lock:
+      totals = self.__runs.setdefault((program, run_id), self.build_totals())
+      is_exhausted = (
+        (self.max_tokens_per_run > 0 and totals["total_tokens"] >= self.max_tokens_per_run)
+        or (self.max_requests_per_run > 0 and totals["requests"] >= self.max_requests_per_run)
+      )
+      is_newly_exhausted = is_exhausted and not totals["budget_exhausted"]
+      totals["budget_exhausted"] = totals["budget_exhausted"] or is_exhausted
+
+    if is_newly_exhausted:
+      self.logger.warning(
+        message=f"The run: {run_id} of {program} exhausted its Gemini budget after {totals['requests']} requests and {totals['total_tokens']} tokens, it will {self.on_budget_exhausted} from now on"
+      )
+    return not is_exhausted
+
+
+  def get_totals(self,
+                 program: str,
+                 run_id: str) -> dict:
+    """
+    Returns the usage totals of a run
+
+    Args:
+      - program (str): The program being scraped
+      - run_id (str): The identifier of the scrape run
+
+    Returns:
+      - dict: The usage totals of the run
+    """
+
+    with self.__lock:
+      totals = self.__runs.get((program, run_id), self.build_totals())
+      return totals | {
+        "finish_reasons": dict(totals["finish_reasons"]),
+        "by_kind": dict(totals["by_kind"]),
+        "by_course": dict(totals["by_course"]),
+      }
\ No newline at end of file
@@ -0,0 +1,520 @@
+import copy
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from consts import MondoDBConsts, WorkQueueConsts
+
+
+WORK_QUEUE_DATABASE = "work_queue"
+WORK_ITEMS_COLLECTION = "work_items"
+EXPIRED_LEASE_ERROR = "The lease expired on the last attempt"
+
+
+class WorkQueue(ABC):
+  """
+  The interface of the lease based work queue shared by the worker processes. A worker
+  claims a pending item, or an item whose lease expired, for a limited time and either
+  completes it or fails it, a failed item being retried until it runs out of attempts. An
+  item whose lease expires on its last attempt, its worker having died, is failed for good
+  by the workers polling the queue, or when the items of its program are counted.
+  """
+
+  name = "work_queue"
+
+
+  def __init__(self,
+               lease_seconds: float,
+               max_attempts: int) -> None:
+    self.lease_seconds = lease_seconds
+    self.max_attempts = max_attempts
+
+
+  def build_item(self,
+                 item_id: str,
+                 kind: str,
+                 program: str,
+                 payload: dict) -> dict:
+    """
+    Builds the document of a new pending work item
+    """
+
+    return {
+      "_id": item_id,
+      "kind": kind,
+      "program": program,
+      "payload": payload,
+      "status": "pending",
+      "attempts": 0,
+      "lease_owner": None,
+      "lease_expires_at": None,
+      "enqueued_at": datetime.now(timezone.utc),
+      "result": None,
+      "error": None,
+    }
+
+
+  @abstractmethod
+  def enqueue(self,
+              item_id: str,
+              kind: str,
+              program: str,
+              payload: dict) -> bool:
+    """
+    Adds a work item, unless an item with the same ID was already enqueued
+
+    Args:
+      - item_id (str): The ID of the work item
+      - kind (str): The kind of the work item, e.g. 'program' or 'course'
+      - program (str): The program the work item belongs to
+      - payload (dict): The data the worker needs to process the item
+
+    Returns:
+      - bool: True if the item was added, False if it already existed
+    """
+
+
+  @abstractmethod
+  def claim(self,
+            worker_id: str,
+            kinds: list | None = None) -> dict | None:
+    """
+    Leases the oldest claimable work item to a worker
+
+    Args:
+      - worker_id (str): The ID of the worker claiming the item
+      - kinds (list | None): The kinds of work items the worker accepts, all kinds if not given
+
+    Returns:
+      - dict | None: The claimed work item, None if there is nothing to claim
+    """
+
+
+  @abstractmethod
+  def complete(self,
+               item_id: str,
+               worker_id: str,
+               result=None) -> bool:
+    """
+    Marks a work item leased by a worker as done
+
+    Args:
+      - item_id (str): The ID of the work item
+      - worker_id (str): The ID of the worker holding the lease
+      - result: The result of the work item, stored for the items depending on it
+
+    Returns:
+      - bool: True if the worker still held the lease, False otherwise
+    """
+
+
+  @abstractmethod
+  def fail(self,
+           item_id: str,
+           worker_id: str,
+           error: str) -> bool:
+    """
+    Releases a work item leased by a worker after it failed, to be retried unless it ran out
+    of attempts
+
+    Args:
+      - item_id (str): The ID of the work item
+      - worker_id (str): The ID of the worker holding the lease
+      - error (str): The reason of the failure
+
+    Returns:
+      - bool: True if the worker still held the lease, False otherwise
+    """
+
+
+  @abstractmethod
+  def fail_expired_leases(self,
+                          program: str | None = None,
+                          kind: str | None = None) -> list:
+    """
+    Fails for good the work items whose lease expired on their last attempt, which could
+    otherwise never be claimed again nor finish
+
+    Args:
+      - program (str | None): The program whose items are failed, all the programs if not given
+      - kind (str | None): The kind of the items failed, all the kinds if not given
+
+    Returns:
+      - list: The work items failed
+    """
+
+
+  @abstractmethod
+  def count_unfinished(self,
+                       program: str,
+                       kind: str) -> int:
+    """
+    Returns the number of work items of a program which are neither done nor failed for good
+    """
+
+
+  @abstractmethod
+  def get_results(self,
+                  program: str,
+                  kind: str) -> list:
+    """
+    Returns the payload and the result of the done work items of a program
+    """
+
+
+class MongoWorkQueue(WorkQueue):
+  """
+  The work queue stored in a MongoDB collection, shared by the workers of every node. The
+  items are claimed atomically with find_one_and_update, so no two workers hold the same lease.
+  """
+
+  name = "mongo"
+
+
+  def __init__(self,
+               host: str,
+               lease_seconds: float,
+               max_attempts: int) -> None:
+    super().__init__(
+      lease_seconds=lease_seconds,
+      max_attempts=max_attempts,
+    )
+    self.host = host
+    self.__collection = None
+    self.__lock = threading.Lock()
+
+
+  def __get_collection(self):
+    """
+    Returns the work items collection, connecting to the MongoDB on the first call
+    """
+
+    import pymongo
+
+    with self.__lock:
+      if self.__collection is None:
+        self.__collection = pymongo.MongoClient(
+          host=self.host,
+        )[WORK_QUEUE_DATABASE][WORK_ITEMS_COLLECTION]
+        self.__collection.create_index(
+          keys=[("status", pymongo.ASCENDING), ("kind", pymongo.ASCENDING), ("enqueued_at", pymongo.ASCENDING)],
+        )
+        self.__collection.create_index(
+          keys=[("program", pymongo.ASCENDING), ("kind", pymongo.ASCENDING), ("status", pymongo.ASCENDING)],
+        )
+      return self.__collection
+
+
+  def enqueue(self,
+              item_id: str,
+              kind: str,
+              program: str,
+              payload: dict) -> bool:
+    item = self.build_item(item_id, kind, program, payload)
+    update_result = self.__get_collection().update_one(
+      filter={"_id": item_id},
+      update={"$setOnInsert": {key: value for key, value in item.items() if key != "_id"}},
+      upsert=True,
+    )
+    return update_result.upserted_id is not None
+
+
+  def claim(self,
+            worker_id: str,
+            kinds: list | None = None) -> dict | None:
+    import pymongo
+
+    now = datetime.now(timezone.utc)
+    query = {
+      "$or": [
+        {"status": "pending"},
+        {"status": "leased", "lease_expires_at": {"$lt": now}},
+      ],
+      "attempts": {"$lt": self.max_attempts},
+    }
+    if kinds:
+      query["kind"] = {"$in": kinds}
+
+    return self.__get_collection().find_one_and_update(
+      filter=query,
+      update={
+        "$set": {
+          "status": "leased",
+          "lease_owner": worker_id,
+          "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+        },
+        "$inc": {"attempts": 1},
+      },
+      sort=[("enqueued_at", pymongo.ASCENDING)],
+      return_document=pymongo.ReturnDocument.AFTER,
+    )
+
+
+  def complete(self,
+               item_id: str,
+               worker_id: str,
+               result=None) -> bool:
+    update_result = self.__get_collection().update_one(
+      filter={"_id": item_id, "status": "leased", "lease_owner": worker_id},
+      update={"$set": {"status": "done", "lease_expires_at": None, "result": result}},
+    )
+    return update_result.modified_count == 1
+
+
+  def fail(self,
+           item_id: str,
+           worker_id: str,
+           error: str) -> bool:
+    collection = self.__get_collection()
+    item = collection.find_one(
+      filter={"_id": item_id, "status": "leased", "lease_owner": worker_id},
+      projection={"attempts": 1},
+    )
+    if item is None:
+      return False
+
+    update_result = collection.update_one(
+      filter={"_id": item_id, "status": "leased", "lease_owner": worker_id},
+      update={"$set": {
+        "status": "failed" if item["attempts"] >= self.max_attempts else "pending",
+        "lease_owner": None,
+        "lease_expires_at": None,
+        "error": error,
+      }},
+    )
+    return update_result.modified_count == 1
+
+
+  def fail_expired_leases(self,
+                          program: str | None = None,
+                          kind: str | None = None) -> list:
+    collection = self.__get_collection()
+    query = {"status": "leased", "lease_expires_at": {"$lt": datetime.now(timezone.utc)}, "attempts": {"$gte": self.max_attempts}}
+    if program is not None:
+      query["program"] = program
+    if kind is not None:
+      query["kind"] = kind
+
+    failed_items = []
+    for item in collection.find(filter=query):
+      update_result = collection.update_one(
+        filter={"_id": item["_id"], "status": "leased", "lease_owner": item["lease_owner"], "attempts": item["attempts"]},
+        update={"$set": {
+          "status": "failed",
+          "lease_owner": None,
+          "lease_expires_at": None,
+          "error": EXPIRED_LEASE_ERROR,
+        }},
+      )
+      if update_result.modified_count == 1:
+        failed_items.append(item)
+    return failed_items
+
+
+  def count_unfinished(self,
+                       program: str,
+                       kind: str) -> int:
+    self.fail_expired_leases(program, kind)
+    return self.__get_collection().count_documents(
+      filter={"program": program, "kind": kind, "status": {"$in": ["pending", "leased"]}},
+    )
+
+
+  def get_results(self,
+                  program: str,
+                  kind: str) -> list:
+    return list(self.__get_collection().find(
+      filter={"program": program, "kind": kind, "status": "done"},
+      projection={"payload": 1, "result": 1},
+    ))
+
+
+class InMemoryWorkQueue(WorkQueue):
+  """
+  The work queue kept in the memory of the process, standing in for the MongoDB collection
+  when the workers are threads of a single process, e.g. for offline runs and benchmarks.
+  """
+
+  name = "memory"
+
+
+  def __init__(self,
+               lease_seconds: float,
+               max_attempts: int) -> None:
+    super().__init__(
+      lease_seconds=lease_seconds,
+      max_attempts=max_attempts,
+    )
+    self.__items = {}
+    self.__lock = threading.Lock()
+
+
+  def enqueue(self,
+              item_id: str,
+              kind: str,
+              program: str,
+              payload: dict) -> bool:
+    with self.__lock:
+      if item_id in self.__items:
+        return False
+      self.__items[item_id] = self.build_item(item_id, kind, program, copy.deepcopy(payload))
+      return True
+
+
+  def claim(self,
+            worker_id: str,
+            kinds: list | None = None) -> dict | None:
+    now = datetime.now(timezone.utc)
+    with self.__lock:
+      claimable_items = [
+        item
+        for item in self.__items.values()
+        if (item["status"] == "pending" or (item["status"] == "leased" and item["lease_expires_at"] < now))
+        and item["attempts"] < self.max_attempts
+        and (not kinds or item["kind"] in kinds)
+      ]
+      if not claimable_items:
+        return None
+
+      item = min(claimable_items, key=lambda item: item["enqueued_at"])
+      item["status"] = "leased"
+      item["lease_owner"] = worker_id
+      item["lease_expires_at"] = now + timedelta(seconds=self.lease_seconds)
+      item["attempts"] += 1
+      return copy.deepcopy(item)
+
+
+  def __fail_expired_leases(self,
+                            program: str | None,
+                            kind: str | None) -> list:
+    """
+    Fails for good the items whose lease expired on their last attempt, the lock must be
+    held by the caller
+    """
+
+    now = datetime.now(timezone.utc)
+    expired_items = [
+      item
+      for item in self.__items.values()
+      if item["status"] == "leased" and item["lease_expires_at"] < now and item["attempts"] >= self.max_attempts
+      and (program is None or item["program"] == program)
+      and (kind is None or item["kind"] == kind)
+    ]
+    for item in expired_items:
+      item["status"] = "failed"
+      item["lease_owner"] = None
+      item["lease_expires_at"] = None
+      item["error"] = EXPIRED_LEASE_ERROR
+    return copy.deepcopy(expired_items)
+
+
+  def fail_expired_leases(self,
+                          program: str | None = None,
+                          kind: str | None = None) -> list:
+    with self.__lock:
+      return self.__fail_expired_leases(program, kind)
+
+
+  def __get_leased_item(self,
+                        item_id: str,
+                        worker_id: str) -> dict | None:
+    """
+    Returns a work item if it is leased by the worker, the lock must be held by the caller
+    """
+
+    item = self.__items.get(item_id)
+    if item is None or item["status"] != "leased" or item["lease_owner"] != worker_id:
+      return None
+    return item
+
+
+  def complete(self,
+               item_id: str,
+               worker_id: str,
+               result=None) -> bool:
+    with self.__lock:
+      item = self.__get_leased_item(item_id, worker_id)
+      if item is None:
+        return False
+
+      item["status"] = "done"
+      item["lease_expires_at"] = None
+      item["result"] = copy.deepcopy(result)
+      return True
+
+
+  def fail(self,
+           item_id: str,
+           worker_id: str,
+           error: str) -> bool:
+    with self.__lock:
+      item = self.__get_leased_item(item_id, worker_id)
+      if item is None:
+        return False
+
+      item["status"] = "failed" if item["attempts"] >= self.max_attempts else "pending"
+      item["lease_owner"] = None
+      item["lease_expires_at"] = None
+      item["error"] = error
+      return True
+
+
+  def count_unfinished(self,
+                       program: str,
+                       kind: str) -> int:
+    with self.__lock:
+      self.__fail_expired_leases(program, kind)
+      return sum(
+        1
+        for item in self.__items.values()
+        if item["program"] == program and item["kind"] == kind and item["status"] in ("pending", "leased")
+      )
+
+
+  def get_results(self,
+                  program: str,
+                  kind: str) -> list:
+    with self.__lock:
+      return [
+        {"_id": item["_id"], "payload": copy.deepcopy(item["payload"]), "result": copy.deepcopy(item["result"])}
+        for item in self.__items.values()
+        if item["program"] == program and item["kind"] == kind and item["status"] == "done"
+      ]
+
+
+work_queues = {}
+work_queues_lock = threading.Lock()
+
+
+def get_work_queue(backend_name: str | None = None) -> WorkQueue:
+  """
+  Returns the process-wide work queue configured in the WORK_QUEUE_CONSTS section, so that
+  every worker thread of the process shares the same queue
+
+  Args:
+    - backend_name (str | None): The backend of the queue, 'mongo' or 'memory', the configured
+                                 backend if not given
+
+  Returns:
+    - WorkQueue: The work queue
+  """
+
+  work_queue_consts = WorkQueueConsts().get_constants()
+  backend_name = backend_name or work_queue_consts["backend"]
+
+  with work_queues_lock:
+    if backend_name not in work_queues:
+      if backend_name == "mongo":
+        work_queues[backend_name] = MongoWorkQueue(
+          host=work_queue_consts["mongo_host"] or MondoDBConsts().get_constants()["host"],
+          lease_seconds=work_queue_consts["lease_seconds"],
+          max_attempts=work_queue_consts["max_attempts"],
+        )
+      elif backend_name == "memory":
+        work_queues[backend_name] = InMemoryWorkQueue(
+          lease_seconds=work_queue_consts["lease_seconds"],
+          max_attempts=work_queue_consts["max_attempts"],
+        )
+      else:
+        raise ValueError(f"Unknown work queue backend: {backend_name}, expected one of 'mongo' or 'memory'")
+
+    return work_queues[backend_name]
\ No newline at end of file
@@ -0,0 +1,114 @@
+import json
+import pytest
+from src.scrape_data.course_records import Course, PlanEntry
+from src.user_interaction import catalog_reader as catalog_reader_module
+from src.user_interaction.catalog_reader import CatalogReader
+from src.utils.database_handler import DatabaseHandler
+from src.utils.storage_backends import InMemoryStorageBackend
+
+
+class Logger:
+  def __init__(self) -> None:
+    self.errors = []
+
+  def error(self, message: str) -> None:
+    self.errors.append(message)
+
+
+def build_course(course_name: str) -> Course:
+  return Course(
+    course_link="/cs-100",
+    course_code="CS 100",
+    course_name=course_name,
+    credits=3,
+  )
+
+
+def scrape(storage_backend: InMemoryStorageBackend,
+           program: str,
+           course: Course) -> None:
+  database_handler = DatabaseHandler(
+    logger=Logger(),
+    storage_backend=storage_backend,
+  )
+  database_handler.create_collection_for_track_information(program)
+  database_handler.add_track_information(
+    track="core",
+    track_information={"CS 100": PlanEntry("CS 100", "core", "1", "1", course=course)},
+  )
+
+
+@pytest.fixture
+def storage_backend(monkeypatch) -> InMemoryStorageBackend:
+  storage_backend = InMemoryStorageBackend()
+  monkeypatch.setattr(
+    catalog_reader_module,
+    "DatabaseHandler",
+    lambda logger: DatabaseHandler(logger=logger, storage_backend=storage_backend),
+  )
+  return storage_backend
+
+
+def read_course_name(catalog_reader: CatalogReader,
+                     program: str) -> str:
+  response = catalog_reader.get_course(program, "CS 100")
+  return json.loads(response["body"])["course_name"]
+
+
+def test_a_scrape_from_another_process_drops_every_program_sharing_the_course(storage_backend, monkeypatch):
+  monkeypatch.setattr(
+    catalog_reader_module.ReadCacheConsts,
+    "get_constants",
+    lambda self: {"max_entries": 16, "ttl_seconds": 300, "version_check_seconds": 0},
+  )
+  scrape(storage_backend, "program_a", build_course("Roadmap to Computing"))
+  scrape(storage_backend, "program_b", build_course("Roadmap to Computing"))
+  catalog_reader = CatalogReader(
+    logger=Logger()
+  )
+  assert read_course_name(catalog_reader, "program_a") == "Roadmap to Computing"
+  assert read_course_name(catalog_reader, "program_b") == "Roadmap to Computing"
+
+  scrape(storage_backend, "program_a", build_course("Computing Roadmap"))
+
+  assert read_course_name(catalog_reader, "program_b") == "Computing Roadmap"
+
+
+def test_invalidate_drops_the_stale_responses_before_the_version_check(storage_backend):
+  scrape(storage_backend, "program_a", build_course("Roadmap to Computing"))
+  scrape(storage_backend, "program_b", build_course("Roadmap to Computing"))
+  catalog_reader = CatalogReader(
+    logger=Logger()
+  )
+  read_course_name(catalog_reader, "program_b")
+
+  scrape(storage_backend, "program_a", build_course("Computing Roadmap"))
+  assert read_course_name(catalog_reader, "program_b") == "Roadmap to Computing"
+
+  catalog_reader.invalidate("program_a")
+  assert read_course_name(catalog_reader, "program_b") == "Computing Roadmap"
+
+
+def test_an_unchanged_registry_keeps_the_other_programs_cached(storage_backend):
+  course = build_course("Roadmap to Computing")
+  scrape(storage_backend, "program_a", course)
+  scrape(storage_backend, "program_b", course)
+  catalog_reader = CatalogReader(
+    logger=Logger()
+  )
+  read_course_name(catalog_reader, "program_a")
+  read_course_name(catalog_reader, "program_b")
+
+  database_handler = DatabaseHandler(
+    logger=Logger(),
+    storage_backend=storage_backend,
+  )
+  database_handler.create_collection_for_track_information("program_a")
+  database_handler.add_track_information(
+    track="elective",
+    track_information={},
+  )
+  catalog_reader.invalidate("program_a")
+
+  assert catalog_reader.cache.get(("program_b", "course", "CS 100", ())) is not None
+  assert catalog_reader.cache.get(("program_a", "course", "CS 100", ())) is None
\ No newline at end of file
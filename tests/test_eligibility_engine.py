@@ -0,0 +1,52 @@
+import itertools
+from src.user_interaction.eligibility_engine import MAX_CLAUSES_PER_COURSE, EligibilityEngine, requirement_to_dnf
+
+
+GROUPS = [[f"CS {100 + 10 * group + alternative}" for alternative in range(3)] for group in range(7)]
+
+
+def test_checks_single_courses_groups_and_courses_required_together():
+  eligibility_engine = EligibilityEngine(
+    prerequisites={
+      "CS 100": [],
+      "CS 280": ["CS 100", ["MATH 111", ["MATH 112", "MATH 113"]]],
+    }
+  )
+
+  assert eligibility_engine.eligible_courses([]) == ["CS 100"]
+  assert eligibility_engine.eligible_courses(["CS 100", "MATH 112"]) == []
+  assert eligibility_engine.eligible_courses(["CS 100", "MATH 112", "MATH 113"]) == ["CS 280"]
+  assert eligibility_engine.eligible_courses(["CS 100", "MATH 111"]) == ["CS 280"]
+
+
+def test_an_oversized_requirement_is_evaluated_without_dropping_clauses():
+  assert 3 ** len(GROUPS) > MAX_CLAUSES_PER_COURSE
+  assert requirement_to_dnf(GROUPS, truncate=False) is None
+
+  eligibility_engine = EligibilityEngine(
+    prerequisites={"CS 490": GROUPS}
+  )
+  completion_sets = [list(completed_courses) for completed_courses in itertools.product(*GROUPS)]
+
+  assert all(eligibility_engine.eligible_courses(completed_courses) == ["CS 490"] for completed_courses in completion_sets)
+  assert eligibility_engine.eligible_courses(completion_sets[0][1:]) == []
+  assert all(
+    eligible_courses == ["CS 490"]
+    for eligible_courses in eligibility_engine.eligible_courses_for_cohort(completion_sets)
+  )
+
+
+def test_a_cohort_gets_the_same_answers_as_its_students_one_by_one():
+  eligibility_engine = EligibilityEngine(
+    prerequisites={
+      "CS 490": GROUPS,
+      "CS 280": ["CS 100", ["CS 110", "CS 111"]],
+      "CS 100": [],
+    }
+  )
+  cohort = [[], ["CS 100"], ["CS 100", "CS 111"], [group[1] for group in GROUPS], [group[2] for group in GROUPS[:-1]]]
+
+  assert eligibility_engine.eligible_courses_for_cohort(cohort) == [
+    eligibility_engine.eligible_courses(completed_courses)
+    for completed_courses in cohort
+  ]
\ No newline at end of file
@@ -0,0 +1,85 @@
+import json
+import pytest
+from src.scrape_data.model_router import ModelRouter, ModelTier, parse_segregation_response, validate_segregation
+
+
+SEGREGATION = {
+  "prerequisites": [["CS 100", "CS 113"]],
+  "prerequisites_description": "CS 100 or CS 113",
+  "corequisites": [],
+  "course_description": "An introduction to data structures.",
+}
+
+
+class Logger:
+  def warning(self, message: str) -> None:
+    pass
+
+
+class ClientPool:
+  size = 1
+
+  def __init__(self, response_text: str) -> None:
+    self.response_text = response_text
+    self.messages = 0
+
+  def send_message(self, content: str, program: str | None = None, on_response=None) -> str:
+    self.messages += 1
+    return self.response_text
+
+
+def test_parses_fenced_json_and_python_literals():
+  assert parse_segregation_response(f"```json\n{json.dumps(SEGREGATION)}\n```") == SEGREGATION
+  assert parse_segregation_response(repr(SEGREGATION)) == SEGREGATION
+
+
+def test_never_evaluates_the_response_as_code():
+  with pytest.raises(ValueError):
+    parse_segregation_response("__import__('os').getcwd()")
+
+
+def test_validates_the_nested_requirements_and_the_fields():
+  assert validate_segregation(SEGREGATION) == []
+  assert validate_segregation(SEGREGATION | {"prerequisites": [[["CS 100", "MATH 111"], "CS 113"]]}) == []
+  assert validate_segregation(["CS 100"]) == ["the response is a list, not a dict"]
+  assert validate_segregation({"prerequisites": []}) == [
+    "the field prerequisites_description is missing",
+    "the field corequisites is missing",
+    "the field course_description is missing",
+  ]
+  assert validate_segregation(SEGREGATION | {"course_description": " "}) == ["the course description is empty"]
+  assert validate_segregation(SEGREGATION | {"prerequisites": "CS 100"}) == ["the requirement is a str, not a list"]
+  assert validate_segregation(SEGREGATION | {"corequisites": [[]]}) == ["the requirement element [] is neither a course code nor a group of alternatives"]
+  assert validate_segregation(SEGREGATION | {"prerequisites": [["CS 100", "Calculus I"]]}) == ["'Calculus I' is not a course code"]
+
+
+def test_invalid_response_escalates_to_the_next_tier():
+  cheap_pool, strong_pool = ClientPool(repr(SEGREGATION | {"prerequisites": ["Calculus I"]})), ClientPool(repr(SEGREGATION))
+  model_router = ModelRouter(
+    logger=Logger(),
+    tiers=[ModelTier("cheap", cheap_pool), ModelTier("strong", strong_pool)],
+  )
+
+  assert model_router.segregate("CS 241") == SEGREGATION
+  assert (cheap_pool.messages, strong_pool.messages) == (1, 1)
+
+
+def test_unparsable_response_escalates_to_the_next_tier():
+  cheap_pool, strong_pool = ClientPool("Sorry, I cannot help with that."), ClientPool(repr(SEGREGATION))
+  model_router = ModelRouter(
+    logger=Logger(),
+    tiers=[ModelTier("cheap", cheap_pool), ModelTier("strong", strong_pool)],
+  )
+
+  assert model_router.segregate("CS 241") == SEGREGATION
+  assert (cheap_pool.messages, strong_pool.messages) == (1, 1)
+
+
+def test_unparsable_response_of_the_last_tier_raises():
+  model_router = ModelRouter(
+    logger=Logger(),
+    tiers=[ModelTier("cheap", ClientPool("{'prerequisites': "))],
+  )
+
+  with pytest.raises(ValueError):
+    model_router.segregate("CS 241")
\ No newline at end of file
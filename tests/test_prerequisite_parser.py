@@ -0,0 +1,63 @@
+import pytest
+from consts import PrerequisiteParserConsts
+from src.scrape_data.prerequisite_parser import PrerequisiteParser
+
+
+MINIMUM_CONFIDENCE = PrerequisiteParserConsts().get_constants()["minimum_confidence"]
+
+
+def parse(requirement: str) -> dict | None:
+  return PrerequisiteParser().parse(f"Introduction to the topic. Prerequisites: {requirement}.")
+
+
+def test_parses_parenthesized_alternatives_with_full_confidence():
+  parsed = parse("MATH 111 and (CS 113 or CS 115)")
+
+  assert parsed["prerequisites"] == ["MATH 111", ["CS 113", "CS 115"]]
+  assert parsed["course_description"] == "Introduction to the topic."
+  assert parsed["confidence"] == 1.0
+
+
+def test_parses_courses_required_together_within_alternatives():
+  parsed = parse("(MATH 111 and MATH 112) or MATH 132")
+
+  assert parsed["prerequisites"] == [[["MATH 111", "MATH 112"], "MATH 132"]]
+  assert parsed["confidence"] == 1.0
+
+
+def test_parses_a_comma_list_ending_in_and():
+  parsed = parse("CS 113, CS 114 and MATH 111")
+
+  assert parsed["prerequisites"] == ["CS 113", "CS 114", "MATH 111"]
+  assert parsed["confidence"] > MINIMUM_CONFIDENCE
+
+
+def test_grade_qualifiers_lower_the_confidence_but_stay_above_the_threshold():
+  parsed = parse("CS 114 with a grade of C or better")
+
+  assert parsed["prerequisites"] == ["CS 114"]
+  assert MINIMUM_CONFIDENCE < parsed["confidence"] < 1.0
+
+
+@pytest.mark.parametrize("requirement", [
+  "MATH 111 and CS 113 or CS 115",
+  "MATH 111 or MATH 132 and CS 100",
+  "CS 100, MATH 111 and CS 113 or CS 115",
+])
+def test_rejects_mixed_connectors_without_parentheses(requirement):
+  assert parse(requirement) is None
+
+
+def test_a_comma_list_ending_in_or_falls_below_the_threshold():
+  parsed = parse("MATH 111, CS 113 or CS 115")
+
+  assert parsed is None or parsed["confidence"] <= MINIMUM_CONFIDENCE
+
+
+@pytest.mark.parametrize("course_description", [
+  "Introduction to the topic. Prerequisites: departmental approval.",
+  "Introduction to the topic. Prerequisites: CS 113 or permission of the instructor.",
+  "Prerequisites: CS 113.",
+])
+def test_gives_up_on_what_it_cannot_parse(course_description):
+  assert PrerequisiteParser().parse(course_description) is None
\ No newline at end of file
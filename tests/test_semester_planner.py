@@ -0,0 +1,64 @@
+import pytest
+from src.user_interaction.semester_planner import SemesterPlanner, parse_year_and_semester
+
+
+def build_track(*courses) -> dict:
+  return {
+    course["course_code"]: {"credits": 3, "year": "1", "semester": "1"} | course
+    for course in courses
+  }
+
+
+def test_mutual_corequisites_are_planned_in_the_same_semester():
+  semester_plan = SemesterPlanner(
+    track_information=build_track(
+      {"course_code": "PHYS 111", "corequisites": ["PHYS 111A"]},
+      {"course_code": "PHYS 111A", "credits": 1, "corequisites": ["PHYS 111"]},
+      {"course_code": "PHYS 121", "prerequisites": ["PHYS 111"]},
+    ),
+    credit_cap=18,
+  ).plan(completed_courses=[])
+
+  assert [semester["courses"] for semester in semester_plan["semesters"]] == [["PHYS 111", "PHYS 111A"], ["PHYS 121"]]
+  assert semester_plan["blocked_courses"] == {}
+  assert semester_plan["critical_path_length"] == 2
+
+
+def test_prerequisite_cycles_block_their_courses_and_dependents():
+  semester_plan = SemesterPlanner(
+    track_information=build_track(
+      {"course_code": "CS 100", "prerequisites": ["CS 200"]},
+      {"course_code": "CS 200", "prerequisites": ["CS 100"]},
+      {"course_code": "CS 300", "prerequisites": ["CS 200"]},
+      {"course_code": "MATH 111"},
+      {"course_code": "PHYS 111", "prerequisites": ["PHYS 111A"], "corequisites": ["PHYS 111A"]},
+      {"course_code": "PHYS 111A", "corequisites": ["PHYS 111"]},
+    ),
+    credit_cap=18,
+  ).plan(completed_courses=[])
+
+  assert [semester["courses"] for semester in semester_plan["semesters"]] == [["MATH 111"]]
+  assert semester_plan["blocked_courses"] == {
+    "CS 100": "circular prerequisites",
+    "CS 200": "circular prerequisites",
+    "CS 300": "requires a course with circular prerequisites",
+    "PHYS 111": "circular prerequisites",
+    "PHYS 111A": "circular prerequisites",
+  }
+
+
+def test_semesters_stay_under_the_credit_cap():
+  semester_plan = SemesterPlanner(
+    track_information=build_track(*[{"course_code": f"HUM {number}"} for number in range(101, 108)]),
+    credit_cap=9,
+  ).plan(completed_courses=["HUM 101"], year_and_semester="year_2_semester_2")
+
+  assert [semester["credits"] for semester in semester_plan["semesters"]] == [9, 9]
+  assert [(semester["year"], semester["semester"]) for semester in semester_plan["semesters"]] == [(2, 2), (3, 1)]
+
+
+def test_unparsable_semesters_are_rejected():
+  assert parse_year_and_semester("Year 2, Semester 1") == (2, 1)
+  for year_and_semester in ("next fall", "year_2_semester_3", "year_0_semester_1"):
+    with pytest.raises(ValueError):
+      parse_year_and_semester(year_and_semester)
\ No newline at end of file
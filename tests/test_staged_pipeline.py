@@ -0,0 +1,61 @@
+import threading
+import pytest
+from src.utils.staged_pipeline import PipelineStage, StagedPipeline
+
+
+class Logger:
+  def __init__(self) -> None:
+    self.errors = []
+
+  def error(self, message: str) -> None:
+    self.errors.append(message)
+
+
+class FatalError(Exception):
+  pass
+
+
+def build_pipeline(segregate, store, fatal_errors: tuple = ()) -> StagedPipeline:
+  return StagedPipeline(
+    logger=Logger(),
+    name="test_pipeline",
+    stages=[
+      PipelineStage("fetch", lambda item: item, 2, 2),
+      PipelineStage("segregation", segregate, 2, 2),
+      PipelineStage("store", store, 1, 2, batch_size=3),
+    ],
+    fatal_errors=fatal_errors,
+  )
+
+
+def test_errors_drop_their_item_only():
+  def segregate(item: int) -> int:
+    if item == 3:
+      raise ValueError("unparsable")
+    return item
+
+  results = build_pipeline(segregate, lambda items: items).run(range(10))
+
+  assert sorted(results) == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+
+
+def test_fatal_error_aborts_the_pipeline_after_storing_the_items_already_segregated():
+  segregated, stored = [], []
+  lock = threading.Lock()
+
+  def segregate(item: int) -> int:
+    if item >= 5:
+      raise FatalError("budget exhausted")
+    with lock:
+      segregated.append(item)
+    return item
+
+  def store(items: list) -> list:
+    stored.extend(items)
+    return items
+
+  with pytest.raises(FatalError):
+    build_pipeline(segregate, store, fatal_errors=(FatalError,)).run(range(1000))
+
+  assert sorted(stored) == sorted(segregated)
+  assert len(segregated) < 1000
\ No newline at end of file
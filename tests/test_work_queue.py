@@ -0,0 +1,83 @@
+from time import sleep
+from src.utils.work_queue import EXPIRED_LEASE_ERROR, InMemoryWorkQueue
+
+
+def build_work_queue(lease_seconds: float = 60,
+                     max_attempts: int = 3) -> InMemoryWorkQueue:
+  work_queue = InMemoryWorkQueue(
+    lease_seconds=lease_seconds,
+    max_attempts=max_attempts,
+  )
+  work_queue.enqueue("course:CS 100", "course", "computer_science_bs", {"course_link": "/cs-100"})
+  return work_queue
+
+
+def test_enqueue_is_idempotent_per_item_id():
+  work_queue = build_work_queue()
+
+  assert not work_queue.enqueue("course:CS 100", "course", "computer_science_bs", {})
+  assert work_queue.count_unfinished("computer_science_bs", "course") == 1
+
+
+def test_claim_leases_the_oldest_item_of_the_accepted_kinds():
+  work_queue = build_work_queue()
+  work_queue.enqueue("program:computer_science_bs", "program", "computer_science_bs", {})
+
+  assert work_queue.claim("worker_1", kinds=["program"])["_id"] == "program:computer_science_bs"
+  item = work_queue.claim("worker_2")
+  assert item["_id"] == "course:CS 100"
+  assert item["status"] == "leased" and item["lease_owner"] == "worker_2" and item["attempts"] == 1
+  assert work_queue.claim("worker_3") is None
+
+
+def test_complete_stores_the_result_for_the_lease_owner_only():
+  work_queue = build_work_queue()
+  item = work_queue.claim("worker_1")
+
+  assert not work_queue.complete(item["_id"], "worker_2", result={"course_code": "CS 100"})
+  assert work_queue.complete(item["_id"], "worker_1", result={"course_code": "CS 100"})
+  assert work_queue.count_unfinished("computer_science_bs", "course") == 0
+  assert work_queue.get_results("computer_science_bs", "course")[0]["result"] == {"course_code": "CS 100"}
+
+
+def test_fail_retries_the_item_until_it_runs_out_of_attempts():
+  work_queue = build_work_queue(max_attempts=2)
+
+  assert work_queue.fail(work_queue.claim("worker_1")["_id"], "worker_1", "timeout")
+  assert work_queue.count_unfinished("computer_science_bs", "course") == 1
+  assert work_queue.fail(work_queue.claim("worker_1")["_id"], "worker_1", "timeout")
+  assert work_queue.claim("worker_1") is None
+  assert work_queue.count_unfinished("computer_science_bs", "course") == 0
+
+
+def test_an_expired_lease_is_claimed_again():
+  work_queue = build_work_queue(lease_seconds=0.05)
+  work_queue.claim("worker_1")
+  sleep(0.1)
+
+  item = work_queue.claim("worker_2")
+  assert item["lease_owner"] == "worker_2" and item["attempts"] == 2
+  assert not work_queue.complete(item["_id"], "worker_1")
+  assert work_queue.complete(item["_id"], "worker_2")
+
+
+def test_a_lease_expiring_on_the_last_attempt_fails_the_item():
+  work_queue = build_work_queue(lease_seconds=0.05, max_attempts=1)
+  work_queue.claim("worker_1")
+  sleep(0.1)
+
+  assert work_queue.claim("worker_2") is None
+  assert work_queue.count_unfinished("computer_science_bs", "course") == 0
+  assert work_queue.fail_expired_leases() == []
+
+
+def test_fail_expired_leases_returns_the_items_failed():
+  work_queue = build_work_queue(lease_seconds=0.05, max_attempts=1)
+  work_queue.claim("worker_1")
+  assert work_queue.fail_expired_leases() == []
+  sleep(0.1)
+
+  failed_items = work_queue.fail_expired_leases()
+  assert [item["_id"] for item in failed_items] == ["course:CS 100"]
+  assert failed_items[0]["status"] == "failed" and failed_items[0]["error"] == EXPIRED_LEASE_ERROR
+  assert not work_queue.complete("course:CS 100", "worker_1")
\ No newline at end of file